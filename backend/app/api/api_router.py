@@ -1,8 +1,10 @@
 from fastapi import APIRouter
 
-from app.api.routes import exercise, auth, validation
+from app.api.routes import exercise, exercise_set, auth, metrics, validation
 
 api_router = APIRouter()
 api_router.include_router(exercise.router)
+api_router.include_router(exercise_set.router)
 api_router.include_router(auth.router)
 api_router.include_router(validation.router)
+api_router.include_router(metrics.router)
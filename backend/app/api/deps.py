@@ -1,12 +1,19 @@
-from collections.abc import Generator
+import hashlib
+import time
+from collections.abc import AsyncGenerator, Generator
 from typing import Annotated
+from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 import jwt
+from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.db import engine
+from app.core.cache import principal_cache, token_cache
+from app.core.db import async_engine, engine, replica_async_engine
+from app.core.read_routing import reads_from_primary
 from app.core.config import ALGORITHM, API_V1_STR, SECRET_KEY
 from app.models.user import User
 
@@ -18,11 +25,64 @@ def get_db() -> Generator[Session, None, None]:
         yield session
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    # Objects are kept loaded after commit; an expired attribute would need a
+    # lazy refresh, which async sessions cannot do implicitly.
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
 SessionDep = Annotated[Session, Depends(get_db)]
+# Sessions on the primary; use these for anything that writes.
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_db)]
+
+
+async def get_read_db(
+    request: Request, primary_session: AsyncSessionDep
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only routes. It uses the replica pool unless the client
+    wrote within the last READ_YOUR_WRITES_SECONDS, in which case it reads
+    from the primary so the client sees its own write.
+
+    Reads on the primary reuse the request's primary session (which the
+    current-user lookup also uses), so a request never holds two connections
+    from one pool; waiting for a second one could exhaust the pool.
+    """
+    if replica_async_engine is async_engine or reads_from_primary(request):
+        yield primary_session
+        return
+    async with AsyncSession(replica_async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_db)]
+
+
+def get_read_engine(request: Request) -> AsyncEngine:
+    """
+    The engine get_read_db would read from, for streaming responses: their
+    body is sent after the request's sessions close, so they open their own.
+    """
+    if reads_from_primary(request):
+        return async_engine
+    return replica_async_engine
+
+
+ReadEngineDep = Annotated[AsyncEngine, Depends(get_read_engine)]
 TokenDep = Annotated[str, Depends(oauth2_scheme)]
 
 
-def get_current_user(token: TokenDep, session: SessionDep) -> User:
+def verify_token(token: str) -> str:
+    """
+    Returns the user ID ("sub" claim) of a valid token. Verified tokens are
+    cached by digest until they expire, so the signature is checked once.
+    """
+    token_digest = hashlib.sha256(token.encode()).hexdigest()
+    user_id = token_cache.get(token_digest)
+    if user_id is not None:
+        return user_id
+
     try:
         # Decode the token. Expect the token to include a "sub" claim with the user ID.
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -42,14 +102,29 @@ def get_current_user(token: TokenDep, session: SessionDep) -> User:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        token_cache.set(token_digest, user_id, ttl=expires_at - time.time())
+    return user_id
+
+
+async def get_current_user(token: TokenDep, session: AsyncSessionDep) -> User:
+    user_id = verify_token(token)
+
+    cached_user = principal_cache.get(user_id)
+    if cached_user is not None:
+        return User(**cached_user)
+
     # Query the database for the user with the specified ID.
-    user = session.exec(select(User).where(User.id == user_id)).first()
+    user = (await session.exec(select(User).where(User.id == UUID(user_id)))).first()
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found.",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    principal_cache.set(user_id, user.model_dump(exclude={"password_hash"}))
     return user
 
 
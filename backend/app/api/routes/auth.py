@@ -5,7 +5,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 
 from app.schemas.user import UserCreate, UserLogin, UserRead
 from app.schemas.token import Token
-from app.api.deps import SessionDep
+from app.api.deps import AsyncSessionDep
 from app.services.user_service import register_user
 from app.services.auth_service import authenticate_user, create_access_token
 from app.core.config import ACCESS_TOKEN_EXPIRE_MINUTES
@@ -19,8 +19,8 @@ router = APIRouter(prefix="/auth", tags=["auth"])
     response_model=UserRead,
     summary="Register a new user",
 )
-def register(user_data: UserCreate, session: SessionDep):
-    return register_user(user_data, session)
+async def register(user_data: UserCreate, session: AsyncSessionDep):
+    return await register_user(user_data, session)
 
 
 @router.post(
@@ -29,11 +29,11 @@ def register(user_data: UserCreate, session: SessionDep):
     summary="User login",
     description="Authenticates the user and returns a JWT access token.",
 )
-def login(
+async def login(
     user_credentials: Annotated[OAuth2PasswordRequestForm, Depends()],
-    session: SessionDep,
+    session: AsyncSessionDep,
 ):
-    user = authenticate_user(
+    user = await authenticate_user(
         user_credentials.username, user_credentials.password, session
     )
 
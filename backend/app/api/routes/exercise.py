@@ -1,46 +1,230 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Header, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
 from app.schemas.exercise import (
     Exercise,
+    ExerciseBulkDelete,
+    ExerciseBulkDeleteResult,
     ExerciseCreate,
     ExerciseUpdate,
     SentenceCreatePayload,
     SentencesUnion,
 )
 from app.services.exercise_service import (
-    get_exercises,
-    get_exercise,
+    get_exercises_json,
+    get_exercises_etag,
+    get_exercise_json,
+    get_exercise_etag,
+    stream_exercises,
     create_exercise,
     delete_exercise,
+    delete_exercises,
     update_exercise,
     create_sentence_for_exercise,
 )
-from app.api.deps import CurrentUser, SessionDep
+from app.schemas.grading import GradeRequest, GradeResponse
+from app.services.grading_service import dump_grades_json, grade_exercise
+from app.schemas.exercise_transfer import ImportResult, TransferFormat
+from app.services.exercise_transfer_service import (
+    TRANSFER_MEDIA_TYPES,
+    export_exercises,
+    import_exercises,
+    transfer_format_for,
+)
+from app.schemas.search import SearchResult
+from app.services.search_service import search_exercises
+from app.schemas.stats import ExerciseStats
+from app.services.stats_service import get_exercise_stats
+from app.api.deps import (
+    AsyncSessionDep,
+    CurrentUser,
+    ReadEngineDep,
+    ReadSessionDep,
+)
+from app.core.config import (
+    EXERCISE_PAGE_DEFAULT_LIMIT,
+    EXERCISE_PAGE_MAX_LIMIT,
+    SEARCH_MAX_OFFSET,
+    SEARCH_PAGE_DEFAULT_LIMIT,
+    SEARCH_PAGE_MAX_LIMIT,
+)
+from app.core.etag import etag_matches
 
 
 router = APIRouter(tags=["exercise"])
 
+# Clients may keep a copy but must revalidate it with If-None-Match.
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def json_response(content: bytes, etag: str) -> Response:
+    # Read routes return pre-encoded JSON; response_model only documents it.
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL},
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL},
+    )
+
 
 @router.get(
     "/exercises/",
     response_model=List[Exercise],
     summary="List all exercises",
-    description="Retrieve a list of all available exercises stored in memory.",
+    description=(
+        "Retrieve a page of the current user's exercises ordered by creation time. "
+        "When more exercises exist, the `X-Next-Cursor` response header holds the "
+        "cursor for the next page. With `stream=true` the whole library is streamed "
+        "as NDJSON instead. Supports conditional requests with `If-None-Match`."
+    ),
+)
+async def read_exercises(
+    current_user: CurrentUser,
+    session: ReadSessionDep,
+    read_engine: ReadEngineDep,
+    limit: int = Query(
+        EXERCISE_PAGE_DEFAULT_LIMIT,
+        ge=1,
+        le=EXERCISE_PAGE_MAX_LIMIT,
+        description="Maximum number of exercises to return",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the previous page's X-Next-Cursor header"
+    ),
+    stream: bool = Query(False, description="Stream all exercises as NDJSON"),
+    if_none_match: Optional[str] = Header(None),
+):
+    if stream:
+        return StreamingResponse(
+            stream_exercises(current_user, read_engine),
+            media_type="application/x-ndjson",
+        )
+
+    etag = await get_exercises_etag(current_user, session, limit=limit, cursor=cursor)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    content, next_cursor = await get_exercises_json(
+        current_user, session, limit=limit, cursor=cursor
+    )
+    response = json_response(content, etag)
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
+
+
+@router.get(
+    "/exercises/search",
+    response_model=List[SearchResult],
+    summary="Search exercises",
+    description=(
+        "Full-text search over the current user's exercise titles and "
+        "descriptions, fill-gap sentences and multiple-choice questions and "
+        "choices. Results match every word of `q` (misspelled words are matched "
+        "by similarity) and are ranked best first. When more results exist, the "
+        "`X-Next-Offset` response header holds the offset of the next page."
+    ),
+)
+async def search_exercises_endpoint(
+    current_user: CurrentUser,
+    session: ReadSessionDep,
+    q: str = Query(..., min_length=1, max_length=200, description="Search query"),
+    limit: int = Query(
+        SEARCH_PAGE_DEFAULT_LIMIT,
+        ge=1,
+        le=SEARCH_PAGE_MAX_LIMIT,
+        description="Maximum number of results to return",
+    ),
+    offset: int = Query(
+        0, ge=0, le=SEARCH_MAX_OFFSET, description="Number of results to skip"
+    ),
+):
+    content, next_offset = await search_exercises(
+        q, limit, offset, current_user, session
+    )
+    response = Response(content=content, media_type="application/json")
+    if next_offset is not None:
+        response.headers["X-Next-Offset"] = str(next_offset)
+    return response
+
+
+@router.get(
+    "/exercises/export",
+    summary="Export exercises",
+    description=(
+        "Stream every sentence and question of the current user as NDJSON or CSV, "
+        "one row each, in the format accepted by `POST /exercises/import`. The "
+        "`exercise` column holds the exercise ID."
+    ),
+)
+async def export_exercises_endpoint(
+    current_user: CurrentUser,
+    read_engine: ReadEngineDep,
+    format: TransferFormat = Query(TransferFormat.NDJSON, description="File format"),
+):
+    return StreamingResponse(
+        export_exercises(format, current_user, read_engine),
+        media_type=TRANSFER_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="exercises.{format.value}"'
+        },
+    )
+
+
+@router.post(
+    "/exercises/import",
+    response_model=ImportResult,
+    summary="Import exercises",
+    description=(
+        "Create exercises from an NDJSON or CSV body with one sentence or question "
+        "per row. Rows sharing an `exercise` key form one exercise, whose first row "
+        "gives its `title`, `description` and `type`. In CSV, `choices` is a JSON "
+        'array of strings, e.g. `["a", "b|c"]`. The body is read as it arrives '
+        "and valid rows are committed in batches; invalid rows are skipped and "
+        "reported with their row number. The format is taken from `format` or "
+        "else the Content-Type (`application/x-ndjson` or `text/csv`)."
+    ),
 )
-def read_exercises(current_user: CurrentUser, session: SessionDep):
-    return get_exercises(current_user, session)
+async def import_exercises_endpoint(
+    request: Request,
+    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    format: Optional[TransferFormat] = Query(
+        None, description="File format; defaults to the Content-Type"
+    ),
+):
+    transfer_format = format or transfer_format_for(request.headers.get("content-type"))
+    return await import_exercises(
+        request.stream(), transfer_format, current_user, session
+    )
 
 
 @router.get(
     "/exercises/{exercise_id}",
     response_model=Exercise,
     summary="Retrieve an exercise",
-    description="Get an exercise by its unique identifier. Returns a 404 error if the exercise is not found.",
+    description="Get an exercise by its unique identifier. Returns a 404 error if the exercise is not found. Supports conditional requests with `If-None-Match`.",
 )
-def read_exercise(exercise_id: UUID, current_user: CurrentUser, session: SessionDep):
-    return get_exercise(exercise_id, current_user, session)
+async def read_exercise(
+    exercise_id: UUID,
+    current_user: CurrentUser,
+    session: ReadSessionDep,
+    if_none_match: Optional[str] = Header(None),
+):
+    etag = await get_exercise_etag(exercise_id, current_user, session)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    content = await get_exercise_json(exercise_id, current_user, session)
+    return json_response(content, etag)
 
 
 @router.post(
@@ -50,38 +234,65 @@ def read_exercise(exercise_id: UUID, current_user: CurrentUser, session: Session
     summary="Create a new exercise",
     description="Create a new exercise (either fill-gap or multiple-choice) ensuring at least one sentence or question is provided.",
 )
-def create_exercise_endpoint(
-    exercise: ExerciseCreate, current_user: CurrentUser, session: SessionDep
+async def create_exercise_endpoint(
+    exercise: ExerciseCreate, current_user: CurrentUser, session: AsyncSessionDep
 ):
-    return create_exercise(exercise, current_user, session)
+    return await create_exercise(exercise, current_user, session)
 
 
 @router.put(
     "/exercises/{exercise_id}",
     response_model=Exercise,
     summary="Update exercise core data",
-    description="Update core fields of an exercise (title, description).",
+    description=(
+        "Update core fields of an exercise (title, description). Returns the "
+        "updated core fields; with `include_items=true` the sentences or "
+        "questions are included as well."
+    ),
 )
-def update_exercise_endpoint(
+async def update_exercise_endpoint(
     exercise_id: UUID,
     update_data: ExerciseUpdate,
     current_user: CurrentUser,
-    session: SessionDep,
+    session: AsyncSessionDep,
+    include_items: bool = Query(
+        False, description="Also return the exercise's sentences or questions"
+    ),
 ):
-    return update_exercise(exercise_id, update_data, current_user, session)
+    return await update_exercise(
+        exercise_id, update_data, current_user, session, include_items=include_items
+    )
 
 
 @router.delete(
     "/exercises/{exercise_id}",
-    response_model=Exercise,
     status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
     summary="Delete an exercise",
     description="Delete an exercise by its unique identifier. Returns HTTP 204 No Content if deletion is successful.",
 )
-def delete_exercise_endpoint(
-    exercise_id: UUID, current_user: CurrentUser, session: SessionDep
+async def delete_exercise_endpoint(
+    exercise_id: UUID, current_user: CurrentUser, session: AsyncSessionDep
+):
+    await delete_exercise(exercise_id, current_user, session)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post(
+    "/exercises/bulk-delete",
+    response_model=ExerciseBulkDeleteResult,
+    summary="Delete several exercises",
+    description=(
+        "Deletes the listed exercises of the current user in one statement and "
+        "returns the IDs that were deleted. Unknown IDs, and exercises owned "
+        "by other users, are skipped."
+    ),
+)
+async def delete_exercises_endpoint(
+    payload: ExerciseBulkDelete, current_user: CurrentUser, session: AsyncSessionDep
 ):
-    return delete_exercise(exercise_id, current_user, session)
+    deleted_ids = await delete_exercises(payload.exercise_ids, current_user, session)
+    return ExerciseBulkDeleteResult(deleted_ids=deleted_ids)
 
 
 @router.post(
@@ -91,10 +302,52 @@ def delete_exercise_endpoint(
     summary="Add new Sentence(s)",
     description="Add new sentence(s) to the exercise with the specified id.",
 )
-def create_sentence_for_exercise_endpoint(
+async def create_sentence_for_exercise_endpoint(
     exercise_id: UUID,
     payload: SentenceCreatePayload,
     current_user: CurrentUser,
-    session: SessionDep,
+    session: AsyncSessionDep,
+):
+    return await create_sentence_for_exercise(
+        exercise_id, payload, current_user, session
+    )
+
+
+@router.post(
+    "/exercises/{exercise_id}/grade",
+    response_model=GradeResponse,
+    summary="Grade submissions",
+    description=(
+        "Grades a batch of submissions for one exercise against its answer key. "
+        "Gap answers are compared after normalization (case, punctuation, "
+        "whitespace) and may be accepted within `max_edit_distance` edits."
+    ),
+)
+async def grade_exercise_endpoint(
+    exercise_id: UUID,
+    grade_request: GradeRequest,
+    current_user: CurrentUser,
+    session: AsyncSessionDep,
+):
+    key, correct = await grade_exercise(
+        exercise_id, grade_request, current_user, session
+    )
+    return Response(
+        content=dump_grades_json(key, correct), media_type="application/json"
+    )
+
+
+@router.get(
+    "/exercises/{exercise_id}/stats",
+    response_model=ExerciseStats,
+    summary="Retrieve exercise statistics",
+    description=(
+        "Returns per-question answered and correct counts, multiple-choice "
+        "histograms and the score distribution over all submissions to "
+        "published sets containing the exercise."
+    ),
+)
+async def get_exercise_stats_endpoint(
+    exercise_id: UUID, current_user: CurrentUser, session: AsyncSessionDep
 ):
-    return create_sentence_for_exercise(exercise_id, payload, current_user, session)
+    return await get_exercise_stats(exercise_id, current_user, session)
@@ -0,0 +1,139 @@
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Header, Response, status
+
+from app.schemas.exercise_set import ExerciseSet, ExerciseSetCreate, ExerciseSetUpdate
+from app.schemas.submission import SubmissionCreate, SubmissionReceipt
+from app.services.exercise_set_service import (
+    create_exercise_set,
+    delete_exercise_set,
+    get_exercise_set,
+    get_exercise_sets,
+    get_published_snapshot,
+    publish_exercise_set,
+    update_exercise_set,
+)
+from app.services.submission_service import submit_answers
+from app.api.deps import AsyncSessionDep, CurrentUser
+from app.core.config import SNAPSHOT_HTTP_MAX_AGE_SECONDS
+from app.core.etag import etag_matches
+
+
+router = APIRouter(prefix="/exercise-sets", tags=["exercise-set"])
+
+# A snapshot never changes once published, but its set can be deleted, so
+# caches keep it briefly and then revalidate it with the ETag.
+SNAPSHOT_CACHE_CONTROL = f"public, max-age={SNAPSHOT_HTTP_MAX_AGE_SECONDS}"
+
+
+@router.post(
+    "/",
+    response_model=ExerciseSet,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create an exercise set",
+    description="Group exercises owned by the current user into a lesson or exam set. The set gets an access code that learners can use once it is published.",
+)
+async def create_exercise_set_endpoint(
+    set_data: ExerciseSetCreate, current_user: CurrentUser, session: AsyncSessionDep
+):
+    return await create_exercise_set(set_data, current_user, session)
+
+
+@router.get(
+    "/",
+    response_model=List[ExerciseSet],
+    summary="List exercise sets",
+    description="Retrieve all exercise sets of the current user.",
+)
+async def read_exercise_sets(current_user: CurrentUser, session: AsyncSessionDep):
+    return await get_exercise_sets(current_user, session)
+
+
+@router.get(
+    "/access/{access_code}",
+    summary="Open a published exercise set",
+    description=(
+        "Returns the published snapshot of the set with this access code. No "
+        "authentication is needed. Exam sets are served without correct answers. "
+        "Supports conditional requests with `If-None-Match`."
+    ),
+)
+async def read_published_exercise_set(
+    access_code: str, if_none_match: Optional[str] = Header(None)
+):
+    snapshot = await get_published_snapshot(access_code)
+    headers = {
+        "ETag": f'"{snapshot.content_hash}"',
+        "Cache-Control": SNAPSHOT_CACHE_CONTROL,
+    }
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        content=snapshot.content, media_type="application/json", headers=headers
+    )
+
+
+@router.post(
+    "/access/{access_code}/submit",
+    response_model=SubmissionReceipt,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Submit answers to a published exercise set",
+    description=(
+        "Accepts a learner's answers without authentication. Submissions are "
+        "queued and saved in batches; the response is sent once the submission "
+        "is queued. Returns 429 with `Retry-After` when the queue is full."
+    ),
+)
+async def submit_answers_endpoint(access_code: str, submission_data: SubmissionCreate):
+    return await submit_answers(access_code, submission_data)
+
+
+@router.get(
+    "/{set_id}",
+    response_model=ExerciseSet,
+    summary="Retrieve an exercise set",
+    description="Get an exercise set of the current user by its unique identifier.",
+)
+async def read_exercise_set(
+    set_id: UUID, current_user: CurrentUser, session: AsyncSessionDep
+):
+    return await get_exercise_set(set_id, current_user, session)
+
+
+@router.put(
+    "/{set_id}",
+    response_model=ExerciseSet,
+    summary="Update an exercise set",
+    description="Update the title, description, type or exercises of an unpublished set. Published sets are frozen and return 409.",
+)
+async def update_exercise_set_endpoint(
+    set_id: UUID,
+    update_data: ExerciseSetUpdate,
+    current_user: CurrentUser,
+    session: AsyncSessionDep,
+):
+    return await update_exercise_set(set_id, update_data, current_user, session)
+
+
+@router.delete(
+    "/{set_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete an exercise set",
+    description="Delete an exercise set; its access code stops working. Other server processes may keep serving the snapshot for up to SNAPSHOT_CACHE_TTL_SECONDS, and HTTP caches for SNAPSHOT_HTTP_MAX_AGE_SECONDS more. The exercises themselves are kept.",
+)
+async def delete_exercise_set_endpoint(
+    set_id: UUID, current_user: CurrentUser, session: AsyncSessionDep
+):
+    await delete_exercise_set(set_id, current_user, session)
+
+
+@router.post(
+    "/{set_id}/publish",
+    response_model=ExerciseSet,
+    summary="Publish an exercise set",
+    description="Freezes the set into an immutable snapshot served to learners through its access code. Exam snapshots leave out correct answers.",
+)
+async def publish_exercise_set_endpoint(
+    set_id: UUID, current_user: CurrentUser, session: AsyncSessionDep
+):
+    return await publish_exercise_set(set_id, current_user, session)
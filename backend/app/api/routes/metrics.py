@@ -0,0 +1,53 @@
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from app.core.cache import (
+    answer_key_cache,
+    principal_cache,
+    snapshot_cache,
+    token_cache,
+)
+from app.core.config import METRICS_TOKEN
+from app.core.pool_metrics import pool_metrics_snapshot
+from app.services.submission_service import submission_queue
+
+
+def verify_metrics_token(authorization: Optional[str] = Header(None)) -> None:
+    """
+    Guards /metrics with the METRICS_TOKEN bearer token. Without a configured
+    token the endpoint does not exist.
+    """
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        token.encode(), METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+router = APIRouter(tags=["metrics"], dependencies=[Depends(verify_metrics_token)])
+
+
+@router.get(
+    "/metrics",
+    summary="Runtime metrics",
+    description="Reports connection pool usage for each database engine, cache hit/miss counters and write-behind queue depth and flush latency. Requires the METRICS_TOKEN bearer token; disabled when it is unset.",
+)
+async def read_metrics():
+    return {
+        "db_pools": pool_metrics_snapshot(),
+        "caches": {
+            "principal": principal_cache.stats(),
+            "token": token_cache.stats(),
+            "snapshot": snapshot_cache.stats(),
+            "answer_key": answer_key_cache.stats(),
+        },
+        "write_behind": {"submissions": submission_queue.stats()},
+    }
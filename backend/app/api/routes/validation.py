@@ -1,13 +1,17 @@
+from typing import List
+
 from fastapi import APIRouter, Query
-from pydantic import BaseModel
-from sqlmodel import select
+from pydantic import BaseModel, Field
 
-from app.api.deps import SessionDep
-from app.models.user import User
+from app.api.deps import ReadSessionDep
+from app.services.availability_service import find_taken, is_available, normalize
 
 
 router = APIRouter(tags=["validation"])
 
+# Upper bound on candidates per field in one batch request.
+MAX_BATCH_CANDIDATES = 50
+
 
 class ValidationResponse(BaseModel):
     field: str
@@ -16,26 +20,35 @@ class ValidationResponse(BaseModel):
     message: str
 
 
+class BatchValidationRequest(BaseModel):
+    emails: List[str] = Field(default_factory=list, max_length=MAX_BATCH_CANDIDATES)
+    usernames: List[str] = Field(default_factory=list, max_length=MAX_BATCH_CANDIDATES)
+
+
+def to_validation_response(field: str, value: str, is_unique: bool):
+    label = field.capitalize()
+    return ValidationResponse(
+        field=field,
+        value=value,
+        is_unique=is_unique,
+        message=(
+            f"{label} is available." if is_unique else f"{label} is already taken."
+        ),
+    )
+
+
 @router.get(
     "/validate/email",
     response_model=ValidationResponse,
     summary="Validate email uniqueness",
-    description="Checks if the provided email is already registered. Returns a structured JSON response indicating whether the email is available.",
+    description="Checks if the provided email is already registered (case-insensitively). Returns a structured JSON response indicating whether the email is available.",
 )
-def validate_email(
-    session: SessionDep,
+async def validate_email(
+    session: ReadSessionDep,
     email: str = Query(..., description="Email to check uniqueness"),
 ):
-    user = session.exec(select(User).where(User.email == email)).first()
-    if user:
-        return ValidationResponse(
-            field="email",
-            value=email,
-            is_unique=False,
-            message="Email is already taken.",
-        )
-    return ValidationResponse(
-        field="email", value=email, is_unique=True, message="Email is available."
+    return to_validation_response(
+        "email", email, await is_available("email", email, session)
     )
 
 
@@ -43,23 +56,29 @@ def validate_email(
     "/validate/username",
     response_model=ValidationResponse,
     summary="Validate username uniqueness",
-    description="Checks if the provided username is already registered. Returns a structured JSON response indicating whether the username is available.",
+    description="Checks if the provided username is already registered (case-insensitively). Returns a structured JSON response indicating whether the username is available.",
 )
-def validate_username(
-    session: SessionDep,
+async def validate_username(
+    session: ReadSessionDep,
     username: str = Query(..., description="Username to check uniqueness"),
 ):
-    user = session.exec(select(User).where(User.username == username)).first()
-    if user:
-        return ValidationResponse(
-            field="username",
-            value=username,
-            is_unique=False,
-            message="Username is already taken.",
-        )
-    return ValidationResponse(
-        field="username",
-        value=username,
-        is_unique=True,
-        message="Username is available.",
+    return to_validation_response(
+        "username", username, await is_available("username", username, session)
     )
+
+
+@router.post(
+    "/validate/batch",
+    response_model=List[ValidationResponse],
+    summary="Validate several emails and usernames",
+    description="Checks up to 50 emails and 50 usernames in one call. Returns one result per candidate, emails first, in request order.",
+)
+async def validate_batch(payload: BatchValidationRequest, session: ReadSessionDep):
+    results = []
+    for field, values in (("email", payload.emails), ("username", payload.usernames)):
+        taken = await find_taken(field, values, session)
+        results.extend(
+            to_validation_response(field, value, normalize(value) not in taken)
+            for value in values
+        )
+    return results
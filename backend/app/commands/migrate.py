@@ -0,0 +1,31 @@
+"""
+Creates missing tables, seeds the exercise types and applies pending
+migrations (app.migrations), holding the bootstrap lock so that concurrent
+runs (several containers starting at once) take turns. Run it once per
+deploy before starting the server:
+
+    python -m app.commands.migrate
+"""
+
+import logging
+import time
+
+from app.core.db import engine, init_db
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    started = time.perf_counter()
+    applied = init_db()
+    engine.dispose()
+    logger.info(
+        "schema bootstrap done in %.2fs, applied migrations: %s",
+        time.perf_counter() - started,
+        applied or "none",
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
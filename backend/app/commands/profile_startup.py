@@ -0,0 +1,155 @@
+"""
+Measures cold start: how long a fresh process takes from importing app.main
+to answering its first request. Each run is a new interpreter, so nothing is
+already imported or cached. Reports the median of ``--runs`` runs split into
+import, lifespan phases and the first request, then the import cost per
+package from one ``python -X importtime`` run.
+
+Exits with status 1 when the median time to the first successful request is
+over ``--budget-ms`` (STARTUP_BUDGET_MS), so it can guard against startup
+regressions in CI.
+
+    python -m app.commands.profile_startup --runs 5 --top 20
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+# Nothing from app is imported at module level: the child process times its
+# own import of the app, which would otherwise be partly done already.
+
+# An unauthenticated route, so a fresh database can answer it.
+DEFAULT_PROBE_PATH = "/api/v1/validate/username?username=startup-probe"
+
+
+async def probe(app, path: str) -> int:
+    """Sends one GET straight to the ASGI app and returns the status code."""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def measure_child(path: str) -> Dict[str, Any]:
+    """Runs in the child process: import, start, answer one request."""
+    started = time.perf_counter()
+    from app.main import app, lifespan
+    from app.core.profiling import startup_profile
+
+    imported = time.perf_counter()
+    async with lifespan(app):
+        ready = time.perf_counter()
+        status = await probe(app, path)
+        answered = time.perf_counter()
+    return {
+        "import_ms": (imported - started) * 1000,
+        "lifespan_ms": (ready - imported) * 1000,
+        "phases": startup_profile.as_dict(),
+        "first_request_ms": (answered - ready) * 1000,
+        "time_to_first_request_ms": (answered - started) * 1000,
+        "status": status,
+    }
+
+
+def run_child(path: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-m", "app.commands.profile_startup", "--child", "--path", path]
+    return subprocess.run(command, capture_output=True, text=True, check=True)
+
+
+def import_cost_by_package(importtime_output: str) -> Counter:
+    """Sums the self import time (ms) of every module under each package."""
+    costs: Counter = Counter()
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, module = line[len("import time:") :].split("|")
+        module = module.strip()
+        parts = module.split(".")
+        # The app's own modules are shown per subpackage, e.g. app.services.
+        package = ".".join(parts[:2]) if parts[0] == "app" else parts[0]
+        costs[package] += int(self_us) / 1000
+    return costs
+
+
+def main(args: argparse.Namespace) -> int:
+    from app.core.config import STARTUP_BUDGET_MS
+
+    budget_ms = args.budget_ms or STARTUP_BUDGET_MS
+    runs: List[Dict[str, Any]] = []
+    for _ in range(args.runs):
+        result = json.loads(run_child(args.path).stdout.strip().splitlines()[-1])
+        if result["status"] >= 400:
+            print(f"First request to {args.path} failed with {result['status']}.")
+            return 1
+        runs.append(result)
+
+    def median(key: str) -> float:
+        return statistics.median(run[key] for run in runs)
+
+    print(f"Cold start, median of {args.runs} runs")
+    print(f"  {'import app.main':<28} {median('import_ms'):>9.1f} ms")
+    print(f"  {'lifespan startup':<28} {median('lifespan_ms'):>9.1f} ms")
+    for phase in runs[0]["phases"]:
+        phase_ms = statistics.median(run["phases"][phase] for run in runs)
+        print(f"    {phase:<26} {phase_ms:>9.1f} ms")
+    print(f"  {'first request':<28} {median('first_request_ms'):>9.1f} ms")
+    total = median("time_to_first_request_ms")
+    print(f"  {'time to first request':<28} {total:>9.1f} ms")
+
+    costs = import_cost_by_package(run_child(args.path, importtime=True).stderr)
+    print("\nImport time by package (self time, one run with -X importtime)")
+    for package, cost in costs.most_common(args.top):
+        print(f"  {package:<28} {cost:>9.1f} ms")
+
+    if total > budget_ms:
+        print(f"\nOver budget: {total:.0f} ms > {budget_ms:.0f} ms")
+        return 1
+    print(f"\nWithin budget: {total:.0f} ms <= {budget_ms:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, help="Defaults to STARTUP_BUDGET_MS")
+    parser.add_argument("--path", default=DEFAULT_PROBE_PATH)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(asyncio.run(measure_child(args.path))))
+    else:
+        sys.exit(main(args))
@@ -0,0 +1,135 @@
+"""
+Recomputes the per-question and score statistics from the stored submissions
+and replaces the incrementally maintained tables with the result.
+
+Submissions are read in id order in chunks of ``--chunk-size`` and graded by
+``--workers`` processes; the per-chunk counts are summed and written in one
+transaction. Submissions flushed while the rebuild runs would be counted
+twice or not at all, so run it with submission intake stopped.
+
+    python -m app.commands.rebuild_stats --workers 4 --chunk-size 5000
+"""
+
+import argparse
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, insert
+from sqlmodel import select
+
+from app.core.db import engine
+from app.models.exercise import Exercise as ExerciseModel
+from app.models.exercise_set import ExerciseSet as ExerciseSetModel
+from app.models.submission import Submission
+from app.services.stats_service import (
+    StatDeltas,
+    compile_set_answer_key,
+    compute_stat_deltas,
+)
+
+logger = logging.getLogger(__name__)
+
+# (exercise set id, answers) pairs.
+Chunk = List[Tuple[str, Dict[str, Any]]]
+
+
+def grade_chunk(
+    answer_keys: Dict[str, List[Dict[str, Any]]], chunk: Chunk
+) -> StatDeltas:
+    """Runs in a worker process; only plain data crosses the process boundary."""
+    by_set: Dict[str, List[Dict[str, Any]]] = {}
+    for set_id, answers in chunk:
+        by_set.setdefault(set_id, []).append(answers)
+
+    deltas = StatDeltas()
+    for set_id, submissions in by_set.items():
+        keys = compile_set_answer_key(answer_keys.get(set_id) or [])
+        deltas.update(compute_stat_deltas(keys, submissions))
+    return deltas
+
+
+def load_answer_keys() -> Dict[str, List[Dict[str, Any]]]:
+    with engine.connect() as connection:
+        rows = connection.execute(
+            select(ExerciseSetModel.id, ExerciseSetModel.answer_key).where(
+                ExerciseSetModel.answer_key.is_not(None)
+            )
+        )
+        return {str(set_id): answer_key for set_id, answer_key in rows}
+
+
+def read_chunks(chunk_size: int) -> Iterator[Chunk]:
+    """Pages through submissions by id, one short query per chunk."""
+    last_id = None
+    while True:
+        statement = (
+            select(Submission.id, Submission.exercise_set_id, Submission.answers)
+            .order_by(Submission.id)
+            .limit(chunk_size)
+        )
+        if last_id is not None:
+            statement = statement.where(Submission.id > last_id)
+        with engine.connect() as connection:
+            rows = connection.execute(statement).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        yield [(str(row.exercise_set_id), row.answers) for row in rows]
+
+
+def write_stats(deltas: StatDeltas) -> None:
+    with engine.begin() as connection:
+        exercise_ids = deltas.exercise_ids()
+        if exercise_ids:
+            existing = connection.execute(
+                select(ExerciseModel.id).where(
+                    ExerciseModel.id.in_([UUID(i) for i in exercise_ids])
+                )
+            )
+            deltas.discard_exercises(exercise_ids - {str(i) for (i,) in existing})
+
+        for table, rows in deltas.table_rows().items():
+            connection.execute(delete(table))
+            if rows:
+                connection.execute(insert(table), rows)
+
+
+def rebuild_stats(workers: int, chunk_size: int) -> StatDeltas:
+    answer_keys = load_answer_keys()
+    totals = StatDeltas()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Only a few chunks per worker are read ahead, so memory stays bounded
+        # however many submissions there are.
+        in_flight: Deque[Future] = deque()
+        for chunk in read_chunks(chunk_size):
+            in_flight.append(pool.submit(grade_chunk, answer_keys, chunk))
+            if len(in_flight) >= 2 * workers:
+                totals.update(in_flight.popleft().result())
+        for future in in_flight:
+            totals.update(future.result())
+    write_stats(totals)
+    return totals
+
+
+def main(args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    totals = rebuild_stats(args.workers, args.chunk_size)
+    logger.info(
+        "Rebuilt statistics for %d exercises (%d graded attempts) in %.1fs",
+        len(totals.exercise_ids()),
+        sum(totals.scores.values()),
+        time.perf_counter() - started,
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    main(parser.parse_args())
@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import (
+    ANSWER_KEY_CACHE_MAX_SIZE,
+    PRINCIPAL_CACHE_MAX_SIZE,
+    PRINCIPAL_CACHE_TTL_SECONDS,
+    SNAPSHOT_CACHE_MAX_SIZE,
+    SNAPSHOT_CACHE_TTL_SECONDS,
+    TOKEN_CACHE_MAX_SIZE,
+)
+from app.models.user import User
+
+
+class CacheBackend(Protocol):
+    """
+    Storage used by Cache. The in-process LocalCacheBackend is the default; a
+    multi-worker deployment can assign a shared implementation (e.g. Redis)
+    to ``Cache.backend`` so that invalidations reach every worker.
+    """
+
+    def get(self, key: str) -> Optional[Any]: ...
+
+    def set(self, key: str, value: Any, ttl: float) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class LocalCacheBackend:
+    """Bounded in-process LRU cache with a per-entry expiry time."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class Cache:
+    """A backend plus a default TTL and hit/miss counters."""
+
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self.backend.set(key, value, self.ttl if ttl is None else ttl)
+
+    def delete(self, key: str) -> None:
+        self.backend.delete(key)
+
+    def clear(self) -> None:
+        self.backend.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+# User id -> cached user fields (without the password hash).
+principal_cache = Cache(
+    LocalCacheBackend(PRINCIPAL_CACHE_MAX_SIZE), PRINCIPAL_CACHE_TTL_SECONDS
+)
+# SHA-256 of a bearer token -> user id, kept until the token's "exp".
+token_cache = Cache(LocalCacheBackend(TOKEN_CACHE_MAX_SIZE), 0)
+# Access code -> PublishedSnapshot (set id, JSON bytes, content hash).
+snapshot_cache = Cache(
+    LocalCacheBackend(SNAPSHOT_CACHE_MAX_SIZE), SNAPSHOT_CACHE_TTL_SECONDS
+)
+# Exercise id, version and normalization -> compiled answer key. Keys include
+# the exercise's version column, so stale entries are never read; the TTL only
+# bounds how long they occupy memory.
+answer_key_cache = Cache(LocalCacheBackend(ANSWER_KEY_CACHE_MAX_SIZE), 3600)
+
+
+# Evicts principals on ORM flushes only. Core update()/delete() statements,
+# foreign-key cascades, other processes and other workers' local caches are
+# not seen; for those the TTL (PRINCIPAL_CACHE_TTL_SECONDS) is the only bound
+# on how long a changed or deleted user stays authenticated.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def invalidate_principal(mapper, connection, target: User) -> None:
+    principal_cache.delete(str(target.id))
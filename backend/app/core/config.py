@@ -11,3 +11,94 @@ if not SECRET_KEY:
 
 ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+
+# Keyset pagination and NDJSON streaming for GET /exercises/.
+EXERCISE_PAGE_DEFAULT_LIMIT: int = int(os.getenv("EXERCISE_PAGE_DEFAULT_LIMIT", 50))
+EXERCISE_PAGE_MAX_LIMIT: int = int(os.getenv("EXERCISE_PAGE_MAX_LIMIT", 500))
+EXERCISE_STREAM_CHUNK_SIZE: int = int(os.getenv("EXERCISE_STREAM_CHUNK_SIZE", 100))
+
+# Caches used to authenticate requests without a database round trip.
+# Writes that bypass the ORM are only seen once a cached principal expires.
+PRINCIPAL_CACHE_TTL_SECONDS: float = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 15))
+PRINCIPAL_CACHE_MAX_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", 10_000))
+TOKEN_CACHE_MAX_SIZE: int = int(os.getenv("TOKEN_CACHE_MAX_SIZE", 10_000))
+
+# bcrypt cost and the process pool that runs it.
+PASSWORD_BCRYPT_ROUNDS: int = int(os.getenv("PASSWORD_BCRYPT_ROUNDS", 12))
+PASSWORD_REHASH_ON_LOGIN: bool = os.getenv("PASSWORD_REHASH_ON_LOGIN", "true") == "true"
+PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+PASSWORD_HASH_QUEUE_DEPTH: int = int(os.getenv("PASSWORD_HASH_QUEUE_DEPTH", 32))
+
+# Per-request SQL profiling: share of requests sampled, and the duration above
+# which a sampled request is logged with its full statement list.
+PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", 0.01))
+PROFILING_SLOW_REQUEST_MS: float = float(os.getenv("PROFILING_SLOW_REQUEST_MS", 500))
+
+# Statement budgets declared on service functions: "raise" fails the call (use
+# in tests and CI), "log" logs a warning, "off" skips counting entirely.
+QUERY_BUDGET_MODE: str = os.getenv("QUERY_BUDGET_MODE", "log")
+
+# Bloom filters answering most /validate lookups without a database query.
+AVAILABILITY_FILTER_CAPACITY: int = int(
+    os.getenv("AVAILABILITY_FILTER_CAPACITY", 100_000)
+)
+AVAILABILITY_FILTER_ERROR_RATE: float = float(
+    os.getenv("AVAILABILITY_FILTER_ERROR_RATE", 0.01)
+)
+# How often each worker adds users registered through other workers.
+AVAILABILITY_REFRESH_SECONDS: float = float(
+    os.getenv("AVAILABILITY_REFRESH_SECONDS", 5)
+)
+
+# Published exercise-set snapshots served to learners, keyed by access code.
+# Deleting a set evicts it only from the worker that handled the delete, so
+# the TTL bounds how long other workers keep serving it; browsers and proxies
+# may add up to SNAPSHOT_HTTP_MAX_AGE_SECONDS before they revalidate.
+SNAPSHOT_CACHE_MAX_SIZE: int = int(os.getenv("SNAPSHOT_CACHE_MAX_SIZE", 1_000))
+SNAPSHOT_CACHE_TTL_SECONDS: float = float(os.getenv("SNAPSHOT_CACHE_TTL_SECONDS", 60))
+SNAPSHOT_HTTP_MAX_AGE_SECONDS: int = int(os.getenv("SNAPSHOT_HTTP_MAX_AGE_SECONDS", 60))
+
+# Grading: largest batch accepted per request, and compiled answer keys kept.
+GRADING_MAX_SUBMISSIONS: int = int(os.getenv("GRADING_MAX_SUBMISSIONS", 5_000))
+ANSWER_KEY_CACHE_MAX_SIZE: int = int(os.getenv("ANSWER_KEY_CACHE_MAX_SIZE", 1_000))
+
+# Write-behind buffer for exam submissions: queued rows before answering 429,
+# and the size or age at which a batch is flushed.
+SUBMISSION_QUEUE_MAX_SIZE: int = int(os.getenv("SUBMISSION_QUEUE_MAX_SIZE", 10_000))
+SUBMISSION_FLUSH_BATCH_SIZE: int = int(os.getenv("SUBMISSION_FLUSH_BATCH_SIZE", 500))
+SUBMISSION_FLUSH_INTERVAL_SECONDS: float = float(
+    os.getenv("SUBMISSION_FLUSH_INTERVAL_SECONDS", 0.2)
+)
+
+# Exercise search: results per page, how deep pages may go, and the trigram
+# similarity above which a misspelled word still matches.
+SEARCH_PAGE_DEFAULT_LIMIT: int = int(os.getenv("SEARCH_PAGE_DEFAULT_LIMIT", 20))
+SEARCH_PAGE_MAX_LIMIT: int = int(os.getenv("SEARCH_PAGE_MAX_LIMIT", 100))
+SEARCH_MAX_OFFSET: int = int(os.getenv("SEARCH_MAX_OFFSET", 1_000))
+SEARCH_SIMILARITY_THRESHOLD: float = float(
+    os.getenv("SEARCH_SIMILARITY_THRESHOLD", 0.5)
+)
+
+# Most exercise IDs accepted by one bulk delete request.
+EXERCISE_BULK_DELETE_MAX_IDS: int = int(
+    os.getenv("EXERCISE_BULK_DELETE_MAX_IDS", 1_000)
+)
+
+# Streaming exercise import: rows per transaction, the longest accepted line
+# (or CSV record), and how many row errors are listed in the response.
+IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", 1_000))
+IMPORT_MAX_LINE_BYTES: int = int(os.getenv("IMPORT_MAX_LINE_BYTES", 1_048_576))
+IMPORT_MAX_REPORTED_ERRORS: int = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", 100))
+
+# Read-your-writes: for this long after a successful write request, a client's
+# reads go to the primary instead of a possibly lagging replica.
+READ_YOUR_WRITES_SECONDS: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+READ_YOUR_WRITES_COOKIE: str = os.getenv("READ_YOUR_WRITES_COOKIE", "last_write")
+
+# Cold-start budget: the most milliseconds a fresh process may take from
+# importing the app to answering its first request (app.commands.profile_startup).
+STARTUP_BUDGET_MS: float = float(os.getenv("STARTUP_BUDGET_MS", 2_000))
+
+# Bearer token for GET /metrics, which exposes pool, cache and queue internals.
+# The endpoint answers 404 while this is unset.
+METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
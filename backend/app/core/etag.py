@@ -0,0 +1,20 @@
+import hashlib
+from typing import Iterable, Optional
+
+
+def make_etag(parts: Iterable[object]) -> str:
+    """Builds a strong ETag from the values that identify a representation."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluates an If-None-Match header against the current ETag."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    # Weak comparison is what If-None-Match specifies; strip any W/ prefix.
+    return "*" in candidates or etag in (c.removeprefix("W/") for c in candidates)
@@ -0,0 +1,46 @@
+from types import MappingProxyType
+from typing import Iterable, Optional, Tuple
+from uuid import UUID
+
+from sqlmodel import Session, select
+
+from app.models.exercise import ExerciseType
+
+
+class ExerciseTypeRegistry:
+    """
+    Immutable id <-> name lookup for the exercise type table. The table is a
+    small, fixed set that only init_db writes, just before the lifespan hook
+    loads it, so it is read once instead of being queried or eager loaded on
+    every request.
+    """
+
+    def __init__(self, types: Iterable[Tuple[UUID, str]] = ()):
+        types = tuple(types)
+        self._names_by_id = MappingProxyType({id: name for id, name in types})
+        self._ids_by_name = MappingProxyType({name: id for id, name in types})
+
+    def id_for(self, name: str) -> Optional[UUID]:
+        return self._ids_by_name.get(name)
+
+    def name_for(self, exercise_type_id: UUID) -> Optional[str]:
+        return self._names_by_id.get(exercise_type_id)
+
+    def __len__(self) -> int:
+        return len(self._names_by_id)
+
+
+_registry = ExerciseTypeRegistry()
+
+
+def get_exercise_type_registry() -> ExerciseTypeRegistry:
+    return _registry
+
+
+def load_exercise_types(session: Session) -> ExerciseTypeRegistry:
+    """Fills the registry from the database; called once at startup."""
+    global _registry
+    rows = session.exec(select(ExerciseType.id, ExerciseType.name)).all()
+    _registry = ExerciseTypeRegistry(rows)
+    return _registry
+
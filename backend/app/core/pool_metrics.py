@@ -0,0 +1,126 @@
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Counters describing how requests use one engine's connection pool."""
+
+    def __init__(self):
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.max_connection_age_seconds = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.total_wait_seconds += seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def snapshot(self, pool: Any) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "pool_class": type(pool).__name__,
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "total_wait_seconds": self.total_wait_seconds,
+            "mean_wait_seconds": (
+                self.total_wait_seconds / self.checkouts if self.checkouts else 0.0
+            ),
+            "max_wait_seconds": self.max_wait_seconds,
+            "max_connection_age_seconds": self.max_connection_age_seconds,
+        }
+        if isinstance(pool, QueuePool):
+            data.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+            )
+        return data
+
+
+class InstrumentedPoolMixin:
+    """Times how long each checkout waits for a free connection."""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.timeouts += 1
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - started)
+
+    def recreate(self):
+        # engine.dispose() replaces the pool; keep reporting to the same metrics.
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# Engine name -> (engine, metrics), for reporting.
+_instrumented_engines: Dict[str, Any] = {}
+
+
+def instrument_engine(name: str, engine: Engine) -> PoolMetrics:
+    """
+    Attaches pool event listeners to a (sync) engine and registers it under
+    ``name`` for pool_metrics_snapshot().
+    """
+    metrics = PoolMetrics()
+    if isinstance(engine.pool, InstrumentedPoolMixin):
+        engine.pool.metrics = metrics
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+        connection_record.info["connected_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+        connected_at = connection_record.info.get("connected_at")
+        if connected_at is not None:
+            metrics.max_connection_age_seconds = max(
+                metrics.max_connection_age_seconds, time.monotonic() - connected_at
+            )
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.checkins += 1
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
+
+    _instrumented_engines[name] = (engine, metrics)
+    return metrics
+
+
+def pool_metrics_snapshot() -> Dict[str, Dict[str, Any]]:
+    return {
+        name: metrics.snapshot(engine.pool)
+        for name, (engine, metrics) in _instrumented_engines.items()
+    }
@@ -0,0 +1,171 @@
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import PROFILING_SAMPLE_RATE, PROFILING_SLOW_REQUEST_MS
+
+logger = logging.getLogger(__name__)
+
+
+class RequestProfile:
+    """SQL and serialization timings collected for one sampled request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.statement_count = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        # Kept for every sampled request, but only logged for slow ones.
+        self.statements: List[Tuple[str, float]] = []
+        self.slowest: Optional[Tuple[str, float]] = None
+
+    def record_statement(self, statement: str, seconds: float) -> None:
+        self.statement_count += 1
+        self.db_seconds += seconds
+        self.statements.append((statement, seconds))
+        if self.slowest is None or seconds > self.slowest[1]:
+            self.slowest = (statement, seconds)
+
+    def elapsed_seconds(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        metrics = [
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.statement_count} statements"',
+            f"serialize;dur={self.serialize_seconds * 1000:.2f}",
+            f"app;dur={self.elapsed_seconds() * 1000:.2f}",
+        ]
+        if self.slowest is not None:
+            metrics.insert(1, f"db-slowest;dur={self.slowest[1] * 1000:.2f}")
+        return ", ".join(metrics)
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "request_profile", default=None
+)
+
+
+def profile_engine(engine: Engine) -> None:
+    """Times every statement run through ``engine`` for the active profile."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if _current_profile.get() is not None:
+            conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        profile = _current_profile.get()
+        if profile is not None and conn.info.get("profile_started"):
+            started = conn.info["profile_started"].pop()
+            profile.record_statement(statement, time.perf_counter() - started)
+
+
+@contextmanager
+def serialization_timer() -> Iterator[None]:
+    """Adds the time spent in the block to the active profile's serialize time."""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.serialize_seconds += time.perf_counter() - started
+
+
+def log_profile(scope: Dict[str, Any], status: Optional[int], profile: RequestProfile):
+    elapsed_ms = profile.elapsed_seconds() * 1000
+    record: Dict[str, Any] = {
+        "method": scope["method"],
+        "path": scope["path"],
+        "status": status,
+        "duration_ms": round(elapsed_ms, 2),
+        "db_statements": profile.statement_count,
+        "db_ms": round(profile.db_seconds * 1000, 2),
+        "serialize_ms": round(profile.serialize_seconds * 1000, 2),
+        "slowest_statement": profile.slowest and profile.slowest[0],
+        "slowest_statement_ms": profile.slowest and round(profile.slowest[1] * 1000, 2),
+    }
+    if elapsed_ms >= PROFILING_SLOW_REQUEST_MS:
+        record["statements"] = [
+            {"sql": sql, "ms": round(seconds * 1000, 2)}
+            for sql, seconds in profile.statements
+        ]
+        logger.warning("slow request %s", json.dumps(record, default=str))
+    else:
+        logger.info("request profile %s", json.dumps(record, default=str))
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a PROFILING_SAMPLE_RATE share of HTTP requests. Sampled responses
+    get a Server-Timing header and a structured log line; requests slower than
+    PROFILING_SLOW_REQUEST_MS are logged at WARNING with every statement.
+
+    Server-Timing covers the work done before the response headers are sent,
+    so for streamed bodies the log line is the complete record.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or PROFILING_SAMPLE_RATE <= 0
+            or random.random() >= PROFILING_SAMPLE_RATE
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        status = None
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", profile.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_profile.reset(token)
+            log_profile(scope, status, profile)
+
+
+class StartupProfile:
+    """Wall-clock duration of each phase of the app lifespan's startup."""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: round(seconds * 1000, 2) for name, seconds in self.phases.items()}
+
+    def log(self) -> None:
+        logger.info("startup phases %s", json.dumps(self.as_dict()))
+
+
+startup_profile = StartupProfile()
@@ -0,0 +1,118 @@
+import functools
+import inspect
+import logging
+from contextvars import ContextVar
+from typing import Any, Callable, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import QUERY_BUDGET_MODE
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+class QueryBudget:
+    """
+    Counts the statements executed while active and reports when more than
+    ``max_statements`` were run. Budgets nest; every active budget counts a
+    statement run by a nested call.
+
+    QUERY_BUDGET_MODE decides what happens on overrun: ``raise`` (for tests and
+    CI), ``log`` (the default) or ``off``.
+    """
+
+    def __init__(self, max_statements: int, name: str = "query budget"):
+        self.max_statements = max_statements
+        self.name = name
+        self.statements: List[Any] = []
+        self._token = None
+
+    def __enter__(self) -> "QueryBudget":
+        self._token = _active_budgets.set(_active_budgets.get() + (self,))
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _active_budgets.reset(self._token)
+        # An error raised by the body is more useful than a budget report.
+        if exc_type is None and len(self.statements) > self.max_statements:
+            self.report()
+
+    def report(self) -> None:
+        message = (
+            f"{self.name} ran {len(self.statements)} statements, "
+            f"over its budget of {self.max_statements}:\n"
+            + "\n".join(f"  {statement}" for statement in self.statements)
+        )
+        if QUERY_BUDGET_MODE == "raise":
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+_active_budgets: ContextVar[Tuple[QueryBudget, ...]] = ContextVar(
+    "query_budgets", default=()
+)
+
+
+def track_query_budgets(engine: Engine) -> None:
+    """Counts statements run through ``engine`` against the active budgets."""
+
+    # before_execute fires once per statement, so a multi-row insert split
+    # into several insertmanyvalues batches still counts once.
+    @event.listens_for(engine, "before_execute")
+    def before_execute(conn, clauseelement, multiparams, params, execution_options):
+        for budget in _active_budgets.get():
+            budget.statements.append(clauseelement)
+
+
+def query_budget(max_statements: int) -> Callable:
+    """
+    Declares the most statements a function may run per call. Works on plain
+    and async functions; for async generators the budget applies to each
+    yielded item.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        if QUERY_BUDGET_MODE == "off":
+            return func
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        if inspect.isasyncgenfunction(func):
+
+            @functools.wraps(func)
+            async def async_gen_wrapper(*args, **kwargs):
+                iterator = func(*args, **kwargs)
+                try:
+                    while True:
+                        with QueryBudget(max_statements, name):
+                            try:
+                                item = await iterator.__anext__()
+                            except StopAsyncIteration:
+                                return
+                        yield item
+                finally:
+                    await iterator.aclose()
+
+            return async_gen_wrapper
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with QueryBudget(max_statements, name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with QueryBudget(max_statements, name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,85 @@
+import re
+import time
+from http.cookies import SimpleCookie
+
+from starlette.requests import HTTPConnection
+
+from app.core.config import (
+    API_V1_STR,
+    READ_YOUR_WRITES_COOKIE,
+    READ_YOUR_WRITES_SECONDS,
+)
+
+# Requests that may write; only these start a read-your-writes window.
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+# POST routes that only read (a POST for the size of their body), so they
+# must not move the client's reads to the primary. Matched on the raw path,
+# as the middleware runs before routing.
+READ_ONLY_POST_PATHS = re.compile(
+    rf"{re.escape(API_V1_STR)}/(?:validate/batch|exercises/[^/]+/grade)"
+)
+
+
+def starts_write_window(scope) -> bool:
+    method = scope["method"]
+    if method == "POST":
+        return READ_ONLY_POST_PATHS.fullmatch(scope["path"]) is None
+    return method in WRITE_METHODS
+
+
+def reads_from_primary(connection: HTTPConnection) -> bool:
+    """
+    True while the client is inside the read-your-writes window of its last
+    write, so a replica that has not caught up cannot hide that write.
+    """
+    last_write = connection.cookies.get(READ_YOUR_WRITES_COOKIE)
+    if last_write is None:
+        return False
+    try:
+        return time.time() - float(last_write) < READ_YOUR_WRITES_SECONDS
+    except ValueError:
+        return False
+
+
+def last_write_cookie(now: float) -> bytes:
+    cookie = SimpleCookie()
+    cookie[READ_YOUR_WRITES_COOKIE] = f"{now:.3f}"
+    cookie[READ_YOUR_WRITES_COOKIE].update(
+        {
+            "max-age": int(READ_YOUR_WRITES_SECONDS) + 1,
+            "path": "/",
+            "httponly": True,
+            "samesite": "lax",
+        }
+    )
+    return cookie.output(header="").strip().encode("latin-1")
+
+
+class ReadYourWritesMiddleware:
+    """
+    Stamps successful write requests with a short-lived cookie holding the
+    time of the write. Read sessions (see deps.get_read_db) use the primary
+    while it is fresh and the replica otherwise. The cookie only picks a
+    database; it grants no access, so it is not signed.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not starts_write_window(scope)
+            or READ_YOUR_WRITES_SECONDS <= 0
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = list(message.get("headers", []))
+                headers.append((b"set-cookie", last_write_cookie(time.time())))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -1,11 +1,111 @@
-from passlib.context import CryptContext
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from fastapi import HTTPException, status
+
+from app.core.config import (
+    PASSWORD_BCRYPT_ROUNDS,
+    PASSWORD_HASH_QUEUE_DEPTH,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_REHASH_ON_LOGIN,
+)
+
+
+@functools.cache
+def get_pwd_context():
+    """
+    The passlib context, built on first use: importing passlib and loading
+    the bcrypt backend is left to the processes that actually hash, such as
+    the password pool workers, instead of every server start.
+    """
+    from passlib.context import CryptContext
+
+    # Hashes made with fewer rounds than configured are flagged by
+    # verify_and_update, so they can be upgraded on the next successful login.
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=PASSWORD_BCRYPT_ROUNDS,
+        bcrypt__min_rounds=PASSWORD_BCRYPT_ROUNDS,
+    )
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verifies a password and, when the rehash policy is on and the stored hash
+    uses an outdated cost, also returns a replacement hash.
+    """
+    if not PASSWORD_REHASH_ON_LOGIN:
+        return verify_password(plain_password, hashed_password), None
+    return get_pwd_context().verify_and_update(plain_password, hashed_password)
+
+
+# bcrypt holds the GIL for its whole run, so it is executed in a dedicated
+# process pool instead of the threadpool that serves every other endpoint.
+_password_pool: Optional[ProcessPoolExecutor] = None
+_password_jobs_in_flight = 0
+
+
+def get_password_pool() -> ProcessPoolExecutor:
+    global _password_pool
+    if _password_pool is None:
+        # "spawn" avoids forking a process that already runs an event loop and
+        # threads; workers only need to import this module.
+        _password_pool = ProcessPoolExecutor(
+            max_workers=PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _password_pool
+
+
+def shutdown_password_pool() -> None:
+    global _password_pool
+    if _password_pool is not None:
+        _password_pool.shutdown(cancel_futures=True)
+        _password_pool = None
+
+
+async def run_in_password_pool(func, *args):
+    """
+    Runs a password function in the process pool. Fails fast with a 503 when
+    all workers are busy and PASSWORD_HASH_QUEUE_DEPTH jobs are already waiting.
+    """
+    global _password_jobs_in_flight
+    if _password_jobs_in_flight >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_DEPTH:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent sign-in requests. Please retry shortly.",
+            headers={"Retry-After": "1"},
+        )
+
+    _password_jobs_in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_password_pool(), func, *args)
+    finally:
+        _password_jobs_in_flight -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    return await run_in_password_pool(hash_password, password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    return await run_in_password_pool(
+        verify_and_update_password, plain_password, hashed_password
+    )
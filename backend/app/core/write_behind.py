@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import Table, exc, insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+# Called with the connection and rows of every write, inside its transaction.
+FlushHook = Callable[[AsyncConnection, List[Dict[str, Any]]], Awaitable[None]]
+
+
+class QueueFull(Exception):
+    pass
+
+
+class WriteBehindMetrics:
+    def __init__(self):
+        self.accepted = 0
+        self.rejected = 0
+        # Rows that violated a constraint (e.g. their parent was deleted).
+        self.dropped = 0
+        self.max_depth = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.flushed_rows = 0
+        self.total_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self.last_flush_seconds = 0.0
+
+    def record_flush(self, rows: int, seconds: float) -> None:
+        self.flushes += 1
+        self.flushed_rows += rows
+        self.total_flush_seconds += seconds
+        self.last_flush_seconds = seconds
+        self.max_flush_seconds = max(self.max_flush_seconds, seconds)
+
+
+class WriteBehindQueue:
+    """
+    Buffers rows for ``table`` in a bounded in-process queue and inserts them
+    from a background task in batches: whenever ``batch_size`` rows are waiting,
+    or ``flush_interval`` seconds after the first row of a batch arrived.
+
+    put() never waits: when ``max_size`` rows are already queued it raises
+    QueueFull, which callers turn into a 429. A failed flush is retried with
+    backoff while rows keep queueing, so a database outage ends in rejected
+    writes rather than lost ones. stop() flushes everything still buffered.
+
+    ``on_flush`` runs in the same transaction as each insert, so anything it
+    writes (e.g. aggregates of the rows) commits or rolls back with them.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        table: Table,
+        engine: AsyncEngine,
+        max_size: int,
+        batch_size: int,
+        flush_interval: float,
+        on_flush: Optional[FlushHook] = None,
+    ):
+        self.name = name
+        self.table = table
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_flush = on_flush
+        self.metrics = WriteBehindMetrics()
+        self._queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(max_size)
+        # Rows taken off the queue but not yet written.
+        self._pending: List[Dict[str, Any]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._flushing: Optional[asyncio.Task] = None
+
+    def put(self, row: Dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.metrics.rejected += 1
+            raise QueueFull(self.name)
+        self.metrics.accepted += 1
+        self.metrics.max_depth = max(self.metrics.max_depth, self._queue.qsize())
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"{self.name}-flusher")
+
+    async def stop(self) -> None:
+        """Stops the background task and writes every buffered row."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._flushing is not None:
+            # The flush in progress was shielded from the cancellation.
+            try:
+                await self._flushing
+            except Exception:
+                pass
+            self._flushing = None
+
+        while not self._queue.empty():
+            self._pending.append(self._queue.get_nowait())
+        while self._pending:
+            try:
+                await self._flush_batch()
+            except Exception:
+                logger.exception(
+                    "%s: dropping %d rows at shutdown", self.name, len(self._pending)
+                )
+                self._pending = []
+
+    async def _run(self) -> None:
+        backoff = self.flush_interval
+        while True:
+            if not self._pending:
+                self._pending.append(await self._queue.get())
+            await self._fill_batch()
+
+            self._flushing = asyncio.ensure_future(self._flush_batch())
+            try:
+                await asyncio.shield(self._flushing)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("%s: flush failed, retrying", self.name)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+                continue
+            finally:
+                if self._flushing.done():
+                    self._flushing = None
+            backoff = self.flush_interval
+
+    async def _fill_batch(self) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(self._pending) < self.batch_size:
+            try:
+                self._pending.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                self._pending.append(
+                    await asyncio.wait_for(self._queue.get(), remaining)
+                )
+            except asyncio.TimeoutError:
+                return
+
+    async def _flush_batch(self) -> None:
+        """Writes the oldest pending rows and removes them once committed."""
+        batch = self._pending[: self.batch_size]
+        started = time.perf_counter()
+        try:
+            # One executemany; the dialect turns it into multi-row INSERTs.
+            async with self.engine.begin() as connection:
+                await connection.execute(insert(self.table), batch)
+                if self.on_flush is not None:
+                    await self.on_flush(connection, batch)
+        except exc.IntegrityError:
+            # Retrying would fail forever; write the valid rows one by one.
+            await self._flush_rows_individually(batch)
+        except Exception:
+            self.metrics.failed_flushes += 1
+            raise
+        del self._pending[: len(batch)]
+        self.metrics.record_flush(len(batch), time.perf_counter() - started)
+
+    async def _flush_rows_individually(self, batch: List[Dict[str, Any]]) -> None:
+        for row in batch:
+            try:
+                async with self.engine.begin() as connection:
+                    await connection.execute(insert(self.table), row)
+                    if self.on_flush is not None:
+                        await self.on_flush(connection, [row])
+            except exc.IntegrityError as e:
+                self.metrics.dropped += 1
+                logger.warning("%s: dropping row that violates %s", self.name, e.orig)
+
+    def stats(self) -> Dict[str, Any]:
+        metrics = self.metrics
+        return {
+            "depth": self._queue.qsize() + len(self._pending),
+            "max_size": self._queue.maxsize,
+            "max_depth": metrics.max_depth,
+            "accepted": metrics.accepted,
+            "rejected": metrics.rejected,
+            "dropped": metrics.dropped,
+            "flushes": metrics.flushes,
+            "failed_flushes": metrics.failed_flushes,
+            "flushed_rows": metrics.flushed_rows,
+            "last_flush_seconds": metrics.last_flush_seconds,
+            "mean_flush_seconds": (
+                metrics.total_flush_seconds / metrics.flushes
+                if metrics.flushes
+                else 0.0
+            ),
+            "max_flush_seconds": metrics.max_flush_seconds,
+        }
@@ -1,5 +1,28 @@
 from contextlib import asynccontextmanager
-from app.core.db import init_db
+from sqlmodel import Session
+
+from app.core.db import (
+    DB_BOOTSTRAP_ON_STARTUP,
+    async_engine,
+    engine,
+    init_db,
+    replica_async_engine,
+)
+from app.core.exercise_types import load_exercise_types
+from app.core.profiling import ProfilingMiddleware, startup_profile
+from app.core.read_routing import ReadYourWritesMiddleware
+from app.core.security import shutdown_password_pool
+
+# Imported eagerly on purpose: the routers import these services anyway, and
+# their indexes and queue are always started below. numpy and passlib, which
+# they reach, are only imported on first use.
+from app.services.availability_service import (
+    load_availability,
+    start_availability_refresh,
+    stop_availability_refresh,
+)
+from app.services.search_service import load_search_index
+from app.services.submission_service import submission_queue
 from fastapi import FastAPI
 from app.api.api_router import api_router
 from app.core.config import API_V1_STR
@@ -8,13 +31,34 @@ from app.core.config import API_V1_STR
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handles startup and shutdown logic using the lifespan function."""
-    print("Initializing database...")
-    init_db()
+    if DB_BOOTSTRAP_ON_STARTUP:
+        print("Initializing database...")
+        with startup_profile.phase("init_db"):
+            init_db()
+    with Session(engine) as session:
+        with startup_profile.phase("load_exercise_types"):
+            load_exercise_types(session)
+        with startup_profile.phase("load_availability"):
+            load_availability(session)
+        with startup_profile.phase("load_search_index"):
+            load_search_index(session)
+    submission_queue.start()
+    start_availability_refresh()
+    startup_profile.log()
     yield  # The application runs here
     print("Application shutdown...")
+    await stop_availability_refresh()
+    # Write out queued submissions before the engine goes away.
+    await submission_queue.stop()
+    await async_engine.dispose()
+    if replica_async_engine is not async_engine:
+        await replica_async_engine.dispose()
+    shutdown_password_pool()
 
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
 
 
 app.include_router(api_router, prefix=API_V1_STR)
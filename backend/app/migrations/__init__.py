@@ -0,0 +1,60 @@
+"""
+Versioned schema changes for databases created from older models.
+
+init_db creates missing tables from the models and then applies, in order,
+every migration whose VERSION is not yet recorded in schema_migration, all
+under the bootstrap lock. A new database already matches the models, so
+each migration must be idempotent (``IF [NOT] EXISTS``, or checking the
+current schema first); there it only records its version. Migrations run in
+autocommit mode so that Postgres can build indexes concurrently.
+
+A migration is a module with VERSION, DESCRIPTION and ``upgrade(connection)``,
+listed in MIGRATIONS.
+"""
+
+from datetime import datetime, timezone
+from types import ModuleType
+from typing import List
+
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Connection
+
+from app.migrations import (
+    m0001_hot_path_indexes,
+    m0002_cascade_exercise_children,
+    m0003_exercise_version,
+    m0004_case_insensitive_user_indexes,
+    m0005_user_created_at,
+    m0006_search_columns,
+    m0007_timezone_aware_timestamps,
+)
+from app.models.schema_migration import SchemaMigration
+
+MIGRATIONS: List[ModuleType] = [
+    m0001_hot_path_indexes,
+    m0002_cascade_exercise_children,
+    m0003_exercise_version,
+    m0004_case_insensitive_user_indexes,
+    m0005_user_created_at,
+    m0006_search_columns,
+    m0007_timezone_aware_timestamps,
+]
+
+
+def run_migrations(connection: Connection) -> List[int]:
+    """Applies pending migrations and returns their versions."""
+    applied = set(connection.execute(select(SchemaMigration.version)).scalars())
+    versions = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.VERSION):
+        if migration.VERSION in applied:
+            continue
+        migration.upgrade(connection)
+        connection.execute(
+            insert(SchemaMigration).values(
+                version=migration.VERSION,
+                description=migration.DESCRIPTION,
+                applied_at=datetime.now(timezone.utc),
+            )
+        )
+        versions.append(migration.VERSION)
+    return versions
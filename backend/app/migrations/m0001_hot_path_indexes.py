@@ -0,0 +1,56 @@
+"""
+Indexes the foreign keys on the exercise hot path and drops the indexes that
+duplicated primary keys (declared with ``index=True``).
+"""
+
+from sqlalchemy.engine import Connection
+
+from app.migrations.operations import create_index, drop_index
+
+VERSION = 1
+DESCRIPTION = "Index exercise owner and child foreign keys; drop duplicate PK indexes"
+
+DUPLICATE_PRIMARY_KEY_INDEXES = [
+    "ix_user_id",
+    "ix_exercisetype_id",
+    "ix_exercise_id",
+    "ix_fillgapsentence_id",
+    "ix_multiplechoicequestion_id",
+    "ix_exerciseset_id",
+    "ix_submission_id",
+]
+
+
+def upgrade(connection: Connection) -> None:
+    create_index(
+        connection,
+        "ix_exercise_owner_id_created_at_id",
+        "exercise",
+        ["owner_id", "created_at", "id"],
+    )
+    create_index(
+        connection,
+        "ix_fillgapsentence_exercise_id_created_at",
+        "fillgapsentence",
+        ["exercise_id", "created_at"],
+    )
+    create_index(
+        connection,
+        "ix_multiplechoicequestion_exercise_id_created_at",
+        "multiplechoicequestion",
+        ["exercise_id", "created_at"],
+    )
+    create_index(
+        connection,
+        "ix_exerciseset_owner_id_created_at_id",
+        "exerciseset",
+        ["owner_id", "created_at", "id"],
+    )
+    create_index(
+        connection,
+        "ix_exercisesetexercise_exercise_id",
+        "exercisesetexercise",
+        ["exercise_id"],
+    )
+    for name in DUPLICATE_PRIMARY_KEY_INDEXES:
+        drop_index(connection, name)
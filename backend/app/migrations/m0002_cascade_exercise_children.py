@@ -0,0 +1,18 @@
+"""
+Lets the database delete an exercise's sentences and questions with it
+(ON DELETE CASCADE), so deleting an exercise is a single statement.
+"""
+
+from sqlalchemy.engine import Connection
+
+from app.migrations.operations import cascade_on_delete
+from app.models.fill_gap_sentence import FillGapSentence
+from app.models.multiple_choice_question import MultipleChoiceQuestion
+
+VERSION = 2
+DESCRIPTION = "Cascade exercise deletes to sentences and questions"
+
+
+def upgrade(connection: Connection) -> None:
+    cascade_on_delete(connection, FillGapSentence.__table__, "exercise_id")
+    cascade_on_delete(connection, MultipleChoiceQuestion.__table__, "exercise_id")
@@ -0,0 +1,16 @@
+"""
+Adds exercise.version, the write counter that exercise ETags and cached
+answer keys are built from. Existing rows start at 1.
+"""
+
+from sqlalchemy.engine import Connection
+
+from app.migrations.operations import add_column
+from app.models.exercise import Exercise
+
+VERSION = 3
+DESCRIPTION = "Add exercise.version for ETags and answer key caching"
+
+
+def upgrade(connection: Connection) -> None:
+    add_column(connection, Exercise.__table__, "version")
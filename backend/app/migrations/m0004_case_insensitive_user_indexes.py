@@ -0,0 +1,50 @@
+"""
+Creates the unique lower(username) and lower(email) indexes that make
+usernames and emails case-insensitively unique. Databases created before the
+indexes existed may hold case-only duplicates ("Bob" and "bob"); the
+migration then stops and lists them, since picking which account keeps the
+name is for an operator to decide.
+"""
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection
+
+from app.migrations.operations import concurrently
+from app.models.user import User
+
+VERSION = 4
+DESCRIPTION = "Case-insensitive unique indexes on user username and email"
+
+CASE_INSENSITIVE_INDEXES = {
+    "ix_user_username_lower": User.username,
+    "ix_user_email_lower": User.email,
+}
+
+
+def upgrade(connection: Connection) -> None:
+    duplicates = {}
+    for name, column in CASE_INSENSITIVE_INDEXES.items():
+        lowered = func.lower(column)
+        values = (
+            connection.execute(
+                select(lowered).group_by(lowered).having(func.count() > 1).limit(20)
+            )
+            .scalars()
+            .all()
+        )
+        if values:
+            duplicates[column.name] = values
+    if duplicates:
+        found = "; ".join(
+            f"{field}: {', '.join(values)}" for field, values in duplicates.items()
+        )
+        raise RuntimeError(
+            "Cannot make usernames and emails case-insensitively unique; rename "
+            f"or merge these users first ({found})."
+        )
+
+    for name, column in CASE_INSENSITIVE_INDEXES.items():
+        connection.exec_driver_sql(
+            f"CREATE UNIQUE INDEX{concurrently(connection)} IF NOT EXISTS {name} "
+            f'ON "user" (lower({column.name}))'
+        )
@@ -0,0 +1,29 @@
+"""
+Adds user.created_at and its index, which the availability filters poll to
+learn about registrations made through other workers. Existing users are
+already in the filters from startup, so their value only has to be older
+than any new registration.
+"""
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+
+from app.migrations.operations import add_column, create_index
+from app.models.user import User
+
+VERSION = 5
+DESCRIPTION = "Add user.created_at for availability filter refreshes"
+
+
+def upgrade(connection: Connection) -> None:
+    if connection.dialect.name == "sqlite":
+        # SQLite cannot add a column whose default is CURRENT_TIMESTAMP.
+        columns = {c["name"] for c in inspect(connection).get_columns("user")}
+        if "created_at" not in columns:
+            connection.exec_driver_sql(
+                'ALTER TABLE "user" ADD COLUMN created_at DATETIME NOT NULL '
+                "DEFAULT '1970-01-01 00:00:00'"
+            )
+    else:
+        add_column(connection, User.__table__, "created_at")
+    create_index(connection, "ix_user_created_at", "user", ["created_at"])
@@ -0,0 +1,36 @@
+"""
+Adds the Postgres full-text and trigram search columns and indexes to
+databases whose tables were created before app.models.search declared them;
+until then only new databases got them, from the tables' after_create hooks.
+Nothing to do on other databases, which search in memory.
+
+Adding a generated column rewrites the table under an exclusive lock, so run
+this on a large database at a quiet time. The indexes are built
+concurrently; if a build is interrupted, drop the INVALID index it leaves
+before running the migration again.
+"""
+
+from sqlalchemy.engine import Connection
+
+# The model modules register their tables in SEARCHABLE_TABLES.
+import app.models.exercise  # noqa: F401
+import app.models.fill_gap_sentence  # noqa: F401
+import app.models.multiple_choice_question  # noqa: F401
+from app.migrations.operations import concurrently
+from app.models.search import (
+    CREATE_TRIGRAM_EXTENSION,
+    SEARCHABLE_TABLES,
+    search_column_statements,
+)
+
+VERSION = 6
+DESCRIPTION = "Postgres search_vector columns and GIN/trigram search indexes"
+
+
+def upgrade(connection: Connection) -> None:
+    if connection.dialect.name != "postgresql":
+        return
+    connection.exec_driver_sql(CREATE_TRIGRAM_EXTENSION)
+    for table_name in sorted(SEARCHABLE_TABLES):
+        for statement in search_column_statements(table_name, concurrently(connection)):
+            connection.exec_driver_sql(statement)
@@ -0,0 +1,23 @@
+"""
+Makes the timestamp columns of tables created before the async engine was
+added timezone-aware. asyncpg refuses to bind the aware datetimes the models
+generate to a naive timestamp column, so inserts into those tables failed.
+The naive values are read as UTC, the time zone of the postgres image in
+docker-compose; a server configured with another TimeZone wrote its
+server_default timestamps in that zone instead.
+"""
+
+from sqlalchemy.engine import Connection
+
+from app.migrations.operations import timestamps_to_timestamptz
+from app.models.exercise import Exercise
+from app.models.fill_gap_sentence import FillGapSentence
+from app.models.multiple_choice_question import MultipleChoiceQuestion
+
+VERSION = 7
+DESCRIPTION = "Make exercise, sentence and question timestamps timezone-aware"
+
+
+def upgrade(connection: Connection) -> None:
+    for model in (Exercise, FillGapSentence, MultipleChoiceQuestion):
+        timestamps_to_timestamptz(connection, model.__table__)
@@ -0,0 +1,141 @@
+from typing import Sequence
+
+from sqlalchemy import DateTime, Table, inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn
+
+
+def concurrently(connection: Connection) -> str:
+    # Postgres builds and drops the index without blocking writes to the
+    # table; this needs autocommit, which run_migrations provides.
+    return " CONCURRENTLY" if connection.dialect.name == "postgresql" else ""
+
+
+def create_index(
+    connection: Connection, name: str, table: str, columns: Sequence[str]
+) -> None:
+    connection.exec_driver_sql(
+        f"CREATE INDEX{concurrently(connection)} IF NOT EXISTS {name} "
+        f'ON "{table}" ({", ".join(columns)})'
+    )
+
+
+def drop_index(connection: Connection, name: str) -> None:
+    connection.exec_driver_sql(f"DROP INDEX{concurrently(connection)} IF EXISTS {name}")
+
+
+def cascade_on_delete(connection: Connection, table: Table, column: str) -> None:
+    """
+    Recreates the foreign key on ``table.column`` with ON DELETE CASCADE,
+    unless it already has it. ``table`` is the model's table, which declares
+    the new constraint.
+    """
+    foreign_key = next(
+        foreign_key
+        for foreign_key in inspect(connection).get_foreign_keys(table.name)
+        if foreign_key["constrained_columns"] == [column]
+    )
+    if foreign_key["options"].get("ondelete", "").upper() == "CASCADE":
+        return
+    if connection.dialect.name == "sqlite":
+        rebuild_sqlite_table(connection, table)
+        return
+
+    name = foreign_key["name"]
+    referred_columns = ", ".join(foreign_key["referred_columns"])
+    # NOT VALID swaps the constraint without checking existing rows under the
+    # table lock; VALIDATE then checks them without blocking writes.
+    connection.exec_driver_sql(
+        f'ALTER TABLE "{table.name}" DROP CONSTRAINT {name}, '
+        f"ADD CONSTRAINT {name} FOREIGN KEY ({column}) "
+        f'REFERENCES "{foreign_key["referred_table"]}" ({referred_columns}) '
+        "ON DELETE CASCADE NOT VALID"
+    )
+    connection.exec_driver_sql(f'ALTER TABLE "{table.name}" VALIDATE CONSTRAINT {name}')
+
+
+def rebuild_sqlite_table(connection: Connection, table: Table) -> None:
+    """
+    SQLite cannot alter constraints, so the table is recreated from the model
+    and its rows copied over, in one transaction. Rows whose foreign key
+    points at a row that no longer exists (SQLite did not enforce foreign
+    keys before) are dropped, as a cascade would have done.
+    """
+    old_name = f"_{table.name}_old"
+    old_columns = {
+        column["name"] for column in inspect(connection).get_columns(table.name)
+    }
+    columns = ", ".join(
+        f'"{column.name}"' for column in table.columns if column.name in old_columns
+    )
+    # Foreign keys cannot be switched inside a transaction.
+    connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+    connection.exec_driver_sql("BEGIN")
+    try:
+        # Index names are global, so the old table's must go before the new
+        # table creates its own.
+        for index in inspect(connection).get_indexes(table.name):
+            connection.exec_driver_sql(f'DROP INDEX "{index["name"]}"')
+        connection.exec_driver_sql(f'ALTER TABLE "{table.name}" RENAME TO "{old_name}"')
+        table.create(connection)
+        connection.exec_driver_sql(
+            f'INSERT INTO "{table.name}" ({columns}) SELECT {columns} FROM "{old_name}"'
+        )
+        connection.exec_driver_sql(f'DROP TABLE "{old_name}"')
+        orphans = [
+            row[1]
+            for row in connection.exec_driver_sql(
+                f'PRAGMA foreign_key_check("{table.name}")'
+            )
+        ]
+        for start in range(0, len(orphans), 500):
+            batch = ", ".join(str(rowid) for rowid in orphans[start : start + 500])
+            connection.exec_driver_sql(
+                f'DELETE FROM "{table.name}" WHERE rowid IN ({batch})'
+            )
+        connection.exec_driver_sql("COMMIT")
+    except BaseException:
+        connection.exec_driver_sql("ROLLBACK")
+        raise
+    finally:
+        connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+
+
+def add_column(connection: Connection, table: Table, column: str) -> None:
+    """Adds the model's ``table.column`` to the database table if it is missing."""
+    existing = {c["name"] for c in inspect(connection).get_columns(table.name)}
+    if column in existing:
+        return
+    definition = CreateColumn(table.c[column]).compile(dialect=connection.dialect)
+    connection.exec_driver_sql(f'ALTER TABLE "{table.name}" ADD COLUMN {definition}')
+
+
+def timestamps_to_timestamptz(connection: Connection, table: Table) -> None:
+    """
+    Converts the columns the model declares as DateTime(timezone=True) from
+    timestamp to timestamptz on Postgres, reading the stored values as UTC.
+    SQLite stores both the same way.
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    existing = {
+        c["name"]: c["type"] for c in inspect(connection).get_columns(table.name)
+    }
+    naive = [
+        column.name
+        for column in table.columns
+        if isinstance(column.type, DateTime)
+        and column.type.timezone
+        and column.name in existing
+        and not getattr(existing[column.name], "timezone", False)
+    ]
+    if not naive:
+        return
+    alterations = ", ".join(f"ALTER COLUMN {name} TYPE timestamptz" for name in naive)
+    # With the session in UTC, Postgres reads the naive values as UTC and
+    # (from version 12) changes the type without rewriting the table.
+    connection.exec_driver_sql("SET TIME ZONE 'UTC'")
+    try:
+        connection.exec_driver_sql(f'ALTER TABLE "{table.name}" {alterations}')
+    finally:
+        connection.exec_driver_sql("RESET TIME ZONE")
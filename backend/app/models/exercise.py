@@ -1,8 +1,10 @@
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, List, Optional
 from uuid import UUID, uuid4
-from sqlmodel import SQLModel, Field, Column, String, DateTime, Relationship
-from sqlalchemy import func
+from sqlmodel import SQLModel, Field, Column, Integer, String, DateTime, Relationship
+from sqlalchemy import Index, func, text
+
+from app.models.search import add_search_columns
 
 if TYPE_CHECKING:
     from app.models.fill_gap_sentence import FillGapSentence
@@ -10,34 +12,66 @@ if TYPE_CHECKING:
 
 
 class ExerciseType(SQLModel, table=True):
-    id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
     name: str = Field(sa_column=Column(String, unique=True, nullable=False))
 
 
 class Exercise(SQLModel, table=True):
-    id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
     owner_id: UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE")
     exercise_type_id: UUID = Field(foreign_key="exercisetype.id", nullable=False)
     title: str = Field(nullable=False)
     description: Optional[str] = Field(default=None, nullable=True)
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
-        sa_column=Column(DateTime, nullable=False, server_default=func.now()),
+        sa_column=Column(
+            DateTime(timezone=True), nullable=False, server_default=func.now()
+        ),
     )
     updated_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
         sa_column=Column(
-            DateTime, nullable=False, server_default=func.now(), onupdate=func.now()
+            DateTime(timezone=True),
+            nullable=False,
+            server_default=func.now(),
+            onupdate=func.now(),
         ),
     )
+    # Incremented by every write to the exercise or its sentences and
+    # questions; ETags and cached answer keys are keyed on it. updated_at
+    # cannot serve: func.now() has whole-second resolution on SQLite and is
+    # the transaction start time on Postgres.
+    version: int = Field(
+        default=1, sa_column=Column(Integer, nullable=False, server_default=text("1"))
+    )
 
-    # Relationships
+    # Relationships. The database deletes sentences and questions with their
+    # exercise (ON DELETE CASCADE); passive_deletes keeps the ORM from loading
+    # them just to delete them row by row.
     exercise_type: Optional["ExerciseType"] = Relationship()
     fill_gap_sentences: List["FillGapSentence"] = Relationship(
         back_populates="exercise",
-        sa_relationship_kwargs={"cascade": "all, delete-orphan"},
+        sa_relationship_kwargs={
+            "cascade": "all, delete-orphan",
+            "passive_deletes": True,
+        },
     )
     multiple_choice_questions: List["MultipleChoiceQuestion"] = Relationship(
         back_populates="exercise",
-        sa_relationship_kwargs={"cascade": "all, delete-orphan"},
+        sa_relationship_kwargs={
+            "cascade": "all, delete-orphan",
+            "passive_deletes": True,
+        },
     )
+
+
+# Serves every per-owner query, including the keyset-paginated list, which
+# filters on owner_id and orders by (created_at, id).
+Index(
+    "ix_exercise_owner_id_created_at_id",
+    Exercise.owner_id,
+    Exercise.created_at,
+    Exercise.id,
+)
+
+add_search_columns(Exercise.__table__, [("title", "A"), ("description", "B")], "title")
@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid4
+from sqlmodel import SQLModel, Field, Column, DateTime, LargeBinary
+from sqlalchemy import JSON, Index, func
+
+
+class ExerciseSetType(str, Enum):
+    LESSON = "lesson"
+    EXAM = "exam"
+
+
+class ExerciseSet(SQLModel, table=True):
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    owner_id: UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE")
+    title: str = Field(nullable=False)
+    description: Optional[str] = Field(default=None, nullable=True)
+    set_type: ExerciseSetType = Field(default=ExerciseSetType.LESSON)
+    access_code: str = Field(unique=True, nullable=False, index=True)
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(
+            DateTime(timezone=True), nullable=False, server_default=func.now()
+        ),
+    )
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(
+            DateTime(timezone=True),
+            nullable=False,
+            server_default=func.now(),
+            onupdate=func.now(),
+        ),
+    )
+
+    # Set when the set is published; a published set is frozen and learners
+    # are served the pre-serialized snapshot instead of the live exercises.
+    published_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    snapshot: Optional[bytes] = Field(
+        default=None, sa_column=Column(LargeBinary, nullable=True)
+    )
+    snapshot_hash: Optional[str] = Field(default=None, nullable=True)
+    # The correct answers as published, for grading submissions even after
+    # the exercises change: [{"exercise_id", "type", "items": [[id, answer]]}].
+    answer_key: Optional[List[Dict[str, Any]]] = Field(
+        default=None, sa_column=Column(JSON, nullable=True)
+    )
+
+
+class ExerciseSetExercise(SQLModel, table=True):
+    exercise_set_id: UUID = Field(
+        foreign_key="exerciseset.id", primary_key=True, ondelete="CASCADE"
+    )
+    exercise_id: UUID = Field(
+        foreign_key="exercise.id", primary_key=True, ondelete="CASCADE"
+    )
+    position: int = Field(nullable=False)
+
+
+# Owners list their sets in (created_at, id) order.
+Index(
+    "ix_exerciseset_owner_id_created_at_id",
+    ExerciseSet.owner_id,
+    ExerciseSet.created_at,
+    ExerciseSet.id,
+)
+# The primary key leads with exercise_set_id; deleting an exercise finds its
+# memberships through this one.
+Index("ix_exercisesetexercise_exercise_id", ExerciseSetExercise.exercise_id)
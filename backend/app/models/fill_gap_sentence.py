@@ -2,21 +2,38 @@ from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Optional
 from uuid import UUID, uuid4
 from sqlmodel import SQLModel, Field, Column, DateTime, Relationship
-from sqlalchemy import func
+from sqlalchemy import Index, func
+
+from app.models.search import add_search_columns
 
 if TYPE_CHECKING:
     from app.models.exercise import Exercise
 
 
 class FillGapSentence(SQLModel, table=True):
-    id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
-    exercise_id: UUID = Field(foreign_key="exercise.id", nullable=False)
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    exercise_id: UUID = Field(
+        foreign_key="exercise.id", nullable=False, ondelete="CASCADE"
+    )
     sentence: str
     correct_answer: str
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
-        sa_column=Column(DateTime, nullable=False, server_default=func.now()),
+        sa_column=Column(
+            DateTime(timezone=True), nullable=False, server_default=func.now()
+        ),
     )
 
     # Relationship back to Exercise
     exercise: Optional["Exercise"] = Relationship(back_populates="fill_gap_sentences")
+
+
+# Children are always loaded per exercise (selectinload's IN lookup);
+# created_at lets the same index return them in creation order.
+Index(
+    "ix_fillgapsentence_exercise_id_created_at",
+    FillGapSentence.exercise_id,
+    FillGapSentence.created_at,
+)
+
+add_search_columns(FillGapSentence.__table__, [("sentence", "A")], "sentence")
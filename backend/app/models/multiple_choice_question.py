@@ -2,15 +2,19 @@ from datetime import datetime, timezone
 from typing import TYPE_CHECKING, List, Optional
 from uuid import UUID, uuid4
 from sqlmodel import SQLModel, Field, Column, DateTime, Relationship
-from sqlalchemy import JSON, func
+from sqlalchemy import JSON, Index, func
+
+from app.models.search import add_search_columns
 
 if TYPE_CHECKING:
     from app.models.exercise import Exercise
 
 
 class MultipleChoiceQuestion(SQLModel, table=True):
-    id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
-    exercise_id: UUID = Field(foreign_key="exercise.id", nullable=False)
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    exercise_id: UUID = Field(
+        foreign_key="exercise.id", nullable=False, ondelete="CASCADE"
+    )
     question: str
     choices: List[str] = Field(
         default_factory=list, sa_column=Column(JSON, nullable=False)
@@ -18,10 +22,28 @@ class MultipleChoiceQuestion(SQLModel, table=True):
     correct_index: int
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
-        sa_column=Column(DateTime, nullable=False, server_default=func.now()),
+        sa_column=Column(
+            DateTime(timezone=True), nullable=False, server_default=func.now()
+        ),
     )
 
     # Relationship back to Exercise
     exercise: Optional["Exercise"] = Relationship(
         back_populates="multiple_choice_questions"
     )
+
+
+# Children are always loaded per exercise (selectinload's IN lookup);
+# created_at lets the same index return them in creation order.
+Index(
+    "ix_multiplechoicequestion_exercise_id_created_at",
+    MultipleChoiceQuestion.exercise_id,
+    MultipleChoiceQuestion.created_at,
+)
+
+# Choices are searched as their JSON text, weighted below the question.
+add_search_columns(
+    MultipleChoiceQuestion.__table__,
+    [("question", "A"), ("choices::text", "B")],
+    "question",
+)
@@ -0,0 +1,14 @@
+from datetime import datetime
+from sqlmodel import SQLModel, Field, Column, DateTime
+
+
+class SchemaMigration(SQLModel, table=True):
+    """One applied migration from app.migrations."""
+
+    __tablename__ = "schema_migration"
+
+    version: int = Field(primary_key=True)
+    description: str = Field(nullable=False)
+    applied_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
@@ -0,0 +1,61 @@
+from typing import Dict, List, Sequence, Tuple
+
+from sqlalchemy import DDL, Table, event
+from sqlmodel import SQLModel
+
+# Text search configuration for the tsvector columns. "simple" only lowercases:
+# exercises are written in many languages, and stemming them with one
+# language's rules would merge unrelated words.
+SEARCH_TEXT_CONFIG = "simple"
+
+# Postgres only: the generated search_vector columns and their GIN indexes,
+# plus trigram indexes for fuzzy matches, are added when the tables are
+# created, and to existing databases by migration 6. Other databases are
+# searched through the in-memory index in app.services.search_service, so the
+# models do not declare these columns.
+CREATE_TRIGRAM_EXTENSION = "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+
+event.listen(
+    SQLModel.metadata,
+    "before_create",
+    DDL(CREATE_TRIGRAM_EXTENSION).execute_if(dialect="postgresql"),
+)
+
+# Table name -> the add_search_columns arguments it was registered with.
+SEARCHABLE_TABLES: Dict[str, Tuple[Sequence[Tuple[str, str]], str]] = {}
+
+
+def search_column_statements(table_name: str, concurrently: str = "") -> List[str]:
+    """
+    The DDL for a searchable table's column and indexes. Every statement is
+    idempotent. ``concurrently`` is inserted after CREATE INDEX.
+    """
+    weighted_fields, trigram_column = SEARCHABLE_TABLES[table_name]
+    vector = " || ".join(
+        f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce({field}, '')), '{weight}')"
+        for field, weight in weighted_fields
+    )
+    return [
+        f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({vector}) STORED",
+        f"CREATE INDEX{concurrently} IF NOT EXISTS ix_{table_name}_search_vector "
+        f"ON {table_name} USING gin (search_vector)",
+        f"CREATE INDEX{concurrently} IF NOT EXISTS "
+        f"ix_{table_name}_{trigram_column}_trgm ON {table_name} "
+        f"USING gin ({trigram_column} gin_trgm_ops)",
+    ]
+
+
+def add_search_columns(
+    table: Table, weighted_fields: Sequence[Tuple[str, str]], trigram_column: str
+) -> None:
+    """
+    ``weighted_fields`` are SQL expressions paired with a tsvector weight
+    letter, e.g. ``("title", "A")``; ``trigram_column`` gets a gin_trgm_ops
+    index for ``word_similarity`` lookups.
+    """
+    SEARCHABLE_TABLES[table.name] = (weighted_fields, trigram_column)
+    for statement in search_column_statements(table.name):
+        event.listen(
+            table, "after_create", DDL(statement).execute_if(dialect="postgresql")
+        )
@@ -0,0 +1,35 @@
+from uuid import UUID
+from sqlmodel import SQLModel, Field
+
+# Aggregates of graded submissions, maintained incrementally as submissions
+# are written and recomputed by app.commands.rebuild_stats. Every column
+# other than the key is a counter, so concurrent writers add to them with
+# INSERT ... ON CONFLICT DO UPDATE.
+
+
+class QuestionStat(SQLModel, table=True):
+    exercise_id: UUID = Field(
+        foreign_key="exercise.id", primary_key=True, ondelete="CASCADE"
+    )
+    # A FillGapSentence or MultipleChoiceQuestion id.
+    item_id: UUID = Field(primary_key=True)
+    answered: int = Field(default=0, nullable=False)
+    correct: int = Field(default=0, nullable=False)
+
+
+class ChoiceStat(SQLModel, table=True):
+    exercise_id: UUID = Field(
+        foreign_key="exercise.id", primary_key=True, ondelete="CASCADE"
+    )
+    item_id: UUID = Field(primary_key=True)
+    choice: int = Field(primary_key=True)
+    count: int = Field(default=0, nullable=False)
+
+
+class ScoreStat(SQLModel, table=True):
+    exercise_id: UUID = Field(
+        foreign_key="exercise.id", primary_key=True, ondelete="CASCADE"
+    )
+    # Items answered correctly in one submission.
+    score: int = Field(primary_key=True)
+    count: int = Field(default=0, nullable=False)
@@ -0,0 +1,24 @@
+from datetime import datetime, timezone
+from typing import Any, Dict
+from uuid import UUID, uuid4
+from sqlmodel import SQLModel, Field, Column, DateTime
+from sqlalchemy import JSON, func
+
+
+class Submission(SQLModel, table=True):
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    exercise_set_id: UUID = Field(
+        foreign_key="exerciseset.id", nullable=False, index=True, ondelete="CASCADE"
+    )
+    # Name or identifier the anonymous learner entered.
+    participant: str = Field(nullable=False)
+    # Sentence or question id -> the gap answer or choice index.
+    answers: Dict[str, Any] = Field(
+        default_factory=dict, sa_column=Column(JSON, nullable=False)
+    )
+    submitted_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(
+            DateTime(timezone=True), nullable=False, server_default=func.now()
+        ),
+    )
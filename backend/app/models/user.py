@@ -1,4 +1,7 @@
-from sqlmodel import SQLModel, Field
+from datetime import datetime, timezone
+
+from sqlalchemy import Index, func
+from sqlmodel import SQLModel, Field, Column, DateTime
 from uuid import UUID, uuid4
 from enum import Enum
 
@@ -9,8 +12,23 @@ class UserRole(str, Enum):
 
 
 class User(SQLModel, table=True):
-    id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
     username: str = Field(unique=True, nullable=False, index=True)
     email: str = Field(unique=True, nullable=False, index=True)
     password_hash: str = Field(nullable=False)
     role: UserRole = Field(default=UserRole.USER)
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(
+            DateTime(timezone=True), nullable=False, server_default=func.now()
+        ),
+    )
+
+
+# Case-insensitive lookups (availability checks, registration) are served by
+# these expression indexes; they also keep "Bob" and "bob" from coexisting.
+Index("ix_user_username_lower", func.lower(User.username), unique=True)
+Index("ix_user_email_lower", func.lower(User.email), unique=True)
+# Each worker's availability filters poll for users registered since their
+# last refresh.
+Index("ix_user_created_at", User.created_at)
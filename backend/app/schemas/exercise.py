@@ -3,6 +3,7 @@ from typing import List, Optional, Union
 from uuid import UUID, uuid4
 from enum import Enum
 
+from app.core.config import EXERCISE_BULK_DELETE_MAX_IDS
 from app.schemas.fill_gap_sentence import FillGapSentence, FillGapSentenceCreate
 from app.schemas.multiple_choice_question import (
     MultipleChoiceQuestion,
@@ -45,6 +46,17 @@ class ExerciseUpdate(BaseModel):
     description: Optional[str] = None
 
 
+class ExerciseBulkDelete(BaseModel):
+    exercise_ids: List[UUID] = Field(
+        ..., min_length=1, max_length=EXERCISE_BULK_DELETE_MAX_IDS
+    )
+
+
+class ExerciseBulkDeleteResult(BaseModel):
+    # Only the IDs that existed and belonged to the current user.
+    deleted_ids: List[UUID]
+
+
 SentenceCreateUnion = Union[
     List[FillGapSentenceCreate], List[MultipleChoiceQuestionCreate]
 ]
@@ -0,0 +1,31 @@
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from uuid import UUID
+
+from app.models.exercise_set import ExerciseSetType
+
+
+class ExerciseSetBase(BaseModel):
+    title: str
+    description: Optional[str] = None
+    set_type: ExerciseSetType = ExerciseSetType.LESSON
+
+
+class ExerciseSetCreate(ExerciseSetBase):
+    exercise_ids: List[UUID] = Field(..., min_length=1)
+
+
+class ExerciseSetUpdate(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+    set_type: Optional[ExerciseSetType] = None
+    exercise_ids: Optional[List[UUID]] = Field(None, min_length=1)
+
+
+class ExerciseSet(ExerciseSetBase):
+    id: UUID
+    access_code: str
+    exercise_ids: List[UUID]
+    published_at: Optional[datetime] = None
+    snapshot_hash: Optional[str] = None
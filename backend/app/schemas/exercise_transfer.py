@@ -0,0 +1,45 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from enum import Enum
+
+from app.schemas.exercise import ExerciseType
+
+
+class TransferFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ExerciseRow(BaseModel):
+    """
+    One sentence or question in the import/export row format. Rows with the
+    same ``exercise`` key belong to one exercise; its title, description and
+    type are taken from the first of them.
+    """
+
+    exercise: str = Field(..., min_length=1, max_length=200)
+    title: Optional[str] = None
+    description: Optional[str] = None
+    type: Optional[ExerciseType] = None
+    # Fill-gap rows
+    sentence: Optional[str] = None
+    correct_answer: Optional[str] = None
+    # Multiple-choice rows
+    question: Optional[str] = None
+    choices: Optional[List[str]] = None
+    correct_index: Optional[int] = None
+
+
+class ImportRowError(BaseModel):
+    # 1-based; for CSV the header is row 0.
+    row: int
+    message: str
+
+
+class ImportResult(BaseModel):
+    rows: int
+    imported: int
+    exercises_created: int
+    error_count: int
+    # The first IMPORT_MAX_REPORTED_ERRORS errors.
+    errors: List[ImportRowError]
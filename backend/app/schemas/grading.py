@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Union
+from uuid import UUID
+
+from app.core.config import GRADING_MAX_SUBMISSIONS
+
+
+class GradingOptions(BaseModel):
+    case_sensitive: bool = False
+    ignore_punctuation: bool = True
+    # Gap answers within this many edits of the correct answer also count.
+    max_edit_distance: int = Field(0, ge=0, le=3)
+
+
+class Submission(BaseModel):
+    # Sentence or question id -> the gap answer (str) or choice index (int).
+    answers: Dict[str, Union[int, str]]
+
+
+class GradeRequest(BaseModel):
+    submissions: List[Submission] = Field(
+        ..., min_length=1, max_length=GRADING_MAX_SUBMISSIONS
+    )
+    options: GradingOptions = GradingOptions()
+
+
+class GradeResponse(BaseModel):
+    exercise_id: UUID
+    item_ids: List[UUID]
+    # One entry per submission, in request order.
+    scores: List[int]
+    # correct[s][i] tells whether submission s answered item_ids[i] correctly.
+    correct: List[List[bool]]
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import Optional
+from uuid import UUID
+from enum import Enum
+
+
+class SearchResultKind(str, Enum):
+    EXERCISE = "exercise"
+    SENTENCE = "sentence"
+    QUESTION = "question"
+
+
+class SearchResult(BaseModel):
+    exercise_id: UUID
+    exercise_title: str
+    kind: SearchResultKind
+    # The matching sentence or question; None when the title or description
+    # matched.
+    item_id: Optional[UUID] = None
+    text: str
+    score: float
@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import Dict, List
+from uuid import UUID
+
+
+class QuestionStats(BaseModel):
+    # A FillGapSentence or MultipleChoiceQuestion id.
+    item_id: UUID
+    answered: int
+    correct: int
+    correct_rate: float
+    # Choice index -> times chosen; empty for fill-gap sentences.
+    choices: Dict[int, int] = {}
+
+
+class ExerciseStats(BaseModel):
+    exercise_id: UUID
+    submissions: int
+    mean_score: float
+    # Items answered correctly -> number of submissions with that score.
+    score_histogram: Dict[int, int]
+    questions: List[QuestionStats]
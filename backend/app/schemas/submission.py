@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import Dict, Union
+from uuid import UUID
+
+
+class SubmissionCreate(BaseModel):
+    participant: str = Field(..., min_length=1, max_length=100)
+    # Sentence or question id -> the gap answer (str) or choice index (int).
+    answers: Dict[str, Union[int, str]] = Field(..., max_length=1_000)
+
+
+class SubmissionReceipt(BaseModel):
+    id: UUID
+    status: str = "queued"
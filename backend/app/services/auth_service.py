@@ -3,8 +3,8 @@ from typing import Optional
 
 import jwt
 
-from app.api.deps import SessionDep
-from app.core.security import verify_password
+from app.api.deps import AsyncSessionDep
+from app.core.security import verify_and_update_password_async
 from app.models.user import User
 from app.services.user_service import get_user_by_email
 from app.core.config import ALGORITHM, SECRET_KEY
@@ -18,8 +18,26 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def authenticate_user(email: str, password: str, session: SessionDep) -> Optional[User]:
-    user = get_user_by_email(email, session)
-    if not user or not verify_password(password, user.password_hash):
+async def authenticate_user(
+    email: str, password: str, session: AsyncSessionDep
+) -> Optional[User]:
+    user = await get_user_by_email(email, session)
+    if not user:
         return None
+
+    # End the read transaction so the pooled connection is not held while the
+    # password is verified.
+    await session.commit()
+
+    is_valid, new_hash = await verify_and_update_password_async(
+        password, user.password_hash
+    )
+    if not is_valid:
+        return None
+
+    if new_hash is not None:
+        # The stored hash uses an outdated bcrypt cost; upgrade it.
+        user.password_hash = new_hash
+        session.add(user)
+        await session.commit()
     return user
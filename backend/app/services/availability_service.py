@@ -0,0 +1,177 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import exists, func
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.bloom import BloomFilter
+from app.core.config import (
+    AVAILABILITY_FILTER_CAPACITY,
+    AVAILABILITY_FILTER_ERROR_RATE,
+    AVAILABILITY_REFRESH_SECONDS,
+)
+from app.core.db import async_engine
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Fields that can be checked, and the column each one is matched against.
+AVAILABILITY_FIELDS = {"email": User.email, "username": User.username}
+
+# Registrations commit a little after their created_at, and workers' clocks
+# differ slightly, so each refresh re-reads this far before the previous one.
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+
+def normalize(value: str) -> str:
+    # Matches func.lower() on the column and its expression index.
+    return value.lower()
+
+
+class AvailabilityIndex:
+    """
+    Per-field Bloom filters over every registered email and username. A value
+    the filter has never seen is available without a query; possible hits are
+    confirmed against the database.
+
+    The filters live in this process and learn about registrations made through
+    it at once. Registrations handled by another worker are picked up by the
+    next refresh, within AVAILABILITY_REFRESH_SECONDS; until then such a
+    name reads as available. The answer is advisory either way:
+    register_user checks the database.
+    """
+
+    def __init__(self, capacity: int = AVAILABILITY_FILTER_CAPACITY):
+        self.filters: Dict[str, BloomFilter] = {
+            field: BloomFilter(capacity, AVAILABILITY_FILTER_ERROR_RATE)
+            for field in AVAILABILITY_FIELDS
+        }
+        # Until load_availability has run, every value is a possible hit.
+        self.loaded = False
+        # When the user table was last read; the next refresh reads the users
+        # created since (less REFRESH_OVERLAP).
+        self.read_at: Optional[datetime] = None
+
+    def add(self, field: str, value: str) -> None:
+        self.filters[field].add(normalize(value))
+
+    def might_be_taken(self, field: str, value: str) -> bool:
+        return not self.loaded or normalize(value) in self.filters[field]
+
+
+_index = AvailabilityIndex()
+
+
+def get_availability_index() -> AvailabilityIndex:
+    return _index
+
+
+def load_availability(session: Session) -> AvailabilityIndex:
+    """Builds the filters from the user table; called once at startup."""
+    global _index
+    read_at = datetime.now(timezone.utc)
+    user_count = session.exec(select(func.count()).select_from(User)).one()
+    # Leave room to grow before the false positive rate starts to climb.
+    index = AvailabilityIndex(max(AVAILABILITY_FILTER_CAPACITY, 2 * user_count))
+    rows = session.exec(
+        select(User.email, User.username).execution_options(yield_per=1000)
+    )
+    for email, username in rows:
+        index.add("email", email)
+        index.add("username", username)
+    index.loaded = True
+    index.read_at = read_at
+    _index = index
+    return _index
+
+
+async def refresh_availability(session: AsyncSession) -> int:
+    """
+    Adds the users registered since the last read, through any worker, to
+    this process's filters. Returns how many users were read.
+    """
+    if _index.read_at is None:
+        return 0
+    read_at = datetime.now(timezone.utc)
+    rows = (
+        await session.exec(
+            select(User.email, User.username).where(
+                User.created_at >= _index.read_at - REFRESH_OVERLAP
+            )
+        )
+    ).all()
+    for email, username in rows:
+        _index.add("email", email)
+        _index.add("username", username)
+    _index.read_at = read_at
+    return len(rows)
+
+
+_refresh_task: Optional[asyncio.Task] = None
+
+
+async def refresh_periodically() -> None:
+    while True:
+        await asyncio.sleep(AVAILABILITY_REFRESH_SECONDS)
+        try:
+            async with AsyncSession(async_engine) as session:
+                await refresh_availability(session)
+        except Exception:
+            logger.exception("availability refresh failed, keeping the filters")
+
+
+def start_availability_refresh() -> None:
+    global _refresh_task
+    if _refresh_task is None:
+        _refresh_task = asyncio.create_task(
+            refresh_periodically(), name="availability-refresh"
+        )
+
+
+async def stop_availability_refresh() -> None:
+    global _refresh_task
+    if _refresh_task is not None:
+        _refresh_task.cancel()
+        try:
+            await _refresh_task
+        except asyncio.CancelledError:
+            pass
+        _refresh_task = None
+
+
+def record_user(email: str, username: str) -> None:
+    """Adds a newly registered user to the filters."""
+    _index.add("email", email)
+    _index.add("username", username)
+
+
+async def is_available(field: str, value: str, session: AsyncSession) -> bool:
+    if not _index.might_be_taken(field, value):
+        return True
+    column = AVAILABILITY_FIELDS[field]
+    taken = (
+        await session.exec(
+            select(exists().where(func.lower(column) == normalize(value)))
+        )
+    ).one()
+    return not taken
+
+
+async def find_taken(
+    field: str, values: Iterable[str], session: AsyncSession
+) -> Set[str]:
+    """
+    Returns the normalized values of ``field`` that are already registered,
+    with one query covering every possible hit.
+    """
+    candidates: List[str] = sorted(
+        {normalize(value) for value in values if _index.might_be_taken(field, value)}
+    )
+    if not candidates:
+        return set()
+    column = func.lower(AVAILABILITY_FIELDS[field])
+    rows = await session.exec(select(column).where(column.in_(candidates)))
+    return set(rows.all())
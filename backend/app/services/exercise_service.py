@@ -1,7 +1,24 @@
-from typing import Callable, List
-from uuid import UUID
+import base64
+import binascii
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from uuid import UUID, uuid4
 
-from sqlmodel import Session, select
+import orjson
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import Row, delete, func, insert, literal, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.orm import selectinload
 
 from fastapi import HTTPException, status
@@ -10,20 +27,27 @@ from app.schemas.exercise import (
     ExerciseCreate,
     ExerciseType,
     ExerciseUpdate,
-    SentenceCreate,
     SentenceCreatePayload,
     SentenceCreateUnion,
     SentencesUnion,
 )
-from app.models.exercise import (
-    Exercise as ExerciseModel,
-    ExerciseType as ExerciseTypeModel,
-)
-from app.api.deps import CurrentUser, SessionDep
+from app.models.exercise import Exercise as ExerciseModel
+from app.api.deps import AsyncSessionDep, CurrentUser
+from app.core.config import EXERCISE_STREAM_CHUNK_SIZE
+from app.core.etag import make_etag
+from app.core.exercise_types import get_exercise_type_registry
+from app.core.profiling import serialization_timer
+from app.core.query_budget import query_budget
 from app.models.fill_gap_sentence import FillGapSentence as FillGapSentenceModel
 from app.models.multiple_choice_question import (
     MultipleChoiceQuestion as MultipleChoiceQuestionModel,
 )
+from app.services.search_service import (
+    forget_exercise,
+    record_exercise,
+    record_questions,
+    record_sentences,
+)
 from app.schemas.fill_gap_sentence import FillGapSentence, FillGapSentenceCreate
 from app.schemas.multiple_choice_question import (
     MultipleChoiceQuestion,
@@ -31,149 +55,482 @@ from app.schemas.multiple_choice_question import (
 )
 
 
-def get_exercises(current_user: CurrentUser, session: SessionDep) -> List[Exercise]:
-    exercise_models = session.exec(
-        select(ExerciseModel)
-        .where(ExerciseModel.owner_id == current_user.id)
-        .options(
-            selectinload(ExerciseModel.exercise_type),
-            selectinload(ExerciseModel.fill_gap_sentences),
-            selectinload(ExerciseModel.multiple_choice_questions),
-        )
-    ).all()
+# Async sessions cannot lazy load, so every query whose result reaches
+# to_exercise_schema must eager load these relationships.
+# The exercise type name comes from the in-process registry, not a relationship.
+EXERCISE_LOAD_OPTIONS = (
+    selectinload(ExerciseModel.fill_gap_sentences),
+    selectinload(ExerciseModel.multiple_choice_questions),
+)
 
-    return [to_exercise_schema(e) for e in exercise_models]
 
+def exercise_changed_values() -> Dict[str, Any]:
+    """
+    Column values for an UPDATE that records a change to an exercise or to
+    its sentences or questions.
+    """
+    return {"version": ExerciseModel.version + 1, "updated_at": func.now()}
 
-def get_exercise(
-    exercise_id: UUID, current_user: CurrentUser, session: SessionDep
-) -> Exercise:
-    exercise_model = session.exec(
-        select(ExerciseModel)
-        .where(
-            ExerciseModel.id == exercise_id, ExerciseModel.owner_id == current_user.id
+
+# Exercises are listed in (created_at, id) order so that a page boundary can be
+# resumed with a keyset condition instead of an OFFSET scan.
+EXERCISE_LIST_ORDER = (ExerciseModel.created_at, ExerciseModel.id)
+
+
+def select_exercise_page(
+    statement, current_user: CurrentUser, limit: int, cursor: Optional[str]
+):
+    """
+    Restricts a select over exercises to one page of the current user's
+    exercises, plus one extra row that tells whether another page exists.
+    """
+    statement = (
+        statement.where(ExerciseModel.owner_id == current_user.id)
+        .order_by(*EXERCISE_LIST_ORDER)
+        .limit(limit + 1)
+    )
+    if cursor is not None:
+        # Bind the cursor with the columns' types so it compares like the stored
+        # values (SQLite, for one, stores datetimes as text).
+        statement = statement.where(
+            tuple_(*EXERCISE_LIST_ORDER)
+            > tuple_(
+                *(
+                    literal(value, column.type)
+                    for value, column in zip(decode_cursor(cursor), EXERCISE_LIST_ORDER)
+                )
+            )
         )
-        .options(
-            selectinload(ExerciseModel.exercise_type),
-            selectinload(ExerciseModel.fill_gap_sentences),
-            selectinload(ExerciseModel.multiple_choice_questions),
+    return statement
+
+
+@query_budget(3)
+async def get_exercises_json(
+    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    limit: int,
+    cursor: Optional[str] = None,
+) -> Tuple[bytes, Optional[str]]:
+    """
+    Returns one page of exercises already encoded as a JSON array, and the
+    cursor of the next page if there is one.
+    """
+    statement = select_exercise_page(
+        select(ExerciseModel).options(*EXERCISE_LOAD_OPTIONS),
+        current_user,
+        limit,
+        cursor,
+    )
+    exercise_models = (await session.exec(statement)).all()
+
+    # One extra row is fetched only to learn whether another page exists.
+    next_cursor = None
+    if len(exercise_models) > limit:
+        exercise_models = exercise_models[:limit]
+        last = exercise_models[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return dump_exercises_json(exercise_models), next_cursor
+
+
+@query_budget(1)
+async def get_exercises_etag(
+    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    limit: int,
+    cursor: Optional[str] = None,
+) -> str:
+    """
+    Computes the ETag of a page of exercises from (id, version) alone,
+    without loading sentences or questions.
+    """
+    statement = select_exercise_page(
+        select(ExerciseModel.id, ExerciseModel.version),
+        current_user,
+        limit,
+        cursor,
+    )
+    versions = (await session.exec(statement)).all()
+    return make_etag(value for version in versions for value in version)
+
+
+@query_budget(1)
+async def get_exercise_etag(
+    exercise_id: UUID, current_user: CurrentUser, session: AsyncSessionDep
+) -> str:
+    """
+    Computes the ETag of one exercise from its version, which is bumped
+    whenever the exercise or any of its sentences or questions change.
+    """
+    version = (
+        await session.exec(
+            select(ExerciseModel.version).where(
+                ExerciseModel.id == exercise_id,
+                ExerciseModel.owner_id == current_user.id,
+            )
         )
     ).first()
 
-    if exercise_model is None:
+    if version is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Exercise with ID {exercise_id} not found for the current user.",
         )
 
-    return to_exercise_schema(exercise_model)
+    return make_etag((exercise_id, version))
 
 
-def create_exercise(
-    exercise_data: ExerciseCreate, current_user: CurrentUser, session: SessionDep
-) -> Exercise:
-    exercise_type = session.exec(
-        select(ExerciseTypeModel).where(
-            ExerciseTypeModel.name == exercise_data.type.value
+@query_budget(3)
+async def stream_exercises(
+    current_user: CurrentUser, read_engine: AsyncEngine
+) -> AsyncIterator[bytes]:
+    """
+    Yields every exercise of the current user as NDJSON, one chunk per
+    EXERCISE_STREAM_CHUNK_SIZE exercises, reading through a server-side cursor.
+    """
+    # The request-scoped session is closed before a streaming body is sent,
+    # so the stream owns its session, on the engine from get_read_engine.
+    async with AsyncSession(read_engine) as session:
+        result = await session.stream_scalars(
+            select(ExerciseModel)
+            .where(ExerciseModel.owner_id == current_user.id)
+            .order_by(*EXERCISE_LIST_ORDER)
+            .options(*EXERCISE_LOAD_OPTIONS)
+            .execution_options(yield_per=EXERCISE_STREAM_CHUNK_SIZE)
         )
-    ).first()
+        async for partition in result.partitions():
+            with serialization_timer():
+                chunk = b"".join(
+                    orjson.dumps(to_exercise_dict(e), option=orjson.OPT_APPEND_NEWLINE)
+                    for e in partition
+                )
+            yield chunk
+
+
+def encode_cursor(created_at: datetime, exercise_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{exercise_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
 
-    if not exercise_type:
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        created_at, exercise_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        )
+        return datetime.fromisoformat(created_at), UUID(exercise_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor.",
+        )
+
+
+@query_budget(3)
+async def get_exercise_json(
+    exercise_id: UUID, current_user: CurrentUser, session: AsyncSessionDep
+) -> bytes:
+    exercise_model = await get_owned_exercise_model(exercise_id, current_user, session)
+    with serialization_timer():
+        return orjson.dumps(to_exercise_dict(exercise_model))
+
+
+@query_budget(2)
+async def create_exercise(
+    exercise_data: ExerciseCreate, current_user: CurrentUser, session: AsyncSessionDep
+) -> Exercise:
+    exercise_type_id = get_exercise_type_registry().id_for(exercise_data.type.value)
+
+    if exercise_type_id is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Unsupported exercise type: '{exercise_data.type.value}'.",
         )
 
-    new_exercise = ExerciseModel(
-        owner_id=current_user.id,
-        exercise_type_id=exercise_type.id,
+    # The exercise and all of its children are written in one transaction; the
+    # response is built from what was inserted, so nothing is read back.
+    exercise_id = uuid4()
+    await session.exec(
+        insert(ExerciseModel.__table__).values(
+            id=exercise_id,
+            owner_id=current_user.id,
+            exercise_type_id=exercise_type_id,
+            created_at=datetime.now(timezone.utc),
+            title=exercise_data.title,
+            description=exercise_data.description,
+        )
+    )
+
+    handler = get_exercise_handler(exercise_data.type)
+    created_sentences = await handler(session, exercise_id, exercise_data)
+
+    await session.commit()
+    record_exercise(
+        current_user.id, exercise_id, exercise_data.title, exercise_data.description
+    )
+    record_created_items(
+        current_user.id, exercise_id, exercise_data.type, created_sentences
+    )
+    return Exercise(
+        id=exercise_id,
         title=exercise_data.title,
         description=exercise_data.description,
+        type=exercise_data.type,
+        fill_gap_sentences=(
+            created_sentences if exercise_data.type == ExerciseType.FILL_GAP else []
+        ),
+        multiple_choice_questions=(
+            created_sentences
+            if exercise_data.type == ExerciseType.MULTIPLE_CHOICE
+            else []
+        ),
     )
 
-    session.add(new_exercise)
-    session.commit()
-    session.refresh(new_exercise)
 
-    handler = get_exercise_handler(exercise_data.type)
-    handler(session, new_exercise.id, exercise_data)
-
-    session.commit()
-    return to_exercise_schema(new_exercise)
+# The core fields an update returns, read back from the updated row.
+EXERCISE_CORE_COLUMNS = (
+    ExerciseModel.id,
+    ExerciseModel.title,
+    ExerciseModel.description,
+    ExerciseModel.exercise_type_id,
+)
 
 
-def update_exercise(
+@query_budget(2)
+async def update_exercise(
     exercise_id: UUID,
     update_data: ExerciseUpdate,
     current_user: CurrentUser,
-    session: SessionDep,
+    session: AsyncSessionDep,
+    include_items: bool = False,
 ) -> Exercise:
-    exercise_model = session.exec(
-        select(ExerciseModel).where(
-            ExerciseModel.id == exercise_id, ExerciseModel.owner_id == current_user.id
+    """
+    Updates the core fields with one owner-scoped UPDATE ... RETURNING and
+    returns them, without sentences or questions. With ``include_items`` the
+    exercise's sentences or questions are fetched too, in one more query.
+    """
+    update_dict = update_data.model_dump(exclude_unset=True)
+    owned = (
+        ExerciseModel.id == exercise_id,
+        ExerciseModel.owner_id == current_user.id,
+    )
+    if update_dict:
+        statement = (
+            update(ExerciseModel)
+            .where(*owned)
+            .values(**update_dict, **exercise_changed_values())
+            .returning(*EXERCISE_CORE_COLUMNS)
         )
-    ).first()
+    else:
+        # Nothing to change: read the fields without bumping the version,
+        # which would change the exercise's ETag.
+        statement = select(*EXERCISE_CORE_COLUMNS).where(*owned)
+    row = (await session.exec(statement)).first()
 
-    if exercise_model is None:
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Exercise with ID {exercise_id} not found for the current user.",
         )
 
-    update_dict = update_data.model_dump(exclude_unset=True)
-    for key, value in update_dict.items():
-        setattr(exercise_model, key, value)
+    exercise = Exercise(
+        id=row.id,
+        title=row.title,
+        description=row.description,
+        type=to_exercise_type(row.exercise_type_id),
+    )
+    if include_items:
+        # Read in the same transaction, so the items match the update.
+        await load_exercise_items(exercise, session)
+
+    if update_dict:
+        await session.commit()
+        record_exercise(current_user.id, row.id, row.title, row.description)
+    return exercise
+
+
+@query_budget(1)
+async def load_exercise_items(exercise: Exercise, session: AsyncSession) -> None:
+    """Fills in the sentences or questions of ``exercise``, whichever its type has."""
+    if exercise.type == ExerciseType.FILL_GAP:
+        sentences = await session.exec(
+            select(FillGapSentenceModel)
+            .where(FillGapSentenceModel.exercise_id == exercise.id)
+            .order_by(FillGapSentenceModel.created_at)
+        )
+        exercise.fill_gap_sentences = [
+            to_fill_gap_sentence_schema(sentence) for sentence in sentences
+        ]
+        exercise.multiple_choice_questions = []
+    else:
+        questions = await session.exec(
+            select(MultipleChoiceQuestionModel)
+            .where(MultipleChoiceQuestionModel.exercise_id == exercise.id)
+            .order_by(MultipleChoiceQuestionModel.created_at)
+        )
+        exercise.fill_gap_sentences = []
+        exercise.multiple_choice_questions = [
+            to_multiple_choice_question_schema(question) for question in questions
+        ]
 
-    session.add(exercise_model)
-    session.commit()
-    session.refresh(exercise_model)
 
-    return to_exercise_schema(exercise_model)
+@query_budget(1)
+async def delete_exercise(
+    exercise_id: UUID, current_user: CurrentUser, session: AsyncSessionDep
+) -> None:
+    """
+    Deletes an exercise with a single statement. The database removes its
+    sentences, questions, stats and set memberships (ON DELETE CASCADE), so
+    none of them are loaded.
+    """
+    deleted_id = (
+        await session.exec(
+            delete(ExerciseModel)
+            .where(
+                ExerciseModel.id == exercise_id,
+                ExerciseModel.owner_id == current_user.id,
+            )
+            .returning(ExerciseModel.id)
+        )
+    ).scalar_one_or_none()
 
+    if deleted_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Exercise with ID {exercise_id} not found for the current user.",
+        )
 
-def delete_exercise(
-    exercise_id: UUID, current_user: CurrentUser, session: SessionDep
-) -> Exercise:
-    exercise_model = session.exec(
-        select(ExerciseModel).where(
-            ExerciseModel.id == exercise_id, ExerciseModel.owner_id == current_user.id
+    await session.commit()
+    forget_exercise(current_user.id, exercise_id)
+
+
+@query_budget(1)
+async def delete_exercises(
+    exercise_ids: List[UUID], current_user: CurrentUser, session: AsyncSessionDep
+) -> List[UUID]:
+    """
+    Deletes the current user's exercises among ``exercise_ids`` in one
+    statement and returns the IDs that were deleted. IDs that do not exist or
+    belong to another user are skipped.
+    """
+    deleted_ids = (
+        (
+            await session.exec(
+                delete(ExerciseModel)
+                .where(
+                    ExerciseModel.id.in_(exercise_ids),
+                    ExerciseModel.owner_id == current_user.id,
+                )
+                .returning(ExerciseModel.id)
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+    await session.commit()
+    for exercise_id in deleted_ids:
+        forget_exercise(current_user.id, exercise_id)
+    return list(deleted_ids)
+
+
+@query_budget(3)
+async def get_owned_exercise_model(
+    exercise_id: UUID, current_user: CurrentUser, session: AsyncSession
+) -> ExerciseModel:
+    """
+    Loads an exercise owned by the current user with all relationships needed by
+    to_exercise_schema, or raises a 404.
+    """
+    exercise_model = (
+        await session.exec(
+            select(ExerciseModel)
+            .where(
+                ExerciseModel.id == exercise_id,
+                ExerciseModel.owner_id == current_user.id,
+            )
+            .options(*EXERCISE_LOAD_OPTIONS)
         )
     ).first()
 
     if exercise_model is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Exercise with ID {exercise_id} not found.",
+            detail=f"Exercise with ID {exercise_id} not found for the current user.",
         )
 
-    session.delete(exercise_model)
-    session.commit()
-    return to_exercise_schema(exercise_model)
+    return exercise_model
 
 
+@query_budget(0)
 def to_exercise_schema(model: ExerciseModel) -> Exercise:
-    return Exercise(
-        id=model.id,
-        title=model.title,
-        description=model.description,
-        type=ExerciseType(model.exercise_type.name) if model.exercise_type else None,
-        fill_gap_sentences=(
-            [
-                to_fill_gap_sentence_schema(sentence)
-                for sentence in model.fill_gap_sentences
-            ]
-            if model.fill_gap_sentences
-            else []
-        ),
-        multiple_choice_questions=(
-            [
-                to_multiple_choice_question_schema(question)
-                for question in model.multiple_choice_questions
-            ]
-            if model.multiple_choice_questions
-            else []
-        ),
-    )
+    with serialization_timer():
+        return Exercise(
+            id=model.id,
+            title=model.title,
+            description=model.description,
+            type=to_exercise_type(model.exercise_type_id),
+            fill_gap_sentences=(
+                [
+                    to_fill_gap_sentence_schema(sentence)
+                    for sentence in model.fill_gap_sentences
+                ]
+                if model.fill_gap_sentences
+                else []
+            ),
+            multiple_choice_questions=(
+                [
+                    to_multiple_choice_question_schema(question)
+                    for question in model.multiple_choice_questions
+                ]
+                if model.multiple_choice_questions
+                else []
+            ),
+        )
+
+
+def to_exercise_dict(model: ExerciseModel) -> Dict[str, Any]:
+    """
+    Builds the JSON-ready form of the Exercise schema straight from the ORM
+    model. Read routes encode this once with orjson instead of building
+    pydantic objects and validating them again against the response model.
+    Keys and order match Exercise.model_dump().
+    """
+    return {
+        "title": model.title,
+        "description": model.description,
+        "type": to_exercise_type(model.exercise_type_id).value,
+        "id": model.id,
+        "fill_gap_sentences": [
+            {
+                "sentence": sentence.sentence,
+                "correct_answer": sentence.correct_answer,
+                "id": sentence.id,
+            }
+            for sentence in model.fill_gap_sentences
+        ],
+        "multiple_choice_questions": [
+            {
+                "question": question.question,
+                "choices": question.choices,
+                "correct_index": question.correct_index,
+                "id": question.id,
+            }
+            for question in model.multiple_choice_questions
+        ],
+    }
+
+
+@query_budget(0)
+def dump_exercises_json(models: Sequence[ExerciseModel]) -> bytes:
+    with serialization_timer():
+        return orjson.dumps([to_exercise_dict(model) for model in models])
+
+
+def to_exercise_type(exercise_type_id: UUID) -> ExerciseType:
+    name = get_exercise_type_registry().name_for(exercise_type_id)
+    if name is None:
+        raise ValueError(f"Unknown exercise type id: {exercise_type_id}")
+    return ExerciseType(name)
 
 
 def to_fill_gap_sentence_schema(model: FillGapSentenceModel) -> FillGapSentence:
@@ -195,7 +552,7 @@ def to_multiple_choice_question_schema(
 
 def get_exercise_handler(
     exercise_data_type: ExerciseType,
-) -> Callable[[Session, ExerciseModel], None]:
+) -> Callable[[AsyncSession, UUID, ExerciseCreate], Awaitable[SentencesUnion]]:
     """
     Returns the appropriate function for handling exercise-specific related data.
     """
@@ -207,105 +564,159 @@ def get_exercise_handler(
         raise ValueError(f"Unsupported exercise type: {exercise_data_type}")
 
 
-def handle_fill_gap_exercise(
-    session: Session, exercise_id: UUID, exercise_data: ExerciseCreate
-):
-    for sentence in exercise_data.fill_gap_sentences:
-        fill_gap_sentence = FillGapSentenceModel(
-            exercise_id=exercise_id,
-            sentence=sentence.sentence,
-            correct_answer=sentence.correct_answer,
-        )
-        session.add(fill_gap_sentence)
+@query_budget(1)
+async def handle_fill_gap_exercise(
+    session: AsyncSession, exercise_id: UUID, exercise_data: ExerciseCreate
+) -> List[FillGapSentence]:
+    return await create_fill_gap_sentences(
+        exercise_id, exercise_data.fill_gap_sentences, session
+    )
 
 
-def handle_multiple_choice_exercise(
-    session: Session,
+@query_budget(1)
+async def handle_multiple_choice_exercise(
+    session: AsyncSession,
     exercise_id: UUID,
     exercise_data: ExerciseCreate,
-):
-    for question in exercise_data.multiple_choice_questions:
-        multiple_choice_question = MultipleChoiceQuestionModel(
-            exercise_id=exercise_id,
-            question=question.question,
-            choices=question.choices,
-            correct_choice_index=question.correct_choice_index,
-        )
-        session.add(multiple_choice_question)
+) -> List[MultipleChoiceQuestion]:
+    return await create_multiple_choice_sentences(
+        exercise_id, exercise_data.multiple_choice_questions, session
+    )
 
 
-def create_sentence_for_exercise(
+@query_budget(2)
+async def create_sentence_for_exercise(
     exercise_id: UUID,
     payload: SentenceCreatePayload,
     current_user: CurrentUser,
-    session: SessionDep,
+    session: AsyncSessionDep,
 ) -> SentencesUnion:
     sentences = payload.sentences
 
-    exercise_model = session.exec(
-        select(ExerciseModel).where(
-            ExerciseModel.id == exercise_id, ExerciseModel.owner_id == current_user.id
+    # Checking ownership also bumps the version, so the exercise's ETag changes
+    # together with its children.
+    exercise_type_id = (
+        await session.exec(
+            update(ExerciseModel)
+            .where(
+                ExerciseModel.id == exercise_id,
+                ExerciseModel.owner_id == current_user.id,
+            )
+            .values(**exercise_changed_values())
+            .returning(ExerciseModel.exercise_type_id)
         )
-    ).first()
+    ).scalar_one_or_none()
 
-    if exercise_model is None:
+    if exercise_type_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Exercise with ID {exercise_id} not found.",
         )
 
-    created_sentences_schema = dispatch_sentence_creation(
-        exercise_model.type, exercise_id, sentences, session
+    created_sentences_schema = await dispatch_sentence_creation(
+        to_exercise_type(exercise_type_id),
+        exercise_id,
+        sentences,
+        session,
     )
 
     try:
-        session.commit()
+        await session.commit()
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating sentences: {str(e)}",
         )
 
+    record_created_items(
+        current_user.id,
+        exercise_id,
+        to_exercise_type(exercise_type_id),
+        created_sentences_schema,
+    )
     return created_sentences_schema
 
 
-def create_fill_gap_sentences(
-    exercise_id: UUID, sentences: List[FillGapSentenceCreate], session: Session
-) -> List[FillGapSentenceModel]:
-    created_models = []
-    for sentence in sentences:
-        new_fill_gap_sentence = FillGapSentenceModel(
-            exercise_id=exercise_id,
-            sentence=sentence.sentence,
-            correct_answer=sentence.correct_answer,
-        )
-        session.add(new_fill_gap_sentence)
-        created_models.append(new_fill_gap_sentence)
-    return created_models
-
-
-def create_multiple_choice_sentences(
-    exercise_id: UUID, sentences: List[MultipleChoiceQuestionCreate], session: Session
-) -> List[MultipleChoiceQuestionModel]:
-    created_models = []
-    for question in sentences:
-        new_multiple_choice_question = MultipleChoiceQuestionModel(
-            exercise_id=exercise_id,
-            question=question.question,
-            choices=question.choices,
-            correct_choice_index=question.correct_choice_index,
-        )
-        session.add(new_multiple_choice_question)
-        created_models.append(new_multiple_choice_question)
-    return created_models
+def record_created_items(
+    owner_id: UUID,
+    exercise_id: UUID,
+    exercise_type: ExerciseType,
+    items: SentencesUnion,
+) -> None:
+    """Adds newly committed sentences or questions to the search index."""
+    if exercise_type == ExerciseType.FILL_GAP:
+        record_sentences(owner_id, exercise_id, items)
+    else:
+        record_questions(owner_id, exercise_id, items)
+
+
+@query_budget(1)
+async def bulk_insert(
+    session: AsyncSession, model: Any, rows: List[Dict[str, Any]]
+) -> Sequence[Row]:
+    """
+    Inserts ``rows`` into the model's table with multi-row
+    ``INSERT ... RETURNING`` statements (batched by the dialect's
+    insertmanyvalues page size) and returns the inserted rows in input order.
+    """
+    table = model.__table__
+    result = await session.exec(
+        insert(table).returning(*table.columns, sort_by_parameter_order=True),
+        params=rows,
+    )
+    return result.all()
+
+
+@query_budget(1)
+async def create_fill_gap_sentences(
+    exercise_id: UUID, sentences: List[FillGapSentenceCreate], session: AsyncSession
+) -> List[FillGapSentence]:
+    rows = await bulk_insert(
+        session,
+        FillGapSentenceModel,
+        [
+            {
+                "id": uuid4(),
+                "exercise_id": exercise_id,
+                "sentence": sentence.sentence,
+                "correct_answer": sentence.correct_answer,
+            }
+            for sentence in sentences
+        ],
+    )
+    return [to_fill_gap_sentence_schema(row) for row in rows]
 
 
-def dispatch_sentence_creation(
+@query_budget(1)
+async def create_multiple_choice_sentences(
+    exercise_id: UUID,
+    sentences: List[MultipleChoiceQuestionCreate],
+    session: AsyncSession,
+) -> List[MultipleChoiceQuestion]:
+    rows = await bulk_insert(
+        session,
+        MultipleChoiceQuestionModel,
+        [
+            {
+                "id": uuid4(),
+                "exercise_id": exercise_id,
+                "question": question.question,
+                "choices": question.choices,
+                "correct_index": question.correct_index,
+            }
+            for question in sentences
+        ],
+    )
+    return [to_multiple_choice_question_schema(row) for row in rows]
+
+
+@query_budget(1)
+async def dispatch_sentence_creation(
     exercise_type: ExerciseType,
     exercise_id: UUID,
     sentences: List[SentenceCreateUnion],
-    session: SessionDep,
+    session: AsyncSession,
 ) -> SentencesUnion:
     if exercise_type == ExerciseType.FILL_GAP:
         if not isinstance(sentences[0], FillGapSentenceCreate):
@@ -313,8 +724,7 @@ def dispatch_sentence_creation(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Sentence type does not match exercise type.",
             )
-        created_models = create_fill_gap_sentences(exercise_id, sentences, session)
-        return [to_fill_gap_sentence_schema(model) for model in created_models]
+        return await create_fill_gap_sentences(exercise_id, sentences, session)
 
     elif exercise_type == ExerciseType.MULTIPLE_CHOICE:
         if not isinstance(sentences[0], MultipleChoiceQuestionCreate):
@@ -322,10 +732,7 @@ def dispatch_sentence_creation(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Sentence type does not match exercise type.",
             )
-        created_models = create_multiple_choice_sentences(
-            exercise_id, sentences, session
-        )
-        return [to_multiple_choice_question_schema(model) for model in created_models]
+        return await create_multiple_choice_sentences(exercise_id, sentences, session)
 
     else:
         raise HTTPException(
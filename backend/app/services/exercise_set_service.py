@@ -0,0 +1,397 @@
+import hashlib
+import secrets
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Sequence, Tuple
+from uuid import UUID
+
+import orjson
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, insert
+from sqlalchemy.orm import defer
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.deps import AsyncSessionDep, CurrentUser
+from app.core.cache import snapshot_cache
+from app.core.db import async_engine
+from app.core.profiling import serialization_timer
+from app.core.query_budget import query_budget
+from app.models.exercise import Exercise as ExerciseModel
+from app.models.exercise_set import (
+    ExerciseSet as ExerciseSetModel,
+    ExerciseSetExercise,
+    ExerciseSetType,
+)
+from app.schemas.exercise_set import ExerciseSet, ExerciseSetCreate, ExerciseSetUpdate
+from app.services.exercise_service import EXERCISE_LOAD_OPTIONS, to_exercise_dict
+from app.services.stats_service import remove_set_stats
+
+# Unambiguous characters only (no 0/O, 1/I/L), so codes can be read aloud.
+ACCESS_CODE_ALPHABET = "ABCDEFGHJKMNPQRSTUVWXYZ23456789"
+ACCESS_CODE_LENGTH = 10
+
+# The snapshot and answer key are only read by learner requests and grading,
+# never by the teacher routes, so those routes leave them unloaded.
+SET_SUMMARY_OPTIONS = (
+    defer(ExerciseSetModel.snapshot),
+    defer(ExerciseSetModel.answer_key),
+)
+
+# Answer keys left out of exam snapshots.
+EXAM_HIDDEN_FIELDS = ("correct_answer", "correct_index")
+
+
+def generate_access_code() -> str:
+    return "".join(
+        secrets.choice(ACCESS_CODE_ALPHABET) for _ in range(ACCESS_CODE_LENGTH)
+    )
+
+
+@query_budget(3)
+async def create_exercise_set(
+    set_data: ExerciseSetCreate, current_user: CurrentUser, session: AsyncSessionDep
+) -> ExerciseSet:
+    exercise_ids = list(dict.fromkeys(set_data.exercise_ids))
+    await check_exercises_owned(exercise_ids, current_user, session)
+
+    set_model = ExerciseSetModel(
+        owner_id=current_user.id,
+        title=set_data.title,
+        description=set_data.description,
+        set_type=set_data.set_type,
+        access_code=generate_access_code(),
+    )
+    session.add(set_model)
+    await session.flush()
+    await insert_set_exercises(set_model.id, exercise_ids, session)
+    await session.commit()
+
+    return to_exercise_set_schema(set_model, exercise_ids)
+
+
+@query_budget(2)
+async def get_exercise_sets(
+    current_user: CurrentUser, session: AsyncSessionDep
+) -> List[ExerciseSet]:
+    set_models = (
+        await session.exec(
+            select(ExerciseSetModel)
+            .where(ExerciseSetModel.owner_id == current_user.id)
+            .options(*SET_SUMMARY_OPTIONS)
+            .order_by(ExerciseSetModel.created_at, ExerciseSetModel.id)
+        )
+    ).all()
+    if not set_models:
+        return []
+
+    links = await session.exec(
+        select(ExerciseSetExercise.exercise_set_id, ExerciseSetExercise.exercise_id)
+        .where(ExerciseSetExercise.exercise_set_id.in_([s.id for s in set_models]))
+        .order_by(ExerciseSetExercise.position)
+    )
+    exercise_ids: Dict[UUID, List[UUID]] = {s.id: [] for s in set_models}
+    for set_id, exercise_id in links:
+        exercise_ids[set_id].append(exercise_id)
+
+    return [to_exercise_set_schema(s, exercise_ids[s.id]) for s in set_models]
+
+
+@query_budget(2)
+async def get_exercise_set(
+    set_id: UUID, current_user: CurrentUser, session: AsyncSessionDep
+) -> ExerciseSet:
+    set_model = await get_owned_exercise_set_model(set_id, current_user, session)
+    return to_exercise_set_schema(
+        set_model, await get_set_exercise_ids(set_id, session)
+    )
+
+
+@query_budget(5)
+async def update_exercise_set(
+    set_id: UUID,
+    update_data: ExerciseSetUpdate,
+    current_user: CurrentUser,
+    session: AsyncSessionDep,
+) -> ExerciseSet:
+    set_model = await get_owned_exercise_set_model(set_id, current_user, session)
+    if set_model.published_at is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A published exercise set cannot be changed.",
+        )
+
+    if update_data.exercise_ids is not None:
+        exercise_ids = list(dict.fromkeys(update_data.exercise_ids))
+        await check_exercises_owned(exercise_ids, current_user, session)
+        await session.exec(
+            delete(ExerciseSetExercise).where(
+                ExerciseSetExercise.exercise_set_id == set_id
+            )
+        )
+        await insert_set_exercises(set_id, exercise_ids, session)
+    else:
+        exercise_ids = await get_set_exercise_ids(set_id, session)
+
+    update_dict = update_data.model_dump(exclude_unset=True, exclude={"exercise_ids"})
+    for key, value in update_dict.items():
+        setattr(set_model, key, value)
+
+    session.add(set_model)
+    await session.commit()
+
+    return to_exercise_set_schema(set_model, exercise_ids)
+
+
+@query_budget(11)
+async def delete_exercise_set(
+    set_id: UUID, current_user: CurrentUser, session: AsyncSessionDep
+) -> None:
+    """
+    Deletes the set with its submissions, and takes their counts back out of
+    the exercise statistics in the same transaction.
+    """
+    set_model = await get_owned_exercise_set_model(set_id, current_user, session)
+
+    if set_model.published_at is not None:
+        # The row lock waits for submission flushes in progress and holds off
+        # new ones, so every submission the delete cascades to is subtracted.
+        answer_key = (
+            await session.exec(
+                select(ExerciseSetModel.answer_key)
+                .where(ExerciseSetModel.id == set_id)
+                .with_for_update()
+            )
+        ).one()
+        await remove_set_stats(await session.connection(), set_id, answer_key or [])
+
+    await session.exec(
+        delete(ExerciseSetExercise).where(ExerciseSetExercise.exercise_set_id == set_id)
+    )
+    await session.delete(set_model)
+    await session.commit()
+    snapshot_cache.delete(set_model.access_code)
+
+
+@query_budget(5)
+async def publish_exercise_set(
+    set_id: UUID, current_user: CurrentUser, session: AsyncSessionDep
+) -> ExerciseSet:
+    """
+    Freezes the set: its exercises are serialized once into the snapshot that
+    every learner request is served from. Later edits to the exercises do not
+    change a published set.
+    """
+    set_model = await get_owned_exercise_set_model(set_id, current_user, session)
+    if set_model.published_at is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Exercise set is already published.",
+        )
+
+    exercise_models = (
+        await session.exec(
+            select(ExerciseModel)
+            .join(
+                ExerciseSetExercise,
+                ExerciseSetExercise.exercise_id == ExerciseModel.id,
+            )
+            .where(ExerciseSetExercise.exercise_set_id == set_id)
+            .order_by(ExerciseSetExercise.position)
+            .options(*EXERCISE_LOAD_OPTIONS)
+        )
+    ).all()
+
+    set_model.published_at = datetime.now(timezone.utc)
+    set_model.snapshot, set_model.snapshot_hash = build_snapshot(
+        set_model, exercise_models
+    )
+    set_model.answer_key = build_answer_key(exercise_models)
+    session.add(set_model)
+    await session.commit()
+
+    return to_exercise_set_schema(set_model, [e.id for e in exercise_models])
+
+
+class PublishedSnapshot:
+    """What learner requests need of a published set, kept in snapshot_cache."""
+
+    def __init__(self, set_id: UUID, content: bytes, content_hash: str):
+        self.set_id = set_id
+        self.content = content
+        self.content_hash = content_hash
+
+
+@query_budget(1)
+async def get_published_snapshot(access_code: str) -> PublishedSnapshot:
+    """
+    Returns the snapshot of a published set. Snapshots never change, so after
+    the first request they are served from the cache without a session or a
+    query. The cache is per process: a deleted set is evicted only where the
+    delete ran, and other workers serve it until SNAPSHOT_CACHE_TTL_SECONDS
+    have passed.
+    """
+    cached = snapshot_cache.get(access_code)
+    if cached is not None:
+        return cached
+
+    async with AsyncSession(async_engine) as session:
+        row = (
+            await session.exec(
+                select(
+                    ExerciseSetModel.id,
+                    ExerciseSetModel.snapshot,
+                    ExerciseSetModel.snapshot_hash,
+                ).where(
+                    ExerciseSetModel.access_code == access_code,
+                    ExerciseSetModel.published_at.is_not(None),
+                )
+            )
+        ).first()
+
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No published exercise set matches this access code.",
+        )
+
+    snapshot = PublishedSnapshot(row.id, row.snapshot, row.snapshot_hash)
+    snapshot_cache.set(access_code, snapshot)
+    return snapshot
+
+
+@query_budget(0)
+def build_snapshot(
+    set_model: ExerciseSetModel, exercise_models: Sequence[ExerciseModel]
+) -> Tuple[bytes, str]:
+    """Serializes a set for learners and returns the JSON and its SHA-256."""
+    with serialization_timer():
+        exercises = [to_exercise_dict(model) for model in exercise_models]
+        if set_model.set_type == ExerciseSetType.EXAM:
+            for exercise in exercises:
+                strip_answers(exercise["fill_gap_sentences"])
+                strip_answers(exercise["multiple_choice_questions"])
+
+        content = orjson.dumps(
+            {
+                "title": set_model.title,
+                "description": set_model.description,
+                "set_type": set_model.set_type,
+                "published_at": set_model.published_at,
+                "exercises": exercises,
+            }
+        )
+    return content, hashlib.sha256(content).hexdigest()
+
+
+def build_answer_key(exercise_models: Sequence[ExerciseModel]) -> List[Dict[str, Any]]:
+    answer_key = []
+    for model in exercise_models:
+        exercise = to_exercise_dict(model)
+        answer_key.append(
+            {
+                "exercise_id": str(model.id),
+                "type": exercise["type"],
+                "items": [
+                    [str(s["id"]), s["correct_answer"]]
+                    for s in exercise["fill_gap_sentences"]
+                ]
+                + [
+                    [str(q["id"]), q["correct_index"]]
+                    for q in exercise["multiple_choice_questions"]
+                ],
+            }
+        )
+    return answer_key
+
+
+def strip_answers(items: List[Dict[str, Any]]) -> None:
+    for item in items:
+        for field in EXAM_HIDDEN_FIELDS:
+            item.pop(field, None)
+
+
+@query_budget(1)
+async def get_owned_exercise_set_model(
+    set_id: UUID, current_user: CurrentUser, session: AsyncSession
+) -> ExerciseSetModel:
+    set_model = (
+        await session.exec(
+            select(ExerciseSetModel)
+            .where(
+                ExerciseSetModel.id == set_id,
+                ExerciseSetModel.owner_id == current_user.id,
+            )
+            .options(*SET_SUMMARY_OPTIONS)
+        )
+    ).first()
+
+    if set_model is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Exercise set with ID {set_id} not found for the current user.",
+        )
+
+    return set_model
+
+
+@query_budget(1)
+async def get_set_exercise_ids(set_id: UUID, session: AsyncSession) -> List[UUID]:
+    return list(
+        (
+            await session.exec(
+                select(ExerciseSetExercise.exercise_id)
+                .where(ExerciseSetExercise.exercise_set_id == set_id)
+                .order_by(ExerciseSetExercise.position)
+            )
+        ).all()
+    )
+
+
+@query_budget(1)
+async def check_exercises_owned(
+    exercise_ids: List[UUID], current_user: CurrentUser, session: AsyncSession
+) -> None:
+    owned = (
+        await session.exec(
+            select(func.count())
+            .select_from(ExerciseModel)
+            .where(
+                ExerciseModel.id.in_(exercise_ids),
+                ExerciseModel.owner_id == current_user.id,
+            )
+        )
+    ).one()
+
+    if owned != len(exercise_ids):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="One or more exercises were not found for the current user.",
+        )
+
+
+@query_budget(1)
+async def insert_set_exercises(
+    set_id: UUID, exercise_ids: List[UUID], session: AsyncSession
+) -> None:
+    await session.exec(
+        insert(ExerciseSetExercise.__table__),
+        params=[
+            {"exercise_set_id": set_id, "exercise_id": exercise_id, "position": i}
+            for i, exercise_id in enumerate(exercise_ids)
+        ],
+    )
+
+
+def to_exercise_set_schema(
+    model: ExerciseSetModel, exercise_ids: List[UUID]
+) -> ExerciseSet:
+    return ExerciseSet(
+        id=model.id,
+        title=model.title,
+        description=model.description,
+        set_type=model.set_type,
+        access_code=model.access_code,
+        exercise_ids=exercise_ids,
+        published_at=model.published_at,
+        snapshot_hash=model.snapshot_hash,
+    )
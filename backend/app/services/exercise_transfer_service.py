@@ -0,0 +1,449 @@
+import csv
+import io
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+from uuid import UUID, uuid4
+
+import orjson
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.deps import AsyncSessionDep, CurrentUser
+from app.core.config import (
+    EXERCISE_STREAM_CHUNK_SIZE,
+    IMPORT_BATCH_SIZE,
+    IMPORT_MAX_LINE_BYTES,
+    IMPORT_MAX_REPORTED_ERRORS,
+)
+from app.core.exercise_types import get_exercise_type_registry
+from app.core.profiling import serialization_timer
+from app.core.query_budget import query_budget
+from app.models.exercise import Exercise as ExerciseModel
+from app.models.fill_gap_sentence import FillGapSentence as FillGapSentenceModel
+from app.models.multiple_choice_question import (
+    MultipleChoiceQuestion as MultipleChoiceQuestionModel,
+)
+from app.schemas.exercise import ExerciseType
+from app.schemas.exercise_transfer import (
+    ExerciseRow,
+    ImportResult,
+    ImportRowError,
+    TransferFormat,
+)
+from app.schemas.fill_gap_sentence import FillGapSentence, FillGapSentenceCreate
+from app.schemas.multiple_choice_question import (
+    MultipleChoiceQuestion,
+    MultipleChoiceQuestionCreate,
+)
+from app.services.exercise_service import (
+    EXERCISE_LIST_ORDER,
+    EXERCISE_LOAD_OPTIONS,
+    exercise_changed_values,
+    to_exercise_dict,
+)
+from app.services.search_service import (
+    record_exercise,
+    record_questions,
+    record_sentences,
+)
+
+# CSV columns, in export order. Multiple-choice choices share one cell, as a
+# JSON array of strings.
+TRANSFER_COLUMNS = list(ExerciseRow.model_fields)
+# Files exported before choices were JSON joined them with this instead; a
+# choice containing it did not survive the round trip.
+LEGACY_CHOICE_SEPARATOR = "|"
+
+ITEM_FIELDS = {
+    ExerciseType.FILL_GAP: ("sentence", "correct_answer"),
+    ExerciseType.MULTIPLE_CHOICE: ("question", "choices", "correct_index"),
+}
+ITEM_SCHEMAS = {
+    ExerciseType.FILL_GAP: FillGapSentenceCreate,
+    ExerciseType.MULTIPLE_CHOICE: MultipleChoiceQuestionCreate,
+}
+
+TRANSFER_MEDIA_TYPES = {
+    TransferFormat.NDJSON: "application/x-ndjson",
+    TransferFormat.CSV: "text/csv",
+}
+
+# A parsed row: its number and either its fields or why it could not be read.
+ParsedRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def transfer_format_for(content_type: Optional[str]) -> TransferFormat:
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    for transfer_format, known in TRANSFER_MEDIA_TYPES.items():
+        if media_type == known:
+            return transfer_format
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="Send application/x-ndjson or text/csv, or pass ?format=.",
+    )
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Optional[bytes]]:
+    """
+    Splits a byte stream into lines, holding at most one line in memory.
+    A line longer than IMPORT_MAX_LINE_BYTES is skipped and yielded as None.
+    """
+    buffer = bytearray()
+    skipping = False
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            if skipping:
+                skipping = False
+            elif end - start > IMPORT_MAX_LINE_BYTES:
+                yield None
+            else:
+                yield bytes(buffer[start:end]).rstrip(b"\r")
+            start = end + 1
+        del buffer[:start]
+        if len(buffer) > IMPORT_MAX_LINE_BYTES:
+            if not skipping:
+                yield None
+            skipping = True
+            buffer.clear()
+    if buffer and not skipping:
+        yield bytes(buffer).rstrip(b"\r")
+
+
+async def parse_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    row = 0
+    async for line in iter_lines(chunks):
+        if line is not None and not line.strip():
+            continue
+        row += 1
+        if line is None:
+            yield row, None, f"Line exceeds {IMPORT_MAX_LINE_BYTES} bytes."
+            continue
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            yield row, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield row, None, "Expected a JSON object."
+            continue
+        yield row, record, None
+
+
+async def parse_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    """
+    Reads CSV with a header row naming TRANSFER_COLUMNS. Quoted fields may
+    span lines: lines are joined until their quotes balance. Empty cells are
+    omitted. ``choices`` is a JSON array; a cell that does not start with
+    ``[`` is split on LEGACY_CHOICE_SEPARATOR.
+    """
+    header: Optional[List[str]] = None
+    pending = ""
+    row = 0
+    async for line in iter_lines(chunks):
+        if line is None:
+            pending = ""
+            row += 1
+            yield row, None, f"Line exceeds {IMPORT_MAX_LINE_BYTES} bytes."
+            continue
+        text = line.decode("utf-8-sig" if header is None else "utf-8", "replace")
+        pending = f"{pending}\n{text}" if pending else text
+        if pending.count('"') % 2:
+            if len(pending) > IMPORT_MAX_LINE_BYTES:
+                pending = ""
+                row += 1
+                yield row, None, f"Record exceeds {IMPORT_MAX_LINE_BYTES} bytes."
+            continue
+        record_text, pending = pending, ""
+        if not record_text.strip():
+            continue
+        values = next(csv.reader(io.StringIO(record_text)))
+
+        if header is None:
+            header = [name.strip() for name in values]
+            unknown = set(header) - set(TRANSFER_COLUMNS)
+            if unknown or "exercise" not in header:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=(
+                        "The CSV header must include 'exercise' and only "
+                        f"{', '.join(TRANSFER_COLUMNS)}."
+                    ),
+                )
+            continue
+
+        row += 1
+        if len(values) != len(header):
+            yield row, None, f"Expected {len(header)} values, got {len(values)}."
+            continue
+        record: Dict[str, Any] = {
+            name: value for name, value in zip(header, values) if value != ""
+        }
+        if "choices" in record:
+            choices = parse_choices(record["choices"])
+            if choices is None:
+                yield row, None, "choices: Expected a JSON array of strings."
+                continue
+            record["choices"] = choices
+        yield row, record, None
+
+
+def parse_choices(cell: str) -> Optional[List[Any]]:
+    if not cell.lstrip().startswith("["):
+        return cell.split(LEGACY_CHOICE_SEPARATOR)
+    try:
+        choices = orjson.loads(cell)
+    except orjson.JSONDecodeError:
+        return None
+    return choices if isinstance(choices, list) else None
+
+
+def format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}"
+        for e in error.errors()
+    )
+
+
+class ExerciseImport:
+    """
+    Accumulates validated rows and writes them IMPORT_BATCH_SIZE rows at a
+    time, one transaction per batch. Only the current batch and the id and
+    type of each exercise key seen so far are kept in memory.
+    """
+
+    def __init__(self, owner_id: UUID, session: AsyncSession):
+        self.owner_id = owner_id
+        self.session = session
+        self.exercises: Dict[str, Tuple[UUID, ExerciseType]] = {}
+        self.new_exercises: List[Dict[str, Any]] = []
+        # Exercises from earlier batches that receive rows in this one.
+        self.extended: Set[UUID] = set()
+        self.items: Dict[ExerciseType, List[Dict[str, Any]]] = {
+            exercise_type: [] for exercise_type in ITEM_FIELDS
+        }
+        self.rows = 0
+        self.imported = 0
+        self.exercises_created = 0
+        self.error_count = 0
+        self.errors: List[ImportRowError] = []
+
+    def fail(self, row: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < IMPORT_MAX_REPORTED_ERRORS:
+            self.errors.append(ImportRowError(row=row, message=message))
+
+    async def add(self, row_number: int, record: Dict[str, Any]) -> None:
+        try:
+            row = ExerciseRow.model_validate(record)
+        except ValidationError as e:
+            return self.fail(row_number, format_validation_error(e))
+
+        known = self.exercises.get(row.exercise)
+        if known is None:
+            if row.type is None or not row.title:
+                return self.fail(
+                    row_number,
+                    f"Exercise '{row.exercise}' is new; its first row needs a "
+                    "title and type.",
+                )
+            exercise_type = row.type
+        else:
+            exercise_id, exercise_type = known
+            if row.type is not None and row.type != exercise_type:
+                return self.fail(
+                    row_number,
+                    f"Exercise '{row.exercise}' is {exercise_type.value}, "
+                    f"not {row.type.value}.",
+                )
+
+        try:
+            item = ITEM_SCHEMAS[exercise_type].model_validate(
+                row.model_dump(
+                    include=set(ITEM_FIELDS[exercise_type]), exclude_none=True
+                )
+            )
+        except ValidationError as e:
+            return self.fail(row_number, format_validation_error(e))
+
+        if known is None:
+            exercise_id = uuid4()
+            self.exercises[row.exercise] = (exercise_id, exercise_type)
+            self.new_exercises.append(
+                {
+                    "id": exercise_id,
+                    "owner_id": self.owner_id,
+                    "exercise_type_id": get_exercise_type_registry().id_for(
+                        exercise_type.value
+                    ),
+                    "created_at": datetime.now(timezone.utc),
+                    "title": row.title,
+                    "description": row.description,
+                }
+            )
+        else:
+            self.extended.add(exercise_id)
+
+        self.items[exercise_type].append(
+            {"id": uuid4(), "exercise_id": exercise_id, **item.model_dump()}
+        )
+        if sum(len(items) for items in self.items.values()) >= IMPORT_BATCH_SIZE:
+            await self.flush()
+
+    @query_budget(4)
+    async def flush(self) -> None:
+        """Writes the current batch in one transaction, one statement per table."""
+        fill_gap = self.items[ExerciseType.FILL_GAP]
+        questions = self.items[ExerciseType.MULTIPLE_CHOICE]
+        if self.new_exercises:
+            await self.session.exec(
+                insert(ExerciseModel.__table__), params=self.new_exercises
+            )
+        if fill_gap:
+            await self.session.exec(
+                insert(FillGapSentenceModel.__table__), params=fill_gap
+            )
+        if questions:
+            await self.session.exec(
+                insert(MultipleChoiceQuestionModel.__table__), params=questions
+            )
+        # New children change an exercise's ETag, as in create_sentence_for_exercise.
+        self.extended.difference_update(e["id"] for e in self.new_exercises)
+        if self.extended:
+            await self.session.exec(
+                update(ExerciseModel)
+                .where(ExerciseModel.id.in_(self.extended))
+                .values(**exercise_changed_values())
+            )
+        await self.session.commit()
+
+        for exercise in self.new_exercises:
+            record_exercise(
+                self.owner_id,
+                exercise["id"],
+                exercise["title"],
+                exercise["description"],
+            )
+        for item in fill_gap:
+            record_sentences(
+                self.owner_id, item["exercise_id"], [FillGapSentence(**item)]
+            )
+        for item in questions:
+            record_questions(
+                self.owner_id, item["exercise_id"], [MultipleChoiceQuestion(**item)]
+            )
+
+        self.imported += len(fill_gap) + len(questions)
+        self.exercises_created += len(self.new_exercises)
+        self.new_exercises = []
+        self.extended = set()
+        self.items = {exercise_type: [] for exercise_type in ITEM_FIELDS}
+
+    def result(self) -> ImportResult:
+        return ImportResult(
+            rows=self.rows,
+            imported=self.imported,
+            exercises_created=self.exercises_created,
+            error_count=self.error_count,
+            errors=self.errors,
+        )
+
+
+async def import_exercises(
+    chunks: AsyncIterator[bytes],
+    transfer_format: TransferFormat,
+    current_user: CurrentUser,
+    session: AsyncSessionDep,
+) -> ImportResult:
+    """
+    Imports exercises from a streamed NDJSON or CSV body in the ExerciseRow
+    format. Invalid rows are skipped and reported; valid rows are committed
+    batch by batch, so an interrupted upload keeps the batches already written.
+    """
+    parse = parse_csv if transfer_format == TransferFormat.CSV else parse_ndjson
+    importer = ExerciseImport(current_user.id, session)
+    async for row_number, record, error in parse(chunks):
+        importer.rows = row_number
+        if error is not None:
+            importer.fail(row_number, error)
+        else:
+            await importer.add(row_number, record)
+    await importer.flush()
+    return importer.result()
+
+
+def to_exercise_rows(exercise: Dict[str, Any]) -> List[Dict[str, Any]]:
+    common = {
+        "exercise": str(exercise["id"]),
+        "title": exercise["title"],
+        "description": exercise["description"],
+        "type": exercise["type"],
+    }
+    return [
+        {**common, "sentence": s["sentence"], "correct_answer": s["correct_answer"]}
+        for s in exercise["fill_gap_sentences"]
+    ] + [
+        {
+            **common,
+            "question": q["question"],
+            "choices": q["choices"],
+            "correct_index": q["correct_index"],
+        }
+        for q in exercise["multiple_choice_questions"]
+    ]
+
+
+def dump_rows_ndjson(rows: List[Dict[str, Any]]) -> bytes:
+    return b"".join(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE) for row in rows)
+
+
+def dump_rows_csv(rows: List[Dict[str, Any]], header: bool) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, TRANSFER_COLUMNS, lineterminator="\n")
+    if header:
+        writer.writeheader()
+    for row in rows:
+        if "choices" in row:
+            row = {**row, "choices": orjson.dumps(row["choices"]).decode()}
+        writer.writerow(row)
+    return buffer.getvalue().encode()
+
+
+@query_budget(3)
+async def export_exercises(
+    transfer_format: TransferFormat, current_user: CurrentUser, read_engine: AsyncEngine
+) -> AsyncIterator[bytes]:
+    """
+    Yields every sentence and question of the current user in the import row
+    format, one chunk per EXERCISE_STREAM_CHUNK_SIZE exercises, reading
+    through a server-side cursor like stream_exercises.
+    """
+    async with AsyncSession(read_engine) as session:
+        result = await session.stream_scalars(
+            select(ExerciseModel)
+            .where(ExerciseModel.owner_id == current_user.id)
+            .order_by(*EXERCISE_LIST_ORDER)
+            .options(*EXERCISE_LOAD_OPTIONS)
+            .execution_options(yield_per=EXERCISE_STREAM_CHUNK_SIZE)
+        )
+        first = True
+        async for partition in result.partitions():
+            with serialization_timer():
+                rows = [
+                    row
+                    for e in partition
+                    for row in to_exercise_rows(to_exercise_dict(e))
+                ]
+                if transfer_format == TransferFormat.CSV:
+                    chunk = dump_rows_csv(rows, header=first)
+                else:
+                    chunk = dump_rows_ndjson(rows)
+            first = False
+            yield chunk
+        if first and transfer_format == TransferFormat.CSV:
+            yield dump_rows_csv([], header=True)
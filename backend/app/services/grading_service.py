@@ -0,0 +1,232 @@
+import string
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Sequence, Tuple
+from uuid import UUID
+
+import orjson
+from fastapi import HTTPException, status
+from sqlmodel import select
+
+from app.api.deps import AsyncSessionDep, CurrentUser
+from app.core.cache import answer_key_cache
+from app.core.profiling import serialization_timer
+from app.core.query_budget import query_budget
+from app.models.exercise import Exercise as ExerciseModel
+from app.schemas.exercise import ExerciseType
+from app.schemas.grading import GradeRequest, GradingOptions
+from app.services.exercise_service import get_owned_exercise_model, to_exercise_type
+
+# numpy is imported by the first grading call rather than at startup.
+if TYPE_CHECKING:
+    import numpy as np
+
+PUNCTUATION_TABLE = str.maketrans("", "", string.punctuation)
+
+# Marks an unanswered multiple-choice question; never a valid choice index.
+NO_CHOICE = -1
+
+
+def normalize_answer(value: str, options: GradingOptions) -> str:
+    if options.ignore_punctuation:
+        value = value.translate(PUNCTUATION_TABLE)
+    value = " ".join(value.split())
+    return value if options.case_sensitive else value.casefold()
+
+
+class CompiledAnswerKey:
+    """
+    An exercise's answer key in array form: the item (sentence or question)
+    ids in a fixed column order, and the correct answers as one numpy array,
+    normalized gap answers for fill-gap exercises and choice indices for
+    multiple-choice ones. Built once per exercise version and normalization.
+    """
+
+    def __init__(
+        self,
+        exercise_id: UUID,
+        exercise_type: ExerciseType,
+        item_ids: Sequence[UUID],
+        answers: "np.ndarray",
+    ):
+        self.exercise_id = exercise_id
+        self.exercise_type = exercise_type
+        self.item_ids = tuple(item_ids)
+        self.columns = {str(item_id): i for i, item_id in enumerate(self.item_ids)}
+        self.answers = answers
+
+    def __len__(self) -> int:
+        return len(self.item_ids)
+
+
+def compile_answer_key(
+    model: ExerciseModel, options: GradingOptions
+) -> CompiledAnswerKey:
+    exercise_type = to_exercise_type(model.exercise_type_id)
+    if exercise_type == ExerciseType.MULTIPLE_CHOICE:
+        items = [(q.id, q.correct_index) for q in model.multiple_choice_questions]
+    else:
+        items = [(s.id, s.correct_answer) for s in model.fill_gap_sentences]
+    return compile_answer_items(model.id, exercise_type, items, options)
+
+
+def compile_answer_items(
+    exercise_id: UUID,
+    exercise_type: ExerciseType,
+    items: Sequence[Tuple[Any, Any]],
+    options: GradingOptions,
+) -> CompiledAnswerKey:
+    """Compiles (item id, correct answer or choice index) pairs."""
+    import numpy as np
+
+    if exercise_type == ExerciseType.MULTIPLE_CHOICE:
+        answers = np.array([answer for _, answer in items], dtype=np.int64)
+    else:
+        answers = np.array(
+            [normalize_answer(answer, options) for _, answer in items], dtype=str
+        )
+    return CompiledAnswerKey(
+        exercise_id, exercise_type, [item_id for item_id, _ in items], answers
+    )
+
+
+def answer_key_cache_key(exercise_id: UUID, version: Any, options: GradingOptions):
+    # Only normalization changes the compiled key; edit distance is applied
+    # while grading.
+    return (
+        f"{exercise_id}:{version}:{options.case_sensitive}:{options.ignore_punctuation}"
+    )
+
+
+def grade_submissions(
+    key: CompiledAnswerKey,
+    submissions: Sequence[Mapping[str, Any]],
+    options: GradingOptions,
+) -> "np.ndarray":
+    """
+    Grades a batch of submissions (item id -> answer) against ``key`` and
+    returns a (submissions x items) boolean array. Answers to unknown items
+    are ignored; missing answers are wrong.
+    """
+    import numpy as np
+
+    if key.exercise_type == ExerciseType.MULTIPLE_CHOICE:
+        given = np.full((len(submissions), len(key)), NO_CHOICE, dtype=np.int64)
+        for row, answers in enumerate(submissions):
+            for item_id, answer in answers.items():
+                column = key.columns.get(item_id)
+                if column is not None and type(answer) is int:
+                    given[row, column] = answer
+        return given == key.answers
+
+    rows = [[""] * len(key) for _ in submissions]
+    normalized: Dict[Any, str] = {}
+    for row, answers in zip(rows, submissions):
+        for item_id, answer in answers.items():
+            column = key.columns.get(item_id)
+            if column is not None:
+                if answer not in normalized:
+                    normalized[answer] = normalize_answer(str(answer), options)
+                row[column] = normalized[answer]
+    # Sized to the longest answer, so nothing is truncated before comparing.
+    given = np.array(rows, dtype=str).reshape(len(submissions), len(key))
+    answered = given != ""
+    correct = (given == key.answers) & answered
+
+    if options.max_edit_distance:
+        # A class tends to make the same mistakes, so each distinct
+        # (answer, expected) pair is measured once.
+        within_tolerance: Dict[Tuple[str, str], bool] = {}
+        for row, column in zip(*np.nonzero(answered & ~correct)):
+            pair = (str(given[row, column]), str(key.answers[column]))
+            if pair not in within_tolerance:
+                # A tolerance as long as the answer would accept anything.
+                within_tolerance[pair] = len(pair[1]) > options.max_edit_distance and (
+                    bounded_edit_distance(*pair, options.max_edit_distance) is not None
+                )
+            correct[row, column] = within_tolerance[pair]
+    return correct
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """Levenshtein distance between a and b, or None if it exceeds ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        if min(current) > limit:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= limit else None
+
+
+@query_budget(4)
+async def get_answer_key(
+    exercise_id: UUID,
+    options: GradingOptions,
+    current_user: CurrentUser,
+    session: AsyncSessionDep,
+) -> CompiledAnswerKey:
+    """
+    Returns the compiled answer key of an exercise owned by the current user.
+    Only the exercise's version is read unless the key is not cached yet.
+    """
+    version = (
+        await session.exec(
+            select(ExerciseModel.version).where(
+                ExerciseModel.id == exercise_id,
+                ExerciseModel.owner_id == current_user.id,
+            )
+        )
+    ).first()
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Exercise with ID {exercise_id} not found for the current user.",
+        )
+
+    key = answer_key_cache.get(answer_key_cache_key(exercise_id, version, options))
+    if key is None:
+        model = await get_owned_exercise_model(exercise_id, current_user, session)
+        key = compile_answer_key(model, options)
+        answer_key_cache.set(
+            answer_key_cache_key(exercise_id, model.version, options), key
+        )
+    return key
+
+
+async def grade_exercise(
+    exercise_id: UUID,
+    grade_request: GradeRequest,
+    current_user: CurrentUser,
+    session: AsyncSessionDep,
+) -> Tuple[CompiledAnswerKey, "np.ndarray"]:
+    key = await get_answer_key(
+        exercise_id, grade_request.options, current_user, session
+    )
+    correct = grade_submissions(
+        key,
+        [submission.answers for submission in grade_request.submissions],
+        grade_request.options,
+    )
+    return key, correct
+
+
+def dump_grades_json(key: CompiledAnswerKey, correct: "np.ndarray") -> bytes:
+    with serialization_timer():
+        return orjson.dumps(
+            {
+                "exercise_id": key.exercise_id,
+                "item_ids": key.item_ids,
+                "scores": correct.sum(axis=1),
+                "correct": correct,
+            },
+            option=orjson.OPT_SERIALIZE_NUMPY,
+        )
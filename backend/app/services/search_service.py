@@ -0,0 +1,546 @@
+import heapq
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from itertools import count, islice
+from operator import itemgetter
+from typing import (
+    AbstractSet,
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+from uuid import UUID
+
+import orjson
+from sqlalchemy import Uuid, cast, func, literal, literal_column, null, union_all
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSVECTOR
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.deps import AsyncSessionDep, CurrentUser
+from app.core.config import SEARCH_SIMILARITY_THRESHOLD
+from app.core.db import async_engine
+from app.core.profiling import serialization_timer
+from app.core.query_budget import query_budget
+from app.models.exercise import Exercise as ExerciseModel
+from app.models.fill_gap_sentence import FillGapSentence as FillGapSentenceModel
+from app.models.multiple_choice_question import (
+    MultipleChoiceQuestion as MultipleChoiceQuestionModel,
+)
+from app.models.search import SEARCH_TEXT_CONFIG
+from app.schemas.fill_gap_sentence import FillGapSentence
+from app.schemas.multiple_choice_question import MultipleChoiceQuestion
+from app.schemas.search import SearchResultKind
+
+# Postgres searches its tsvector and trigram indexes; any other database (SQLite
+# in development and tests) is searched through the in-memory index below.
+USE_DATABASE_SEARCH = async_engine.dialect.name == "postgresql"
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Field weights, equal to ts_rank's defaults for the tsvector weights A and B.
+PRIMARY_WEIGHT = 1.0
+SECONDARY_WEIGHT = 0.4
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.casefold())
+
+
+@lru_cache(maxsize=100_000)
+def trigrams(token: str) -> FrozenSet[str]:
+    # Padded like pg_trgm, so word starts weigh more than word ends.
+    padded = f"  {token} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+class SearchDocument(NamedTuple):
+    exercise_id: UUID
+    kind: SearchResultKind
+    # None for the exercise's own document (title and description).
+    item_id: Optional[UUID]
+    text: str
+
+
+class Posting:
+    """
+    The documents containing a token, grouped by the token's weighted term
+    frequency in them. Few distinct weights occur, so the best matches for a
+    one-word query are read from the top groups without scanning the rest,
+    and intersections run group by group on dict key views.
+    """
+
+    __slots__ = ("groups", "size")
+
+    def __init__(self):
+        # weight -> document numbers, in indexing order
+        self.groups: Dict[float, Dict[int, None]] = {}
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, number: int, weight: float) -> None:
+        self.groups.setdefault(weight, {})[number] = None
+        self.size += 1
+
+    def remove(self, number: int, weight: float) -> None:
+        group = self.groups[weight]
+        del group[number]
+        if not group:
+            del self.groups[weight]
+        self.size -= 1
+
+
+class OwnerSearchIndex:
+    """
+    Inverted index over one owner's exercises, sentences and questions, so a
+    query only ever touches the searching user's documents. Documents are
+    added and removed by exercise, sentence or question id, and numbered
+    internally so postings hold small ints rather than UUIDs.
+    """
+
+    def __init__(self):
+        self.numbers: Dict[UUID, int] = {}
+        self.documents: Dict[int, SearchDocument] = {}
+        # document number -> token -> weighted term frequency
+        self.document_terms: Dict[int, Dict[str, float]] = {}
+        self.postings: Dict[str, Posting] = {}
+        # trigram -> indexed tokens containing it, for misspelled query words
+        self.trigram_tokens: Dict[str, Set[str]] = {}
+        self.titles: Dict[UUID, str] = {}
+        self.exercise_documents: Dict[UUID, Set[UUID]] = {}
+        self._next_number = count()
+
+    def add(
+        self,
+        document_id: UUID,
+        document: SearchDocument,
+        weighted_fields: Sequence[Tuple[str, float]],
+    ) -> None:
+        self.remove(document_id)
+        terms: Dict[str, float] = {}
+        for text, weight in weighted_fields:
+            for token in tokenize(text):
+                terms[token] = terms.get(token, 0.0) + weight
+
+        number = self.numbers[document_id] = next(self._next_number)
+        self.documents[number] = document
+        self.document_terms[number] = terms
+        self.exercise_documents.setdefault(document.exercise_id, set()).add(document_id)
+        for token, weight in terms.items():
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = Posting()
+                for trigram in trigrams(token):
+                    self.trigram_tokens.setdefault(trigram, set()).add(token)
+            posting.add(number, weight)
+
+    def remove(self, document_id: UUID) -> None:
+        number = self.numbers.pop(document_id, None)
+        if number is None:
+            return
+        document = self.documents.pop(number)
+        siblings = self.exercise_documents.get(document.exercise_id)
+        if siblings is not None:
+            siblings.discard(document_id)
+        for token, weight in self.document_terms.pop(number).items():
+            posting = self.postings[token]
+            posting.remove(number, weight)
+            if not posting:
+                del self.postings[token]
+                for trigram in trigrams(token):
+                    tokens = self.trigram_tokens[trigram]
+                    tokens.discard(token)
+                    if not tokens:
+                        del self.trigram_tokens[trigram]
+
+    def remove_exercise(self, exercise_id: UUID) -> None:
+        for document_id in self.exercise_documents.pop(exercise_id, set()):
+            self.remove(document_id)
+        self.titles.pop(exercise_id, None)
+
+    def variants(self, token: str, threshold: float) -> Dict[str, float]:
+        """
+        Indexed tokens matching a query token, with their similarity: 1.0 for
+        the token itself and the trigram similarity for near misses.
+        """
+        matches = {token: 1.0} if token in self.postings else {}
+        grams = trigrams(token)
+        shared: Counter = Counter()
+        for trigram in grams:
+            shared.update(self.trigram_tokens.get(trigram, ()))
+        for candidate, shared_count in shared.items():
+            if candidate == token:
+                continue
+            similarity = shared_count / (
+                len(grams) + len(trigrams(candidate)) - shared_count
+            )
+            if similarity >= threshold:
+                matches[candidate] = similarity
+        return matches
+
+    def search(
+        self, query: str, threshold: float, top: int
+    ) -> List[Tuple[SearchDocument, float]]:
+        """
+        Returns the ``top`` best (document, score) pairs for documents
+        matching every word of the query, exactly or within ``threshold``.
+        A word's score is its best variant's similarity x weighted term
+        frequency x idf, and a document's score is the sum over the words.
+        Equal scores are returned in indexing order.
+        """
+        total = len(self.documents)
+        matches: Optional[ScoreGroups] = None
+        for token in dict.fromkeys(tokenize(query)):
+            variants = [
+                (posting, similarity * math.log(1 + total / len(posting)))
+                for posting, similarity in (
+                    (self.postings[variant], similarity)
+                    for variant, similarity in self.variants(token, threshold).items()
+                )
+            ]
+            groups = word_score_groups(variants)
+            matches = (
+                groups if matches is None else combine_score_groups(matches, groups)
+            )
+            if not matches:
+                return []
+        if matches is None:
+            return []
+
+        results = []
+        for score, numbers in sorted(matches, key=itemgetter(0), reverse=True):
+            for number in first_numbers(numbers, top - len(results)):
+                results.append((self.documents[number], score))
+            if len(results) == top:
+                break
+        return results
+
+
+# Documents matching a query so far, grouped by score: (score, document
+# numbers) pairs with disjoint number sets. Scores only depend on weights,
+# which take few distinct values, so matching is done with set operations on
+# a handful of groups instead of per document.
+ScoreGroups = List[Tuple[float, AbstractSet[int]]]
+
+
+def word_score_groups(variants: Sequence[Tuple[Posting, float]]) -> ScoreGroups:
+    """Groups one query word's matches by score, keeping each document's best."""
+    candidates = sorted(
+        (
+            (weight * factor, group.keys())
+            for posting, factor in variants
+            for weight, group in posting.groups.items()
+        ),
+        key=itemgetter(0),
+        reverse=True,
+    )
+    if len(variants) == 1:
+        # A single posting's groups are disjoint already.
+        return candidates
+    groups: ScoreGroups = []
+    seen: Set[int] = set()
+    for score, numbers in candidates:
+        numbers = numbers - seen
+        if numbers:
+            groups.append((score, numbers))
+            seen |= numbers
+    return groups
+
+
+def combine_score_groups(left: ScoreGroups, right: ScoreGroups) -> ScoreGroups:
+    """Documents in both, scored with the sum of their two scores."""
+    combined: Dict[float, Set[int]] = {}
+    for left_score, left_numbers in left:
+        for right_score, right_numbers in right:
+            both = left_numbers & right_numbers
+            if both:
+                combined.setdefault(left_score + right_score, set()).update(both)
+    return list(combined.items())
+
+
+def first_numbers(numbers: AbstractSet[int], count: int) -> List[int]:
+    # Document numbers grow with indexing order; a posting's own groups are
+    # already in that order, while sets from intersections are not.
+    if isinstance(numbers, set):
+        return heapq.nsmallest(count, numbers)
+    return list(islice(numbers, count))
+
+
+class SearchIndex:
+    """
+    In-memory search over every owner's library, built at startup and kept
+    current by the exercise service. Like the availability filters it only
+    sees writes made through this process, which is why it is meant for
+    single-process SQLite and test deployments; Postgres deployments search
+    the database instead.
+    """
+
+    def __init__(self):
+        self.owners: Dict[UUID, OwnerSearchIndex] = {}
+
+    def owner(self, owner_id: UUID) -> OwnerSearchIndex:
+        index = self.owners.get(owner_id)
+        if index is None:
+            index = self.owners[owner_id] = OwnerSearchIndex()
+        return index
+
+
+_index = SearchIndex()
+
+
+def get_search_index() -> SearchIndex:
+    return _index
+
+
+def load_search_index(session: Session) -> SearchIndex:
+    """Builds the in-memory index from the database; called once at startup."""
+    global _index
+    index = SearchIndex()
+    if not USE_DATABASE_SEARCH:
+        owners: Dict[UUID, UUID] = {}
+        for exercise_id, owner_id, title, description in session.exec(
+            select(
+                ExerciseModel.id,
+                ExerciseModel.owner_id,
+                ExerciseModel.title,
+                ExerciseModel.description,
+            ).execution_options(yield_per=1000)
+        ):
+            owners[exercise_id] = owner_id
+            add_exercise(index.owner(owner_id), exercise_id, title, description)
+        for sentence_id, exercise_id, sentence in session.exec(
+            select(
+                FillGapSentenceModel.id,
+                FillGapSentenceModel.exercise_id,
+                FillGapSentenceModel.sentence,
+            ).execution_options(yield_per=1000)
+        ):
+            add_sentence(
+                index.owner(owners[exercise_id]), exercise_id, sentence_id, sentence
+            )
+        for question_id, exercise_id, question, choices in session.exec(
+            select(
+                MultipleChoiceQuestionModel.id,
+                MultipleChoiceQuestionModel.exercise_id,
+                MultipleChoiceQuestionModel.question,
+                MultipleChoiceQuestionModel.choices,
+            ).execution_options(yield_per=1000)
+        ):
+            add_question(
+                index.owner(owners[exercise_id]),
+                exercise_id,
+                question_id,
+                question,
+                choices,
+            )
+    _index = index
+    return _index
+
+
+def add_exercise(
+    index: OwnerSearchIndex, exercise_id: UUID, title: str, description: Optional[str]
+) -> None:
+    index.titles[exercise_id] = title
+    index.add(
+        exercise_id,
+        SearchDocument(exercise_id, SearchResultKind.EXERCISE, None, title),
+        [(title, PRIMARY_WEIGHT), (description or "", SECONDARY_WEIGHT)],
+    )
+
+
+def add_sentence(
+    index: OwnerSearchIndex, exercise_id: UUID, sentence_id: UUID, sentence: str
+) -> None:
+    index.add(
+        sentence_id,
+        SearchDocument(exercise_id, SearchResultKind.SENTENCE, sentence_id, sentence),
+        [(sentence, PRIMARY_WEIGHT)],
+    )
+
+
+def add_question(
+    index: OwnerSearchIndex,
+    exercise_id: UUID,
+    question_id: UUID,
+    question: str,
+    choices: Sequence[str],
+) -> None:
+    index.add(
+        question_id,
+        SearchDocument(exercise_id, SearchResultKind.QUESTION, question_id, question),
+        [(question, PRIMARY_WEIGHT)]
+        + [(choice, SECONDARY_WEIGHT) for choice in choices],
+    )
+
+
+def record_exercise(
+    owner_id: UUID, exercise_id: UUID, title: str, description: Optional[str]
+) -> None:
+    """Adds or re-indexes an exercise's title and description."""
+    if not USE_DATABASE_SEARCH:
+        add_exercise(_index.owner(owner_id), exercise_id, title, description)
+
+
+def record_sentences(
+    owner_id: UUID, exercise_id: UUID, sentences: Iterable[FillGapSentence]
+) -> None:
+    if not USE_DATABASE_SEARCH:
+        index = _index.owner(owner_id)
+        for sentence in sentences:
+            add_sentence(index, exercise_id, sentence.id, sentence.sentence)
+
+
+def record_questions(
+    owner_id: UUID, exercise_id: UUID, questions: Iterable[MultipleChoiceQuestion]
+) -> None:
+    if not USE_DATABASE_SEARCH:
+        index = _index.owner(owner_id)
+        for question in questions:
+            add_question(
+                index, exercise_id, question.id, question.question, question.choices
+            )
+
+
+def forget_exercise(owner_id: UUID, exercise_id: UUID) -> None:
+    """Removes a deleted exercise and its sentences or questions."""
+    if not USE_DATABASE_SEARCH:
+        _index.owner(owner_id).remove_exercise(exercise_id)
+
+
+@query_budget(2)
+async def search_exercises(
+    query: str,
+    limit: int,
+    offset: int,
+    current_user: CurrentUser,
+    session: AsyncSessionDep,
+) -> Tuple[bytes, Optional[int]]:
+    """
+    Returns a page of the current user's best matches for ``query`` as JSON,
+    and the offset of the next page if there is one.
+    """
+    if USE_DATABASE_SEARCH:
+        results = await search_database(
+            query, limit + 1, offset, current_user.id, session
+        )
+    else:
+        results = search_memory(query, limit + 1, offset, current_user.id)
+
+    next_offset = offset + limit if len(results) > limit else None
+    with serialization_timer():
+        return orjson.dumps(results[:limit]), next_offset
+
+
+def search_memory(
+    query: str, limit: int, offset: int, owner_id: UUID
+) -> List[Dict[str, Any]]:
+    index = _index.owners.get(owner_id)
+    if index is None:
+        return []
+    results = []
+    for document, score in index.search(
+        query, SEARCH_SIMILARITY_THRESHOLD, offset + limit
+    )[offset:]:
+        results.append(
+            {
+                "exercise_id": document.exercise_id,
+                "exercise_title": index.titles[document.exercise_id],
+                "kind": document.kind,
+                "item_id": document.item_id,
+                "text": document.text,
+                "score": round(score, 6),
+            }
+        )
+    return results
+
+
+async def search_database(
+    query: str, limit: int, offset: int, owner_id: UUID, session: AsyncSession
+) -> List[Dict[str, Any]]:
+    """
+    Matches every word of the query against the tsvector columns, or the
+    whole query against the trigram-indexed text for misspellings, and ranks
+    by ts_rank_cd plus word_similarity.
+    """
+    # The <% operator compares against this setting; it lasts until commit.
+    await session.exec(
+        select(
+            func.set_config(
+                "pg_trgm.word_similarity_threshold",
+                str(SEARCH_SIMILARITY_THRESHOLD),
+                True,
+            )
+        )
+    )
+
+    tsquery = func.websearch_to_tsquery(cast(SEARCH_TEXT_CONFIG, REGCONFIG), query)
+    exercise = ExerciseModel.__table__
+    sentence = FillGapSentenceModel.__table__
+    question = MultipleChoiceQuestionModel.__table__
+
+    def match(table, text_column):
+        vector = literal_column(f"{table.name}.search_vector", TSVECTOR)
+        return (
+            vector.op("@@")(tsquery) | literal(query).op("<%")(text_column),
+            (
+                func.ts_rank_cd(vector, tsquery)
+                + func.word_similarity(query, text_column)
+            ).label("score"),
+        )
+
+    exercise_match, exercise_score = match(exercise, exercise.c.title)
+    sentence_match, sentence_score = match(sentence, sentence.c.sentence)
+    question_match, question_score = match(question, question.c.question)
+    hits = union_all(
+        select(
+            exercise.c.id.label("exercise_id"),
+            exercise.c.title.label("exercise_title"),
+            literal(SearchResultKind.EXERCISE.value).label("kind"),
+            cast(null(), Uuid).label("item_id"),
+            exercise.c.title.label("text"),
+            exercise_score,
+        ).where(exercise.c.owner_id == owner_id, exercise_match),
+        select(
+            sentence.c.exercise_id,
+            exercise.c.title,
+            literal(SearchResultKind.SENTENCE.value),
+            sentence.c.id,
+            sentence.c.sentence,
+            sentence_score,
+        )
+        .join_from(sentence, exercise, sentence.c.exercise_id == exercise.c.id)
+        .where(exercise.c.owner_id == owner_id, sentence_match),
+        select(
+            question.c.exercise_id,
+            exercise.c.title,
+            literal(SearchResultKind.QUESTION.value),
+            question.c.id,
+            question.c.question,
+            question_score,
+        )
+        .join_from(question, exercise, question.c.exercise_id == exercise.c.id)
+        .where(exercise.c.owner_id == owner_id, question_match),
+    ).subquery()
+
+    rows = await session.exec(
+        select(hits)
+        .order_by(
+            hits.c.score.desc(),
+            hits.c.exercise_id,
+            hits.c.item_id.nulls_first(),
+        )
+        .limit(limit)
+        .offset(offset)
+    )
+    return [dict(row._mapping) for row in rows]
@@ -0,0 +1,332 @@
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Mapping, Sequence, Set
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import Table, and_, bindparam, delete, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlmodel import select
+
+from app.api.deps import AsyncSessionDep, CurrentUser
+from app.core.cache import answer_key_cache
+from app.core.query_budget import query_budget
+from app.models.exercise import Exercise as ExerciseModel
+from app.models.exercise_set import ExerciseSet as ExerciseSetModel
+from app.models.stats import ChoiceStat, QuestionStat, ScoreStat
+from app.models.submission import Submission
+from app.schemas.exercise import ExerciseType
+from app.schemas.grading import GradingOptions
+from app.schemas.stats import ExerciseStats, QuestionStats
+from app.services.grading_service import (
+    CompiledAnswerKey,
+    compile_answer_items,
+    grade_submissions,
+)
+
+# Submissions to published sets are graded with the default normalization.
+SUBMISSION_GRADING_OPTIONS = GradingOptions()
+
+UPSERT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+
+class StatDeltas:
+    """Counter increments for the stats tables, from one or more submissions."""
+
+    def __init__(self):
+        # (exercise id, item id) -> count
+        self.answered: Counter = Counter()
+        self.correct: Counter = Counter()
+        # (exercise id, item id, choice index) -> count
+        self.choices: Counter = Counter()
+        # (exercise id, score) -> count
+        self.scores: Counter = Counter()
+
+    def update(self, other: "StatDeltas") -> None:
+        self.answered.update(other.answered)
+        self.correct.update(other.correct)
+        self.choices.update(other.choices)
+        self.scores.update(other.scores)
+
+    def exercise_ids(self) -> Set[str]:
+        return {exercise_id for exercise_id, _ in self.scores}
+
+    def discard_exercises(self, exercise_ids: Set[str]) -> None:
+        for counter in (self.answered, self.correct, self.choices, self.scores):
+            for key in [key for key in counter if key[0] in exercise_ids]:
+                del counter[key]
+
+    def table_rows(self) -> Dict[Table, List[Dict[str, Any]]]:
+        # Rows are sorted by key so that concurrent upserts lock rows in the
+        # same order.
+        return {
+            QuestionStat.__table__: [
+                {
+                    "exercise_id": UUID(exercise_id),
+                    "item_id": UUID(item_id),
+                    "answered": answered,
+                    "correct": self.correct[(exercise_id, item_id)],
+                }
+                for (exercise_id, item_id), answered in sorted(self.answered.items())
+            ],
+            ChoiceStat.__table__: [
+                {
+                    "exercise_id": UUID(exercise_id),
+                    "item_id": UUID(item_id),
+                    "choice": choice,
+                    "count": count,
+                }
+                for (exercise_id, item_id, choice), count in sorted(
+                    self.choices.items()
+                )
+            ],
+            ScoreStat.__table__: [
+                {"exercise_id": UUID(exercise_id), "score": score, "count": count}
+                for (exercise_id, score), count in sorted(self.scores.items())
+            ],
+        }
+
+
+def compile_set_answer_key(
+    answer_key: Sequence[Mapping[str, Any]],
+) -> List[CompiledAnswerKey]:
+    """Compiles the answer key stored on a published set, one per exercise."""
+    return [
+        compile_answer_items(
+            exercise["exercise_id"],
+            ExerciseType(exercise["type"]),
+            exercise["items"],
+            SUBMISSION_GRADING_OPTIONS,
+        )
+        for exercise in answer_key
+    ]
+
+
+def compute_stat_deltas(
+    keys: Sequence[CompiledAnswerKey], submissions: Sequence[Mapping[str, Any]]
+) -> StatDeltas:
+    """Grades submissions to one set and counts the results per question."""
+    import numpy as np
+
+    deltas = StatDeltas()
+    if not submissions:
+        return deltas
+
+    for key in keys:
+        exercise_id = str(key.exercise_id)
+        item_ids = list(key.columns)
+        correct = grade_submissions(key, submissions, SUBMISSION_GRADING_OPTIONS)
+        answered = np.array(
+            [[item_id in answers for item_id in item_ids] for answers in submissions],
+            dtype=bool,
+        ).reshape(len(submissions), len(item_ids))
+
+        for column, item_id in enumerate(item_ids):
+            answered_count = int(answered[:, column].sum())
+            if answered_count:
+                deltas.answered[(exercise_id, item_id)] += answered_count
+                deltas.correct[(exercise_id, item_id)] += int(correct[:, column].sum())
+
+        if key.exercise_type == ExerciseType.MULTIPLE_CHOICE:
+            for answers in submissions:
+                for item_id in item_ids:
+                    choice = answers.get(item_id)
+                    if type(choice) is int:
+                        deltas.choices[(exercise_id, item_id, choice)] += 1
+
+        scores = np.bincount(correct.sum(axis=1), minlength=1)
+        for score, count in enumerate(scores.tolist()):
+            if count:
+                deltas.scores[(exercise_id, score)] += count
+    return deltas
+
+
+def increment_statement(dialect_name: str, table: Table):
+    """INSERT that adds to the counters of an existing row with the same key."""
+    statement = UPSERT_INSERTS[dialect_name](table)
+    keys = [column.name for column in table.primary_key.columns]
+    return statement.on_conflict_do_update(
+        index_elements=keys,
+        set_={
+            column.name: column + statement.excluded[column.name]
+            for column in table.columns
+            if column.name not in keys
+        },
+    )
+
+
+def decrement_statement(table: Table):
+    """UPDATE that subtracts from the counters of the row with the same key."""
+    keys = [column.name for column in table.primary_key.columns]
+    # Parameters are prefixed because SQLAlchemy reserves the column names for
+    # the SET clause.
+    return (
+        update(table)
+        .where(*[table.c[key] == bindparam(f"p_{key}") for key in keys])
+        .values(
+            {
+                column.name: column - bindparam(f"p_{column.name}")
+                for column in table.columns
+                if column.name not in keys
+            }
+        )
+    )
+
+
+async def remove_set_stats(
+    connection: AsyncConnection,
+    set_id: UUID,
+    answer_key: Sequence[Mapping[str, Any]],
+) -> None:
+    """
+    Subtracts what the submissions to a published set added to the stats
+    tables, before the set is deleted and its submissions go with it. Rows
+    left at zero are removed, as a rebuild would not write them. Call it with
+    the set row locked, so that no submission is flushed in between.
+    """
+    submissions = (
+        await connection.execute(
+            select(Submission.answers).where(Submission.exercise_set_id == set_id)
+        )
+    ).scalars()
+    deltas = compute_stat_deltas(compile_set_answer_key(answer_key), list(submissions))
+    exercise_ids = [UUID(exercise_id) for exercise_id in deltas.exercise_ids()]
+    if not exercise_ids:
+        return
+
+    # Exercises deleted since have no rows left, so their updates match none.
+    for table, rows in deltas.table_rows().items():
+        if not rows:
+            continue
+        await connection.execute(
+            decrement_statement(table),
+            [{f"p_{name}": value for name, value in row.items()} for row in rows],
+        )
+        keys = {column.name for column in table.primary_key.columns}
+        await connection.execute(
+            delete(table).where(
+                table.c.exercise_id.in_(exercise_ids),
+                and_(
+                    *[
+                        column == 0
+                        for column in table.columns
+                        if column.name not in keys
+                    ]
+                ),
+            )
+        )
+
+
+async def record_submission_stats(
+    connection: AsyncConnection, submissions: List[Dict[str, Any]]
+) -> None:
+    """
+    Write-behind hook for submissions: grades the batch against the answer
+    keys of its sets and adds the results to the stats tables, in the same
+    transaction as the submission rows.
+    """
+    by_set: Dict[UUID, List[Mapping[str, Any]]] = defaultdict(list)
+    for submission in submissions:
+        by_set[submission["exercise_set_id"]].append(submission["answers"])
+
+    keys_by_set = {set_id: answer_key_cache.get(f"set:{set_id}") for set_id in by_set}
+    missing = [set_id for set_id, keys in keys_by_set.items() if keys is None]
+    if missing:
+        rows = await connection.execute(
+            select(ExerciseSetModel.id, ExerciseSetModel.answer_key).where(
+                ExerciseSetModel.id.in_(missing)
+            )
+        )
+        for set_id, answer_key in rows:
+            # A published set never changes, so its key needs no version.
+            keys = compile_set_answer_key(answer_key or [])
+            answer_key_cache.set(f"set:{set_id}", keys)
+            keys_by_set[set_id] = keys
+
+    deltas = StatDeltas()
+    for set_id, answer_maps in by_set.items():
+        deltas.update(compute_stat_deltas(keys_by_set[set_id] or [], answer_maps))
+
+    # A published set keeps grading exercises that were deleted since; their
+    # statistics went with them.
+    exercise_ids = deltas.exercise_ids()
+    if exercise_ids:
+        existing = await connection.execute(
+            select(ExerciseModel.id).where(
+                ExerciseModel.id.in_([UUID(i) for i in exercise_ids])
+            )
+        )
+        deltas.discard_exercises(exercise_ids - {str(i) for (i,) in existing})
+
+    for table, rows in deltas.table_rows().items():
+        if rows:
+            await connection.execute(
+                increment_statement(connection.dialect.name, table), rows
+            )
+
+
+@query_budget(4)
+async def get_exercise_stats(
+    exercise_id: UUID, current_user: CurrentUser, session: AsyncSessionDep
+) -> ExerciseStats:
+    """Reads an exercise's aggregates; submissions themselves are not scanned."""
+    owned = (
+        await session.exec(
+            select(ExerciseModel.id).where(
+                ExerciseModel.id == exercise_id,
+                ExerciseModel.owner_id == current_user.id,
+            )
+        )
+    ).first()
+    if owned is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Exercise with ID {exercise_id} not found for the current user.",
+        )
+
+    questions = (
+        await session.exec(
+            select(QuestionStat)
+            .where(QuestionStat.exercise_id == exercise_id)
+            .order_by(QuestionStat.item_id)
+        )
+    ).all()
+    choices = (
+        await session.exec(
+            select(ChoiceStat).where(ChoiceStat.exercise_id == exercise_id)
+        )
+    ).all()
+    scores = (
+        await session.exec(
+            select(ScoreStat)
+            .where(ScoreStat.exercise_id == exercise_id)
+            .order_by(ScoreStat.score)
+        )
+    ).all()
+
+    choices_by_item: Dict[UUID, Dict[int, int]] = defaultdict(dict)
+    for choice in choices:
+        choices_by_item[choice.item_id][choice.choice] = choice.count
+
+    submissions = sum(score.count for score in scores)
+    return ExerciseStats(
+        exercise_id=exercise_id,
+        submissions=submissions,
+        mean_score=(
+            sum(score.score * score.count for score in scores) / submissions
+            if submissions
+            else 0.0
+        ),
+        score_histogram={score.score: score.count for score in scores},
+        questions=[
+            QuestionStats(
+                item_id=question.item_id,
+                answered=question.answered,
+                correct=question.correct,
+                correct_rate=question.correct / question.answered,
+                choices=choices_by_item.get(question.item_id, {}),
+            )
+            for question in questions
+        ],
+    )
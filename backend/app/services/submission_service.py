@@ -0,0 +1,59 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from fastapi import HTTPException, status
+
+from app.core.config import (
+    SUBMISSION_FLUSH_BATCH_SIZE,
+    SUBMISSION_FLUSH_INTERVAL_SECONDS,
+    SUBMISSION_QUEUE_MAX_SIZE,
+)
+from app.core.db import async_engine
+from app.core.write_behind import QueueFull, WriteBehindQueue
+from app.models.submission import Submission
+from app.schemas.submission import SubmissionCreate, SubmissionReceipt
+from app.services.exercise_set_service import get_published_snapshot
+from app.services.stats_service import record_submission_stats
+
+# Started and drained by the application lifespan. Each batch also updates the
+# per-question statistics in its transaction.
+submission_queue = WriteBehindQueue(
+    "submissions",
+    Submission.__table__,
+    async_engine,
+    max_size=SUBMISSION_QUEUE_MAX_SIZE,
+    batch_size=SUBMISSION_FLUSH_BATCH_SIZE,
+    flush_interval=SUBMISSION_FLUSH_INTERVAL_SECONDS,
+    on_flush=record_submission_stats,
+)
+
+
+async def submit_answers(
+    access_code: str, submission_data: SubmissionCreate
+) -> SubmissionReceipt:
+    """
+    Accepts a learner's answers to a published set. The submission is queued
+    and written in a batch shortly afterwards, so the request does not wait
+    for (or hold) a database connection.
+    """
+    snapshot = await get_published_snapshot(access_code)
+
+    submission_id = uuid4()
+    try:
+        submission_queue.put(
+            {
+                "id": submission_id,
+                "exercise_set_id": snapshot.set_id,
+                "participant": submission_data.participant,
+                "answers": submission_data.answers,
+                "submitted_at": datetime.now(timezone.utc),
+            }
+        )
+    except QueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many submissions are waiting to be saved. Try again shortly.",
+            headers={"Retry-After": "1"},
+        )
+
+    return SubmissionReceipt(id=submission_id)
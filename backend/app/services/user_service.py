@@ -1,23 +1,32 @@
 from typing import Optional
 from fastapi import HTTPException
+from sqlalchemy import exc, func
 from sqlmodel import select
 from app.schemas.user import UserCreate, UserRead
-from app.api.deps import SessionDep
+from app.api.deps import AsyncSessionDep
 from app.models.user import User
-from app.core.security import hash_password
+from app.core.security import hash_password_async
+from app.services.availability_service import normalize, record_user
 
 
-def register_user(user_data: UserCreate, session: SessionDep) -> UserRead:
-    existing_user = session.exec(
-        select(User).where(
-            (User.email == user_data.email) | (User.username == user_data.username)
+async def register_user(user_data: UserCreate, session: AsyncSessionDep) -> UserRead:
+    existing_user = (
+        await session.exec(
+            select(User.id).where(
+                (func.lower(User.email) == normalize(user_data.email))
+                | (func.lower(User.username) == normalize(user_data.username))
+            )
         )
     ).first()
 
     if existing_user:
         raise HTTPException(status_code=400, detail="Username or email already taken.")
 
-    hashed_password = hash_password(user_data.password)
+    # End the read transaction so the pooled connection is not held while the
+    # password is hashed.
+    await session.commit()
+
+    hashed_password = await hash_password_async(user_data.password)
 
     new_user = User(
         username=user_data.username,
@@ -26,8 +35,14 @@ def register_user(user_data: UserCreate, session: SessionDep) -> UserRead:
     )
 
     session.add(new_user)
-    session.commit()
-    session.refresh(new_user)
+    try:
+        await session.commit()
+    except exc.IntegrityError:
+        # Someone took the name while the password was hashed; the unique
+        # lower() indexes catch that race.
+        await session.rollback()
+        raise HTTPException(status_code=400, detail="Username or email already taken.")
+    record_user(new_user.email, new_user.username)
 
     return UserRead(
         id=new_user.id,
@@ -37,5 +52,10 @@ def register_user(user_data: UserCreate, session: SessionDep) -> UserRead:
     )
 
 
-def get_user_by_email(email: str, session: SessionDep) -> Optional[User]:
-    return session.exec(select(User).where(User.email == email)).first()
+async def get_user_by_email(email: str, session: AsyncSessionDep) -> Optional[User]:
+    # Case-insensitive, like registration, so it uses ix_user_email_lower.
+    return (
+        await session.exec(
+            select(User).where(func.lower(User.email) == normalize(email))
+        )
+    ).first()
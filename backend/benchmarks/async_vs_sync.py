@@ -0,0 +1,72 @@
+"""
+Compares the sync (threadpool) and async (asyncpg) database paths for listing
+a user's exercises at a fixed concurrency.
+
+    python -m benchmarks.async_vs_sync --concurrency 64 --requests 2000
+"""
+
+import argparse
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db import async_engine, engine
+from app.models.exercise import Exercise
+from benchmarks.common import print_result, run_load, seed
+
+LOAD_OPTIONS = (
+    selectinload(Exercise.exercise_type),
+    selectinload(Exercise.fill_gap_sentences),
+    selectinload(Exercise.multiple_choice_questions),
+)
+
+
+def build_app(owner_id) -> FastAPI:
+    bench_app = FastAPI()
+    statement = select(Exercise).where(Exercise.owner_id == owner_id)
+
+    @bench_app.get("/sync")
+    def list_sync():
+        with Session(engine) as session:
+            return len(session.exec(statement.options(*LOAD_OPTIONS)).all())
+
+    @bench_app.get("/async")
+    async def list_async():
+        async with AsyncSession(async_engine) as session:
+            return len((await session.exec(statement.options(*LOAD_OPTIONS))).all())
+
+    return bench_app
+
+
+async def main(args: argparse.Namespace) -> None:
+    (user,) = seed(1, args.exercises, args.sentences)
+    transport = httpx.ASGITransport(app=build_app(user.id))
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        for path in ("/sync", "/async"):
+
+            async def request():
+                response = await client.get(path)
+                response.raise_for_status()
+
+            # Warm up the pools before measuring.
+            await run_load(request, args.concurrency, args.concurrency)
+            result = await run_load(request, args.concurrency, args.requests)
+            print_result(path, result)
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--exercises", type=int, default=20)
+    parser.add_argument("--sentences", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
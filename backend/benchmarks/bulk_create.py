@@ -0,0 +1,77 @@
+"""
+Measures round trips and latency of POST /exercises/ and
+POST /exercises/{id}/sentences against payload size.
+
+    python -m benchmarks.bulk_create --sizes 1 10 100 500 1000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from app.core.config import API_V1_STR
+from app.main import app, lifespan
+from benchmarks.common import auth_headers, count_statements, seed
+
+
+def fill_gap_sentences(size: int):
+    return [
+        {"sentence": f"Sentence {i} ___ here.", "correct_answer": "word"}
+        for i in range(size)
+    ]
+
+
+async def main(args: argparse.Namespace) -> None:
+    (user,) = seed(1, 0, 0)
+    headers = auth_headers(user)
+    transport = httpx.ASGITransport(app=app)
+
+    print(f"{'size':>6} {'endpoint':<12} {'statements':>10} {'mean ms':>10}")
+    async with lifespan(app), httpx.AsyncClient(
+        transport=transport, base_url=f"http://bench{API_V1_STR}", headers=headers
+    ) as client:
+        # Authenticate once outside the measurement so the user lookup is warm.
+        await client.get("/exercises/", params={"limit": 1})
+
+        for size in args.sizes:
+            payload = {
+                "title": f"Bulk {size}",
+                "type": "fill-gap",
+                "fill_gap_sentences": fill_gap_sentences(size),
+            }
+            timings, append_timings = [], []
+            for _ in range(args.repeat):
+                with count_statements() as create_statements:
+                    started = time.perf_counter()
+                    response = await client.post("/exercises/", json=payload)
+                    timings.append((time.perf_counter() - started) * 1000)
+                response.raise_for_status()
+
+                exercise_id = response.json()["id"]
+                with count_statements() as append_statements:
+                    started = time.perf_counter()
+                    response = await client.post(
+                        f"/exercises/{exercise_id}/sentences",
+                        json={"sentences": fill_gap_sentences(size)},
+                    )
+                    append_timings.append((time.perf_counter() - started) * 1000)
+                response.raise_for_status()
+
+            print(
+                f"{size:>6} {'create':<12} {len(create_statements):>10}"
+                f" {statistics.fmean(timings):>10.2f}"
+            )
+            print(
+                f"{size:>6} {'append':<12} {len(append_statements):>10}"
+                f" {statistics.fmean(append_timings):>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 500])
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,175 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks talk to whatever DATABASE_URL points at. For a quick local run
+without Postgres, use a SQLite file (requires ``aiosqlite`` for the async path):
+
+    DATABASE_URL=sqlite:///bench.db python -m benchmarks.async_vs_sync
+
+benchmarks.suite covers every API route and writes comparable JSON results.
+"""
+
+import asyncio
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, Iterator, List
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from app.core.db import async_engine, engine, init_db
+from app.core.security import hash_password
+from app.models.exercise import Exercise, ExerciseType
+from app.models.fill_gap_sentence import FillGapSentence
+from app.models.multiple_choice_question import MultipleChoiceQuestion
+from app.models.user import User
+from app.schemas.exercise import ExerciseType as ExerciseTypeSchema
+from app.services.auth_service import create_access_token
+
+BENCH_PASSWORD = "benchmark-password"
+
+
+def seed(
+    users: int, exercises_per_user: int, sentences_per_exercise: int
+) -> List[User]:
+    """
+    Creates the schema and inserts ``users`` users, each owning
+    ``exercises_per_user`` exercises alternating between fill-gap and
+    multiple-choice, each with ``sentences_per_exercise`` children.
+    """
+    init_db()
+    password_hash = hash_password(BENCH_PASSWORD)
+
+    with Session(engine) as session:
+        type_ids: Dict[str, UUID] = {
+            t.name: t.id for t in session.exec(select(ExerciseType)).all()
+        }
+        created = []
+        for u in range(users):
+            user = User(
+                username=f"bench-{u}-{time.time_ns()}",
+                email=f"bench-{u}-{time.time_ns()}@example.com",
+                password_hash=password_hash,
+            )
+            session.add(user)
+            created.append(user)
+            # Exercise has no relationship to User, so the flush would not
+            # order the user's insert before its exercises'.
+            session.flush()
+
+            for e in range(exercises_per_user):
+                is_fill_gap = e % 2 == 0
+                exercise = Exercise(
+                    owner_id=user.id,
+                    exercise_type_id=type_ids[
+                        (
+                            ExerciseTypeSchema.FILL_GAP.value
+                            if is_fill_gap
+                            else ExerciseTypeSchema.MULTIPLE_CHOICE.value
+                        )
+                    ],
+                    title=f"Exercise {e}",
+                    description="Seeded by the benchmark suite.",
+                )
+                session.add(exercise)
+                for s in range(sentences_per_exercise):
+                    if is_fill_gap:
+                        session.add(
+                            FillGapSentence(
+                                exercise_id=exercise.id,
+                                sentence=f"Sentence {s} ___ here.",
+                                correct_answer="word",
+                            )
+                        )
+                    else:
+                        session.add(
+                            MultipleChoiceQuestion(
+                                exercise_id=exercise.id,
+                                question=f"Question {s}?",
+                                choices=["a", "b", "c", "d"],
+                                correct_index=s % 4,
+                            )
+                        )
+        session.commit()
+        for user in created:
+            session.refresh(user)
+            session.expunge(user)
+    return created
+
+
+def auth_headers(user: User) -> Dict[str, str]:
+    token = create_access_token({"sub": str(user.id)}, timedelta(hours=1))
+    return {"Authorization": f"Bearer {token}"}
+
+
+@contextmanager
+def count_statements() -> Iterator[List[str]]:
+    """
+    Collects every SQL statement sent through the sync and async engines while
+    active. Each statement is one round trip to the database.
+    """
+    statements: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engines = (engine, async_engine.sync_engine)
+    for target in engines:
+        event.listen(target, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", before_cursor_execute)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def run_load(
+    request: Callable[[], Awaitable[None]], concurrency: int, total_requests: int
+) -> Dict[str, float]:
+    """
+    Calls ``request`` ``total_requests`` times from ``concurrency`` concurrent
+    workers and returns throughput and latency percentiles (milliseconds).
+    """
+    latencies: List[float] = []
+    remaining = total_requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            await request()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "requests_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "mean_ms": statistics.fmean(latencies) if latencies else 0.0,
+    }
+
+
+def print_result(name: str, result: Dict[str, float]) -> None:
+    print(
+        f"{name:<24} {result['requests_per_sec']:>10.1f} req/s"
+        f"  p50 {result['p50_ms']:>8.2f} ms"
+        f"  p99 {result['p99_ms']:>8.2f} ms"
+    )
@@ -0,0 +1,113 @@
+"""
+Measures answers graded per second by grading_service.grade_submissions for
+multiple-choice and fill-gap exercises, with and without an edit-distance
+tolerance. Each batch is a class of submissions answering every item, about
+half of them correctly. Runs without a database.
+
+    python -m benchmarks.grading --submissions 100 1000 5000 --items 40
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Dict, List
+from uuid import uuid4
+
+import app.core.exercise_types as exercise_types
+from app.core.exercise_types import ExerciseTypeRegistry
+from app.models.exercise import Exercise as ExerciseModel
+from app.models.fill_gap_sentence import FillGapSentence
+from app.models.multiple_choice_question import MultipleChoiceQuestion
+from app.schemas.exercise import ExerciseType
+from app.schemas.grading import GradingOptions
+from app.services.grading_service import compile_answer_key, grade_submissions
+
+WORDS = ["read", "went", "beautiful", "children", "would have been", "thought"]
+
+
+def build_exercise(exercise_type: ExerciseType, items: int) -> ExerciseModel:
+    exercise = ExerciseModel(
+        id=uuid4(),
+        owner_id=uuid4(),
+        exercise_type_id=exercise_types.get_exercise_type_registry().id_for(
+            exercise_type.value
+        ),
+        title="Grading benchmark",
+    )
+    exercise.fill_gap_sentences = []
+    exercise.multiple_choice_questions = []
+    if exercise_type == ExerciseType.MULTIPLE_CHOICE:
+        exercise.multiple_choice_questions = [
+            MultipleChoiceQuestion(
+                id=uuid4(),
+                question=f"Question {i}",
+                choices=["a", "b", "c", "d"],
+                correct_index=i % 4,
+            )
+            for i in range(items)
+        ]
+    else:
+        exercise.fill_gap_sentences = [
+            FillGapSentence(
+                id=uuid4(), sentence=f"Sentence {i} ___.", correct_answer=WORDS[i % 6]
+            )
+            for i in range(items)
+        ]
+    return exercise
+
+
+def build_submissions(
+    exercise: ExerciseModel, count: int, rng: random.Random
+) -> List[Dict[str, Any]]:
+    submissions = []
+    for _ in range(count):
+        answers: Dict[str, Any] = {}
+        for q in exercise.multiple_choice_questions:
+            answers[str(q.id)] = q.correct_index if rng.random() < 0.5 else 3
+        for s in exercise.fill_gap_sentences:
+            answer = s.correct_answer
+            if rng.random() < 0.5:
+                # A typo, or a different word altogether.
+                answer = answer[:-1] if rng.random() < 0.5 else rng.choice(WORDS)
+            answers[str(s.id)] = answer.upper() if rng.random() < 0.2 else answer
+        submissions.append(answers)
+    return submissions
+
+
+def main(args: argparse.Namespace) -> None:
+    exercise_types._registry = ExerciseTypeRegistry(
+        [(uuid4(), t.value) for t in ExerciseType]
+    )
+    rng = random.Random(0)
+    cases = [
+        (ExerciseType.MULTIPLE_CHOICE, GradingOptions()),
+        (ExerciseType.FILL_GAP, GradingOptions()),
+        (ExerciseType.FILL_GAP, GradingOptions(max_edit_distance=1)),
+    ]
+
+    print(
+        f"{'type':<16} {'tolerance':>9} {'submissions':>11} "
+        f"{'answers/s':>12} {'ms/batch':>9}"
+    )
+    for exercise_type, options in cases:
+        exercise = build_exercise(exercise_type, args.items)
+        key = compile_answer_key(exercise, options)
+        for count in args.submissions:
+            submissions = build_submissions(exercise, count, rng)
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                grade_submissions(key, submissions, options)
+            elapsed = (time.perf_counter() - started) / args.repeat
+            print(
+                f"{exercise_type.value:<16} {options.max_edit_distance:>9} "
+                f"{count:>11} {count * args.items / elapsed:>12,.0f} "
+                f"{elapsed * 1000:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--submissions", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--items", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
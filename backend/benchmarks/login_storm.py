@@ -0,0 +1,76 @@
+"""
+Measures GET /exercises/ latency on its own and while a storm of concurrent
+logins is running, to check that password hashing does not starve the other
+endpoints.
+
+    python -m benchmarks.login_storm --logins 200 --login-concurrency 32
+"""
+
+import argparse
+import asyncio
+
+import httpx
+
+from app.core.config import API_V1_STR
+from app.main import app, lifespan
+from benchmarks.common import (
+    BENCH_PASSWORD,
+    auth_headers,
+    print_result,
+    run_load,
+    seed,
+)
+
+
+async def main(args: argparse.Namespace) -> None:
+    (user,) = seed(1, args.exercises, args.sentences)
+    transport = httpx.ASGITransport(app=app)
+
+    async with lifespan(app), httpx.AsyncClient(
+        transport=transport, base_url=f"http://bench{API_V1_STR}"
+    ) as client:
+        headers = auth_headers(user)
+
+        async def list_exercises():
+            response = await client.get("/exercises/", headers=headers)
+            response.raise_for_status()
+
+        rejected = 0
+
+        async def login():
+            nonlocal rejected
+            response = await client.post(
+                "/auth/login",
+                data={"username": user.email, "password": BENCH_PASSWORD},
+            )
+            if response.status_code == 503:
+                rejected += 1
+            else:
+                response.raise_for_status()
+
+        # Warm up the database pool and the password worker processes.
+        await run_load(list_exercises, args.concurrency, args.concurrency)
+        await login()
+
+        quiet = await run_load(list_exercises, args.concurrency, args.requests)
+        print_result("exercises (quiet)", quiet)
+
+        storm = asyncio.create_task(
+            run_load(login, args.login_concurrency, args.logins)
+        )
+        await asyncio.sleep(0.1)
+        during = await run_load(list_exercises, args.concurrency, args.requests)
+        print_result("exercises (storm)", during)
+        print_result("logins", await storm)
+        print(f"logins rejected with 503: {rejected}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--login-concurrency", type=int, default=32)
+    parser.add_argument("--exercises", type=int, default=10)
+    parser.add_argument("--sentences", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,85 @@
+"""
+Measures query latency of the in-memory search index used on SQLite: seeds
+one owner's library with generated sentences (words drawn from a Zipf-like
+vocabulary, so some words are very common) and times rare, common,
+multi-word and misspelled queries. Runs without a database.
+
+    python -m benchmarks.search --sentences 100000 1000000
+"""
+
+import argparse
+import itertools
+import random
+import statistics
+import string
+import time
+from uuid import uuid4
+
+from app.core.config import SEARCH_PAGE_DEFAULT_LIMIT, SEARCH_SIMILARITY_THRESHOLD
+from app.services.search_service import OwnerSearchIndex, add_exercise, add_sentence
+
+
+def build_vocabulary(size: int, rng: random.Random):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))))
+    return sorted(words)
+
+
+def build_index(sentences: int, vocabulary, rng: random.Random) -> OwnerSearchIndex:
+    index = OwnerSearchIndex()
+    cum_weights = list(
+        itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary)))
+    )
+    exercise_id = None
+    for i in range(sentences):
+        if i % 20 == 0:
+            exercise_id = uuid4()
+            add_exercise(index, exercise_id, " ".join(rng.sample(vocabulary, 3)), None)
+        words = rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(6, 14))
+        add_sentence(index, exercise_id, uuid4(), " ".join(words) + " ___.")
+    return index
+
+
+def main(args: argparse.Namespace) -> None:
+    rng = random.Random(0)
+    vocabulary = build_vocabulary(args.vocabulary, rng)
+    queries = {
+        "rare word": vocabulary[-1],
+        "mid word": vocabulary[len(vocabulary) // 10],
+        "common word": vocabulary[0],
+        "two words": f"{vocabulary[50]} {vocabulary[500]}",
+        "common pair": f"{vocabulary[0]} {vocabulary[1]}",
+        "misspelled": vocabulary[200][:-1],
+    }
+
+    print(f"{'sentences':>10} {'query':<12} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for count in args.sentences:
+        started = time.perf_counter()
+        index = build_index(count, vocabulary, rng)
+        print(
+            f"{count:>10} {'(build)':<12} {(time.perf_counter() - started) * 1000:>8.0f}"
+        )
+        for name, query in queries.items():
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                index.search(
+                    query, SEARCH_SIMILARITY_THRESHOLD, SEARCH_PAGE_DEFAULT_LIMIT
+                )
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            print(
+                f"{count:>10} {name:<12} {statistics.median(timings):>8.2f} "
+                f"{timings[int(len(timings) * 0.95) - 1]:>8.2f} {timings[-1]:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sentences", type=int, nargs="+", default=[100_000, 1_000_000]
+    )
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    main(parser.parse_args())
@@ -0,0 +1,86 @@
+"""
+Compares the per-exercise cost of the pydantic response path (ORM model ->
+schema objects -> response_model validation -> JSON) with the single-pass
+orjson path used by the read routes, for increasing sentence counts. Runs
+without a database.
+
+    python -m benchmarks.serialization --sentences 1 10 100 1000
+"""
+
+import argparse
+import time
+from typing import List
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+import app.core.exercise_types as exercise_types
+from app.core.exercise_types import ExerciseTypeRegistry
+from app.models.exercise import Exercise as ExerciseModel
+from app.models.fill_gap_sentence import FillGapSentence
+from app.schemas.exercise import Exercise, ExerciseType
+from app.services.exercise_service import dump_exercises_json, to_exercise_schema
+
+ExerciseListAdapter = TypeAdapter(List[Exercise])
+
+
+def build_exercises(count: int, sentences: int) -> List[ExerciseModel]:
+    type_id = exercise_types.get_exercise_type_registry().id_for(
+        ExerciseType.FILL_GAP.value
+    )
+    exercises = []
+    for e in range(count):
+        exercise = ExerciseModel(
+            id=uuid4(),
+            owner_id=uuid4(),
+            exercise_type_id=type_id,
+            title=f"Exercise {e}",
+            description="Serialization benchmark",
+        )
+        exercise.fill_gap_sentences = [
+            FillGapSentence(
+                id=uuid4(), sentence=f"Sentence {s} ___.", correct_answer="word"
+            )
+            for s in range(sentences)
+        ]
+        exercise.multiple_choice_questions = []
+        exercises.append(exercise)
+    return exercises
+
+
+def pydantic_path(models: List[ExerciseModel]) -> bytes:
+    # What FastAPI does for response_model=List[Exercise] with schema objects.
+    schemas = [to_exercise_schema(model) for model in models]
+    validated = ExerciseListAdapter.validate_python(jsonable_encoder(schemas))
+    return ExerciseListAdapter.dump_json(validated)
+
+
+def timed(func, models, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(models)
+    return (time.perf_counter() - started) / (repeat * len(models)) * 1e6
+
+
+def main(args: argparse.Namespace) -> None:
+    exercise_types._registry = ExerciseTypeRegistry(
+        [(uuid4(), t.value) for t in ExerciseType]
+    )
+
+    print(
+        f"{'sentences':>9} {'pydantic us/ex':>15} {'orjson us/ex':>13} {'speedup':>8}"
+    )
+    for sentences in args.sentences:
+        models = build_exercises(args.exercises, sentences)
+        slow = timed(pydantic_path, models, args.repeat)
+        fast = timed(dump_exercises_json, models, args.repeat)
+        print(f"{sentences:>9} {slow:>15.1f} {fast:>13.1f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sentences", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--exercises", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
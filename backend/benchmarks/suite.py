@@ -0,0 +1,374 @@
+"""
+Load-test suite covering every API route.
+
+Seeds the database configured by DATABASE_URL, then drives the app either
+in-process (ASGI transport) or over HTTP (a uvicorn server started in this
+process), at each requested concurrency level. For every route it reports
+throughput, p50/p95/p99 latency and SQL statements per request, and can save
+the results as JSON and compare them with a previous run:
+
+    python -m benchmarks.suite --mode inprocess http --concurrency 1 16 64 \\
+        --output results.json --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import time
+from contextlib import asynccontextmanager
+from itertools import count
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+import uvicorn
+from sqlmodel import Session, select
+
+from app.core.config import API_V1_STR
+from app.core.db import engine
+from app.main import app, lifespan
+from app.models.exercise import Exercise
+from app.models.user import User
+from benchmarks.common import (
+    BENCH_PASSWORD,
+    auth_headers,
+    count_statements,
+    run_load,
+    seed,
+)
+
+
+class Scenario:
+    """One route under load. ``build`` returns the kwargs of the next request."""
+
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        build: Callable[[], Dict[str, Any]],
+        requests_factor: float = 1.0,
+    ):
+        self.name = name
+        self.method = method
+        self.build = build
+        self.requests_factor = requests_factor
+
+
+def owned_exercise_ids(user: User) -> List[str]:
+    with Session(engine) as session:
+        ids = session.exec(select(Exercise.id).where(Exercise.owner_id == user.id))
+        return [str(exercise_id) for exercise_id in ids]
+
+
+def build_scenarios(users: List[User]) -> List[Scenario]:
+    user = users[0]
+    headers = auth_headers(user)
+    exercise_ids = owned_exercise_ids(user)
+    # Exercises consumed by the delete scenario are created up front, owned by
+    # the dedicated user that main() appends last.
+    deletable_ids = owned_exercise_ids(users[-1]) if len(users) > 1 else []
+    delete_headers = auth_headers(users[-1]) if len(users) > 1 else headers
+    sequence = count()
+
+    def nth(items: List[str]) -> str:
+        return items[next(sequence) % len(items)]
+
+    scenarios = [
+        Scenario(
+            "GET /exercises/",
+            "GET",
+            lambda: {"url": "/exercises/", "headers": headers},
+        ),
+        Scenario(
+            "GET /exercises/search",
+            "GET",
+            lambda: {
+                "url": "/exercises/search",
+                "headers": headers,
+                "params": {"q": f"sentence {next(sequence) % 10} here"},
+            },
+        ),
+        Scenario(
+            "GET /exercises/{id}",
+            "GET",
+            lambda: {"url": f"/exercises/{nth(exercise_ids)}", "headers": headers},
+        ),
+        Scenario(
+            "POST /exercises/",
+            "POST",
+            lambda: {
+                "url": "/exercises/",
+                "headers": headers,
+                "json": {
+                    "title": "Benchmark",
+                    "type": "fill-gap",
+                    "fill_gap_sentences": [
+                        {"sentence": "I ___ a book.", "correct_answer": "read"}
+                    ]
+                    * 10,
+                },
+            },
+        ),
+        Scenario(
+            "PUT /exercises/{id}",
+            "PUT",
+            lambda: {
+                "url": f"/exercises/{nth(exercise_ids)}",
+                "headers": headers,
+                "json": {"description": f"Updated {time.time_ns()}"},
+            },
+        ),
+        Scenario(
+            "PUT /exercises/{id}?include_items",
+            "PUT",
+            lambda: {
+                "url": f"/exercises/{nth(exercise_ids)}",
+                "params": {"include_items": "true"},
+                "headers": headers,
+                "json": {"description": f"Updated {time.time_ns()}"},
+            },
+        ),
+        Scenario(
+            "POST /exercises/{id}/sentences",
+            "POST",
+            lambda: {
+                "url": f"/exercises/{exercise_ids[0]}/sentences",
+                "headers": headers,
+                "json": {
+                    "sentences": [
+                        {"sentence": "She ___ home.", "correct_answer": "went"}
+                    ]
+                },
+            },
+        ),
+        Scenario(
+            "POST /auth/login",
+            "POST",
+            lambda: {
+                "url": "/auth/login",
+                "data": {"username": user.email, "password": BENCH_PASSWORD},
+            },
+            # bcrypt makes logins orders of magnitude slower than other routes.
+            requests_factor=0.05,
+        ),
+        Scenario(
+            "GET /validate/email",
+            "GET",
+            lambda: {
+                "url": "/validate/email",
+                "params": {"email": f"free-{next(sequence)}@example.com"},
+            },
+        ),
+        Scenario(
+            "GET /validate/username",
+            "GET",
+            lambda: {
+                "url": "/validate/username",
+                "params": {"username": user.username},
+            },
+        ),
+        Scenario(
+            "POST /validate/batch",
+            "POST",
+            lambda: {
+                "url": "/validate/batch",
+                "json": {
+                    "emails": [user.email, f"free-{next(sequence)}@example.com"],
+                    "usernames": [user.username, f"free-{next(sequence)}"],
+                },
+            },
+        ),
+    ]
+    if deletable_ids:
+        scenarios.append(
+            Scenario(
+                "DELETE /exercises/{id}",
+                "DELETE",
+                lambda: {
+                    "url": f"/exercises/{deletable_ids.pop()}",
+                    "headers": delete_headers,
+                },
+                requests_factor=0,
+            )
+        )
+    return scenarios
+
+
+@asynccontextmanager
+async def http_server(port: int):
+    server = uvicorn.Server(
+        uvicorn.Config(
+            app,
+            host="127.0.0.1",
+            port=port,
+            log_level="warning",
+            # The suite already runs the app lifespan around both modes.
+            lifespan="off",
+        )
+    )
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    try:
+        yield f"http://127.0.0.1:{port}{API_V1_STR}"
+    finally:
+        server.should_exit = True
+        await task
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    concurrency: int,
+    total_requests: int,
+) -> Dict[str, Any]:
+    errors = 0
+
+    async def request():
+        nonlocal errors
+        response = await client.request(scenario.method, **scenario.build())
+        if response.status_code >= 400:
+            errors += 1
+
+    with count_statements() as statements:
+        result = await run_load(request, concurrency, total_requests)
+
+    result.update(
+        route=scenario.name,
+        errors=errors,
+        statements_per_request=(
+            len(statements) / result["requests"] if result["requests"] else 0.0
+        ),
+    )
+    return result
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = {
+            (r["mode"], r["route"], r["concurrency"]): r
+            for r in json.load(f)["results"]
+        }
+
+    print(f"\nCompared with {baseline_path}:")
+    for result in results:
+        before = baseline.get((result["mode"], result["route"], result["concurrency"]))
+        if before is None:
+            continue
+        rps = result["requests_per_sec"] / before["requests_per_sec"] - 1
+        p99 = result["p99_ms"] / before["p99_ms"] - 1 if before["p99_ms"] else 0.0
+        statements = result["statements_per_request"] - before["statements_per_request"]
+        print(
+            f"{result['mode']:<10} {result['route']:<32} c={result['concurrency']:<4}"
+            f" req/s {rps:>+7.1%}  p99 {p99:>+7.1%}  statements {statements:>+5.2f}"
+        )
+
+
+def print_row(result: Dict[str, Any]) -> None:
+    print(
+        f"{result['mode']:<10} {result['route']:<32} c={result['concurrency']:<4}"
+        f" {result['requests_per_sec']:>9.1f} req/s"
+        f"  p50 {result['p50_ms']:>8.2f}  p95 {result['p95_ms']:>8.2f}"
+        f"  p99 {result['p99_ms']:>8.2f} ms"
+        f"  {result['statements_per_request']:>5.2f} stmt/req"
+        f"  {result['errors']} errors"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    # The delete scenario needs a second user whose exercises it can consume.
+    # Each concurrency level also spends one request per worker on warm-up.
+    deletions = sum(max(args.requests, c) + c for c in args.concurrency) * len(
+        args.mode
+    )
+    users = seed(args.users, args.exercises, args.sentences)
+    users.append(seed(1, deletions, 1)[0])
+
+    results: List[Dict[str, Any]] = []
+    async with lifespan(app):
+        scenarios = [
+            s
+            for s in build_scenarios(users)
+            if not args.routes or any(r in s.name for r in args.routes)
+        ]
+        for mode in args.mode:
+            if mode == "http":
+                server = http_server(args.port)
+                base_url = await server.__aenter__()
+                transport = None
+            else:
+                server = None
+                base_url = f"http://bench{API_V1_STR}"
+                transport = httpx.ASGITransport(app=app)
+
+            limits = httpx.Limits(max_connections=max(args.concurrency))
+            async with httpx.AsyncClient(
+                transport=transport, base_url=base_url, limits=limits, timeout=60
+            ) as client:
+                for scenario in scenarios:
+                    for concurrency in args.concurrency:
+                        total = max(
+                            concurrency,
+                            int(args.requests * scenario.requests_factor)
+                            or args.requests,
+                        )
+                        # Warm up caches and pools before measuring.
+                        await run_scenario(client, scenario, concurrency, concurrency)
+                        result = await run_scenario(
+                            client, scenario, concurrency, total
+                        )
+                        result["mode"] = mode
+                        results.append(result)
+                        print_row(result)
+
+            if server is not None:
+                await server.__aexit__(None, None, None)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "revision": git_revision(),
+                    "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                    "database": engine.dialect.name,
+                    "parameters": vars(args),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"\nSaved results to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--exercises", type=int, default=50)
+    parser.add_argument("--sentences", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument(
+        "--mode", nargs="+", choices=["inprocess", "http"], default=["inprocess"]
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--routes", nargs="*", help="Only run routes containing these")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Compare with a previous JSON result file")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,116 @@
+"""
+Measures throughput of POST /exercises/import and GET /exercises/export in
+rows per second. The import body is generated and sent in chunks while it is
+being produced, so neither side holds the whole file.
+
+    python -m benchmarks.transfer --rows 10000 100000 --format ndjson csv
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import time
+from typing import AsyncIterator
+
+import httpx
+import orjson
+
+from app.core.config import API_V1_STR
+from app.main import app, lifespan
+from app.services.exercise_transfer_service import TRANSFER_COLUMNS
+from benchmarks.common import auth_headers, seed
+
+ROWS_PER_EXERCISE = 20
+ROWS_PER_CHUNK = 500
+
+
+def generate_rows(count: int, prefix: str):
+    for i in range(count):
+        exercise = i // ROWS_PER_EXERCISE
+        row = {"exercise": f"{prefix}-{exercise}"}
+        if i % ROWS_PER_EXERCISE == 0:
+            row["title"] = f"Imported {exercise}"
+            row["type"] = "fill-gap" if exercise % 2 == 0 else "multiple-choice"
+        if exercise % 2 == 0:
+            row["sentence"] = f"Sentence {i} ___ here."
+            row["correct_answer"] = "word"
+        else:
+            row["question"] = f"Question {i}?"
+            row["choices"] = ["yes", "no", "maybe"]
+            row["correct_index"] = i % 3
+        yield row
+
+
+async def import_body(
+    count: int, prefix: str, transfer_format: str
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, TRANSFER_COLUMNS, lineterminator="\n")
+    if transfer_format == "csv":
+        writer.writeheader()
+    for i, row in enumerate(generate_rows(count, prefix), start=1):
+        if transfer_format == "csv":
+            if "choices" in row:
+                row["choices"] = "|".join(row["choices"])
+            writer.writerow(row)
+        else:
+            buffer.write(orjson.dumps(row).decode())
+            buffer.write("\n")
+        if i % ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+async def main(args: argparse.Namespace) -> None:
+    print(f"{'rows':>8} {'format':<7} {'direction':<9} {'seconds':>8} {'rows/s':>10}")
+    async with lifespan(app):
+        for count in args.rows:
+            for transfer_format in args.format:
+                # A fresh user per run, so the export covers exactly one import.
+                (user,) = seed(1, 0, 0)
+                async with httpx.AsyncClient(
+                    transport=httpx.ASGITransport(app=app),
+                    base_url=f"http://bench{API_V1_STR}",
+                    headers=auth_headers(user),
+                    timeout=None,
+                ) as client:
+                    started = time.perf_counter()
+                    response = await client.post(
+                        "/exercises/import",
+                        params={"format": transfer_format},
+                        content=import_body(count, "bench", transfer_format),
+                    )
+                    elapsed = time.perf_counter() - started
+                    response.raise_for_status()
+                    assert response.json()["imported"] == count, response.json()
+                    print(
+                        f"{count:>8} {transfer_format:<7} {'import':<9}"
+                        f" {elapsed:>8.2f} {count / elapsed:>10.0f}"
+                    )
+
+                    started = time.perf_counter()
+                    exported = 0
+                    async with client.stream(
+                        "GET", "/exercises/export", params={"format": transfer_format}
+                    ) as response:
+                        async for line in response.aiter_lines():
+                            exported += bool(line)
+                    elapsed = time.perf_counter() - started
+                    if transfer_format == "csv":
+                        exported -= 1  # header
+                    print(
+                        f"{exported:>8} {transfer_format:<7} {'export':<9}"
+                        f" {elapsed:>8.2f} {exported / elapsed:>10.0f}"
+                    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument(
+        "--format", nargs="+", choices=["ndjson", "csv"], default=["ndjson", "csv"]
+    )
+    asyncio.run(main(parser.parse_args()))
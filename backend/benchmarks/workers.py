@@ -0,0 +1,131 @@
+"""
+Measures how throughput of the production server (gunicorn.conf.py) scales
+with the number of worker processes. For each worker count a server is
+started on DATABASE_URL, which must be a database the workers can share
+(Postgres or a SQLite file), and loaded with GET /exercises/{id}.
+
+The load is generated by ``--clients`` separate processes so that the client
+does not become the bottleneck before the server does.
+
+    python -m benchmarks.workers --workers 1 2 4 8 --requests 20000
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import httpx
+
+from app.core.config import API_V1_STR
+from benchmarks.common import auth_headers, percentile, run_load, seed
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "-c",
+            "gunicorn.conf.py",
+            "--workers",
+            str(workers),
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--log-level",
+            "warning",
+            "app.main:app",
+        ],
+        cwd=BACKEND_DIR,
+    )
+
+
+def wait_until_ready(base_url: str, timeout: float = 60) -> float:
+    """Returns seconds until the server answers, i.e. its startup time."""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            httpx.get(f"{base_url}/openapi.json", timeout=1)
+            return time.perf_counter() - started
+        except httpx.TransportError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Server at {base_url} did not start in {timeout}s.")
+
+
+def client_process(
+    url: str, headers: Dict[str, str], concurrency: int, requests: int
+) -> Dict[str, float]:
+    async def load():
+        limits = httpx.Limits(max_connections=concurrency)
+        async with httpx.AsyncClient(
+            headers=headers, limits=limits, timeout=60
+        ) as client:
+
+            async def request():
+                (await client.get(url)).raise_for_status()
+
+            return await run_load(request, concurrency, requests)
+
+    return asyncio.run(load())
+
+
+def main(args: argparse.Namespace) -> None:
+    (user,) = seed(1, 1, 20)
+    headers = auth_headers(user)
+    print(
+        f"{'workers':>7} {'startup s':>9} {'req/s':>10} {'p50 ms':>8} "
+        f"{'p99 ms':>8} {'speedup':>8}"
+    )
+
+    baseline = None
+    for workers in args.workers:
+        base_url = f"http://127.0.0.1:{args.port}{API_V1_STR}"
+        server = start_server(workers, args.port)
+        try:
+            startup = wait_until_ready(f"http://127.0.0.1:{args.port}")
+            exercise_id = httpx.get(
+                f"{base_url}/exercises/", params={"limit": 1}, headers=headers
+            ).json()[0]["id"]
+            url = f"{base_url}/exercises/{exercise_id}"
+
+            with ProcessPoolExecutor(args.clients) as pool:
+                results: List[Dict[str, float]] = list(
+                    pool.map(
+                        client_process,
+                        [url] * args.clients,
+                        [headers] * args.clients,
+                        [args.concurrency // args.clients] * args.clients,
+                        [args.requests // args.clients] * args.clients,
+                    )
+                )
+        finally:
+            server.terminate()
+            server.wait()
+
+        throughput = sum(result["requests_per_sec"] for result in results)
+        baseline = baseline or throughput
+        print(
+            f"{workers:>7} {startup:>9.2f} {throughput:>10.1f}"
+            f" {percentile([r['p50_ms'] for r in results], 50):>8.2f}"
+            f" {max(r['p99_ms'] for r in results):>8.2f}"
+            f" {throughput / baseline:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, os.cpu_count() or 1]
+    )
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--port", type=int, default=8765)
+    main(parser.parse_args())
@@ -0,0 +1,33 @@
+"""
+Production server: gunicorn managing one uvicorn worker per CPU core.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+The app is imported once in the master and forked into the workers
+(preload_app), so each worker starts with the code already loaded. The
+master creates the schema and seed data under the bootstrap lock before
+forking; the workers' lifespans skip that step.
+"""
+
+import multiprocessing
+import os
+
+# Read by app.core.db when the app is preloaded, so it must be set first.
+os.environ.setdefault("DB_BOOTSTRAP_ON_STARTUP", "false")
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+# WEB_CONCURRENCY overrides the worker count, e.g. to leave cores free.
+workers = int(os.getenv("WEB_CONCURRENCY", 0)) or multiprocessing.cpu_count()
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("WORKER_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("WORKER_GRACEFUL_TIMEOUT", 30))
+keepalive = 5
+
+
+def on_starting(server):
+    from app.core.db import engine, init_db
+
+    init_db()
+    # The forked workers must not inherit the master's open connections.
+    engine.dispose()
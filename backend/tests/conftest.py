@@ -0,0 +1,216 @@
+"""
+The tests run the app in-process against a throwaway database (a temporary
+SQLite file, or the empty database TEST_DATABASE_URL points at) with query
+budgets enforced. Both are set before anything imports app.core.
+
+    cd backend && python -m pytest -q
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterator, List
+
+import pytest
+
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL") or (
+    "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="backend-tests-"), "test.db")
+)
+# Any service function that runs more statements than it declares fails.
+os.environ["QUERY_BUDGET_MODE"] = "raise"
+# Hashing at the production cost would dominate the run time. One round above
+# bcrypt's minimum leaves room for an outdated hash.
+os.environ.setdefault("PASSWORD_BCRYPT_ROUNDS", "5")
+
+import httpx  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlmodel import Session, select  # noqa: E402
+
+from app.core.config import API_V1_STR  # noqa: E402
+from app.core.db import async_engine, engine  # noqa: E402
+from app.core.security import hash_password  # noqa: E402
+from app.main import app, lifespan  # noqa: E402
+from app.models.exercise import Exercise, ExerciseType  # noqa: E402
+from app.models.fill_gap_sentence import FillGapSentence  # noqa: E402
+from app.models.multiple_choice_question import MultipleChoiceQuestion  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.exercise import ExerciseType as ExerciseTypeSchema  # noqa: E402
+from app.services.auth_service import create_access_token  # noqa: E402
+from app.services.submission_service import submission_queue  # noqa: E402
+
+Run = Callable[[Awaitable[Any]], Any]
+
+TEST_PASSWORD = "test-password"
+
+
+def create_users(
+    users: int, exercises_per_user: int, items_per_exercise: int
+) -> List[User]:
+    """
+    Inserts ``users`` users, each owning ``exercises_per_user`` exercises
+    alternating between fill-gap and multiple-choice, each with
+    ``items_per_exercise`` sentences or questions.
+    """
+    password_hash = hash_password(TEST_PASSWORD)
+    with Session(engine) as session:
+        type_ids = {t.name: t.id for t in session.exec(select(ExerciseType)).all()}
+        created = []
+        for u in range(users):
+            unique = f"{u}-{time.time_ns()}"
+            user = User(
+                username=f"user-{unique}",
+                email=f"user-{unique}@example.com",
+                password_hash=password_hash,
+            )
+            session.add(user)
+            created.append(user)
+            # Exercise has no relationship to User, so the flush would not
+            # order the user's insert before its exercises'.
+            session.flush()
+
+            for e in range(exercises_per_user):
+                fill_gap = e % 2 == 0
+                exercise_type = (
+                    ExerciseTypeSchema.FILL_GAP
+                    if fill_gap
+                    else ExerciseTypeSchema.MULTIPLE_CHOICE
+                )
+                exercise = Exercise(
+                    owner_id=user.id,
+                    exercise_type_id=type_ids[exercise_type.value],
+                    title=f"Exercise {e}",
+                    description="Created by the tests.",
+                )
+                session.add(exercise)
+                for i in range(items_per_exercise):
+                    if fill_gap:
+                        item = FillGapSentence(
+                            exercise_id=exercise.id,
+                            sentence=f"Sentence {i} ___ here.",
+                            correct_answer="word",
+                        )
+                    else:
+                        item = MultipleChoiceQuestion(
+                            exercise_id=exercise.id,
+                            question=f"Question {i}?",
+                            choices=["a", "b", "c", "d"],
+                            correct_index=i % 4,
+                        )
+                    session.add(item)
+        session.commit()
+        for user in created:
+            session.refresh(user)
+            session.expunge(user)
+    return created
+
+
+def auth_headers(user: User) -> Dict[str, str]:
+    token = create_access_token({"sub": str(user.id)}, timedelta(hours=1))
+    return {"Authorization": f"Bearer {token}"}
+
+
+@contextmanager
+def recording_statements() -> Iterator[List[str]]:
+    """Collects every statement sent through either engine while active."""
+    statements: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engines = (engine, async_engine.sync_engine)
+    for target in engines:
+        event.listen(target, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture(scope="session")
+def run() -> Iterator[Run]:
+    """
+    Runs a coroutine on the event loop the app was started on; the engine's
+    pooled connections belong to that loop.
+    """
+    loop = asyncio.new_event_loop()
+    context = lifespan(app)
+    loop.run_until_complete(context.__aenter__())
+    try:
+        yield loop.run_until_complete
+    finally:
+        loop.run_until_complete(context.__aexit__(None, None, None))
+        loop.close()
+
+
+@pytest.fixture
+def seed(run: Run) -> Callable[..., List[User]]:
+    return create_users
+
+
+@pytest.fixture
+def headers_for() -> Callable[[User], Dict[str, str]]:
+    """Bearer token headers for a user made with ``seed``."""
+    return auth_headers
+
+
+@pytest.fixture
+def count_statements() -> Callable[[], Any]:
+    return recording_statements
+
+
+@pytest.fixture
+def owner(run: Run) -> Dict[str, Any]:
+    """A new user owning a fill-gap and a multiple-choice exercise."""
+    (user,) = create_users(1, 2, 3)
+    return {"user": user, "headers": auth_headers(user), "password": TEST_PASSWORD}
+
+
+@pytest.fixture
+def api(run: Run, owner: Dict[str, Any]) -> Iterator[httpx.AsyncClient]:
+    """A client for the app, authenticated as ``owner``."""
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url=f"http://tests{API_V1_STR}",
+        headers=owner["headers"],
+    )
+    yield client
+    run(client.aclose())
+
+
+@pytest.fixture
+def publish_set(run: Run, api: httpx.AsyncClient) -> Callable[[str], Dict[str, Any]]:
+    """Publishes a set of the given type holding all of ``owner``'s exercises."""
+
+    def publish(set_type: str) -> Dict[str, Any]:
+        exercises = run(api.get("/exercises/")).json()
+        created = run(
+            api.post(
+                "/exercise-sets/",
+                json={
+                    "title": f"A {set_type} set",
+                    "set_type": set_type,
+                    "exercise_ids": [exercise["id"] for exercise in exercises],
+                },
+            )
+        )
+        created.raise_for_status()
+        published = run(api.post(f"/exercise-sets/{created.json()['id']}/publish"))
+        published.raise_for_status()
+        return published.json()
+
+    return publish
+
+
+@pytest.fixture
+def flush_submissions(run: Run) -> Callable[[], None]:
+    """Writes every queued submission now, as shutdown does."""
+
+    async def flush():
+        await submission_queue.stop()
+        submission_queue.start()
+
+    return lambda: run(flush())
@@ -0,0 +1,75 @@
+import hashlib
+import time
+
+from sqlmodel import Session, delete
+
+from app.core import cache
+from app.core.cache import LocalCacheBackend, principal_cache, token_cache
+from app.core.config import PRINCIPAL_CACHE_TTL_SECONDS
+from app.core.db import engine
+from app.models.user import User
+
+
+def token_digest(headers):
+    token = headers["Authorization"].removeprefix("Bearer ")
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def test_authenticated_requests_skip_the_user_table(run, api, owner, count_statements):
+    run(api.get("/exercises/")).raise_for_status()
+
+    with count_statements() as statements:
+        run(api.get("/exercises/")).raise_for_status()
+
+    assert not [s for s in statements if 'FROM "user"' in s]
+    assert token_cache.get(token_digest(owner["headers"])) == str(owner["user"].id)
+    assert principal_cache.get(str(owner["user"].id))["email"] == owner["user"].email
+
+
+def test_user_writes_evict_the_cached_principal(run, api, owner, seed, headers_for):
+    user_id = owner["user"].id
+    run(api.get("/exercises/")).raise_for_status()
+
+    with Session(engine) as session:
+        user = session.get(User, user_id)
+        user.username = f"renamed-{user_id}"
+        session.commit()
+    assert principal_cache.get(str(user_id)) is None
+
+    (deleted,) = seed(1, 0, 0)
+    api.headers.update(headers_for(deleted))
+    run(api.get("/exercises/")).raise_for_status()
+    with Session(engine) as session:
+        session.delete(session.get(User, deleted.id))
+        session.commit()
+    assert principal_cache.get(str(deleted.id)) is None
+    assert run(api.get("/exercises/")).status_code == 401
+
+
+def test_local_backend_expires_entries_and_evicts_the_least_recent():
+    backend = LocalCacheBackend(max_size=2)
+    backend.set("a", 1, ttl=60)
+    backend.set("b", 2, ttl=60)
+    backend.get("a")
+    backend.set("c", 3, ttl=60)
+    assert backend.get("b") is None
+    assert (backend.get("a"), backend.get("c")) == (1, 3)
+
+    backend.set("gone", 4, ttl=-1)
+    assert backend.get("gone") is None
+
+
+def test_core_user_deletes_are_seen_once_the_principal_expires(
+    run, api, owner, monkeypatch
+):
+    user_id = owner["user"].id
+    run(api.get("/exercises/")).raise_for_status()
+    with engine.begin() as connection:
+        connection.execute(delete(User).where(User.id == user_id))
+
+    # A Core delete skips the ORM events, so the principal is served until
+    # its TTL runs out.
+    assert run(api.get("/exercises/")).is_success
+    now = time.monotonic() + PRINCIPAL_CACHE_TTL_SECONDS
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now)
+    assert run(api.get("/exercises/")).status_code == 401
@@ -0,0 +1,112 @@
+import uuid
+
+import pytest
+from sqlmodel import Session
+
+from app.core.bloom import BloomFilter
+from app.core.db import engine
+from app.services.availability_service import (
+    get_availability_index,
+    load_availability,
+)
+
+
+def table_reads(statements):
+    return [s for s in statements if 'FROM "user"' in s]
+
+
+@pytest.fixture
+def registered(owner):
+    """``owner``, with the filters rebuilt as at startup to include them."""
+    with Session(engine) as session:
+        load_availability(session)
+    return owner["user"]
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=100)
+    values = [f"value-{i}" for i in range(100)]
+    for value in values:
+        bloom.add(value)
+
+    assert all(value in bloom for value in values)
+    assert bloom.count == 100
+
+
+def unseen(field, suffix=""):
+    """A fresh value the filter rejects; a false positive would cost a query."""
+    while True:
+        value = uuid.uuid4().hex + suffix
+        if not get_availability_index().might_be_taken(field, value):
+            return value
+
+
+def test_unseen_values_are_available_without_a_query(run, api, count_statements):
+    email, username = unseen("email", "@x.org"), unseen("username")
+
+    with count_statements() as statements:
+        email = run(api.get("/validate/email", params={"email": email}))
+        username = run(api.get("/validate/username", params={"username": username}))
+
+    assert email.json()["is_unique"] and username.json()["is_unique"]
+    assert not table_reads(statements)
+
+
+def test_registered_values_are_taken_in_any_case(run, api, registered):
+    user = registered
+
+    email = run(api.get("/validate/email", params={"email": user.email.upper()}))
+    username = run(
+        api.get("/validate/username", params={"username": user.username.upper()})
+    )
+
+    assert email.json()["is_unique"] is False
+    assert email.json()["message"] == "Email is already taken."
+    assert username.json()["is_unique"] is False
+
+
+def test_registration_adds_to_the_filters(run, api):
+    name = f"new-{uuid.uuid4().hex[:12]}"
+    created = run(
+        api.post(
+            "/auth/register",
+            json={
+                "username": name,
+                "email": f"{name}@example.com",
+                "password": "a-long-password",
+            },
+        )
+    )
+    created.raise_for_status()
+
+    response = run(api.get("/validate/username", params={"username": name}))
+    assert response.json()["is_unique"] is False
+
+
+def test_batch_answers_in_order_with_one_query_per_field(
+    run, api, registered, count_statements
+):
+    user = registered
+    free = uuid.uuid4().hex
+    payload = {
+        "emails": [f"{free}@x.org", user.email.upper()],
+        "usernames": [user.username, f"{free}-a", f"{free}-b"],
+    }
+
+    with count_statements() as statements:
+        response = run(api.post("/validate/batch", json=payload))
+
+    assert [(r["field"], r["value"], r["is_unique"]) for r in response.json()] == [
+        ("email", payload["emails"][0], True),
+        ("email", payload["emails"][1], False),
+        ("username", user.username, False),
+        ("username", f"{free}-a", True),
+        ("username", f"{free}-b", True),
+    ]
+    assert len(table_reads(statements)) <= 2
+
+
+def test_batch_rejects_more_than_fifty_candidates(run, api):
+    emails = [f"{i}@example.com" for i in range(51)]
+    response = run(api.post("/validate/batch", json={"emails": emails}))
+    assert response.status_code == 422
@@ -0,0 +1,61 @@
+import pytest
+
+
+@pytest.mark.parametrize("detail", [False, True])
+def test_matching_etag_returns_304_without_a_body(run, api, count_statements, detail):
+    url = "/exercises/"
+    if detail:
+        url += run(api.get("/exercises/")).json()[0]["id"]
+    first = run(api.get(url))
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    with count_statements() as statements:
+        cached = run(api.get(url, headers={"If-None-Match": etag}))
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+    # Only the narrow version query ran.
+    assert len(statements) == 1
+
+    stale = run(api.get(url, headers={"If-None-Match": '"stale"'}))
+    assert stale.status_code == 200
+    assert stale.json() == first.json()
+
+
+def test_writes_change_the_etag_within_the_same_second(run, api):
+    fill_gap = run(api.get("/exercises/")).json()[0]
+    urls = ["/exercises/", f"/exercises/{fill_gap['id']}"]
+    writes = [
+        lambda: api.put(f"/exercises/{fill_gap['id']}", json={"title": "Renamed"}),
+        lambda: api.post(
+            f"/exercises/{fill_gap['id']}/sentences",
+            json={"sentences": [{"sentence": "I ___ it.", "correct_answer": "saw"}]},
+        ),
+    ]
+
+    for write in writes:
+        etags = [run(api.get(url)).headers["ETag"] for url in urls]
+        run(write()).raise_for_status()
+        for url, etag in zip(urls, etags):
+            response = run(api.get(url, headers={"If-None-Match": etag}))
+            assert response.status_code == 200
+            assert response.headers["ETag"] != etag
+
+
+def test_grading_uses_the_current_answer_key(run, api):
+    fill_gap = run(api.get("/exercises/")).json()[0]
+    grade_url = f"/exercises/{fill_gap['id']}/grade"
+    body = {"submissions": [{"answers": {}}]}
+    before = run(api.post(grade_url, json=body)).json()["item_ids"]
+
+    run(
+        api.post(
+            f"/exercises/{fill_gap['id']}/sentences",
+            json={"sentences": [{"sentence": "I ___ it.", "correct_answer": "saw"}]},
+        )
+    ).raise_for_status()
+
+    assert (
+        len(run(api.post(grade_url, json=body)).json()["item_ids"]) == len(before) + 1
+    )
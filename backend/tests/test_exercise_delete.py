@@ -0,0 +1,49 @@
+from uuid import UUID
+
+from sqlmodel import Session, func, select
+
+from app.core.db import engine
+from app.models.fill_gap_sentence import FillGapSentence
+from app.models.multiple_choice_question import MultipleChoiceQuestion
+
+
+def count_items(exercise_ids):
+    with Session(engine) as session:
+        return sum(
+            session.exec(
+                select(func.count())
+                .select_from(model)
+                .where(model.exercise_id.in_([UUID(i) for i in exercise_ids]))
+            ).one()
+            for model in (FillGapSentence, MultipleChoiceQuestion)
+        )
+
+
+def test_delete_is_one_statement_and_cascades(run, api, count_statements):
+    # Also authenticates, so the principal is cached for the counted request.
+    exercise = run(api.get("/exercises/")).json()[0]
+
+    with count_statements() as statements:
+        deleted = run(api.delete(f"/exercises/{exercise['id']}"))
+
+    assert deleted.status_code == 204
+    assert deleted.content == b""
+    assert len(statements) == 1
+    assert count_items([exercise["id"]]) == 0
+    assert run(api.delete(f"/exercises/{exercise['id']}")).status_code == 404
+
+
+def test_bulk_delete_skips_other_users_exercises(run, api, seed, headers_for):
+    own_ids = [e["id"] for e in run(api.get("/exercises/")).json()]
+    (other,) = seed(1, 1, 3)
+    other_ids = [
+        e["id"] for e in run(api.get("/exercises/", headers=headers_for(other))).json()
+    ]
+
+    response = run(
+        api.post("/exercises/bulk-delete", json={"exercise_ids": own_ids + other_ids})
+    )
+
+    assert sorted(response.json()["deleted_ids"]) == sorted(own_ids)
+    assert count_items(own_ids) == 0
+    assert count_items(other_ids) == 3
@@ -0,0 +1,71 @@
+import pytest
+
+from app.core.config import SNAPSHOT_HTTP_MAX_AGE_SECONDS
+
+
+def answer_keys(snapshot):
+    return [
+        key
+        for exercise in snapshot["exercises"]
+        for item in exercise["fill_gap_sentences"]
+        + exercise["multiple_choice_questions"]
+        for key in ("correct_answer", "correct_index")
+        if key in item
+    ]
+
+
+@pytest.mark.parametrize("set_type, answers_shown", [("lesson", True), ("exam", False)])
+def test_exam_snapshots_leave_out_the_answers(
+    run, api, publish_set, set_type, answers_shown
+):
+    published = publish_set(set_type)
+
+    response = run(api.get(f"/exercise-sets/access/{published['access_code']}"))
+
+    snapshot = response.json()
+    assert [len(e["fill_gap_sentences"]) for e in snapshot["exercises"]] == [3, 0]
+    assert [len(e["multiple_choice_questions"]) for e in snapshot["exercises"]] == [
+        0,
+        3,
+    ]
+    assert bool(answer_keys(snapshot)) is answers_shown
+    assert response.headers["ETag"] == f'"{published["snapshot_hash"]}"'
+
+
+def test_published_sets_are_served_from_the_cache(
+    run, api, publish_set, count_statements
+):
+    published = publish_set("exam")
+    url = f"/exercise-sets/access/{published['access_code']}"
+    first = run(api.get(url))
+
+    with count_statements() as statements:
+        cached = run(api.get(url))
+        not_modified = run(
+            api.get(url, headers={"If-None-Match": first.headers["ETag"]})
+        )
+
+    assert statements == []
+    assert cached.content == first.content
+    assert not_modified.status_code == 304
+    assert cached.headers["Cache-Control"] == (
+        f"public, max-age={SNAPSHOT_HTTP_MAX_AGE_SECONDS}"
+    )
+
+
+def test_deleted_sets_stop_being_served(run, api, publish_set):
+    published = publish_set("lesson")
+    url = f"/exercise-sets/access/{published['access_code']}"
+    run(api.get(url)).raise_for_status()
+
+    run(api.delete(f"/exercise-sets/{published['id']}")).raise_for_status()
+
+    assert run(api.get(url)).status_code == 404
+
+
+def test_published_sets_are_frozen(run, api, publish_set):
+    published = publish_set("lesson")
+
+    response = run(api.put(f"/exercise-sets/{published['id']}", json={"title": "New"}))
+
+    assert response.status_code == 409
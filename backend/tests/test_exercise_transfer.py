@@ -0,0 +1,114 @@
+from typing import AsyncIterator, List
+
+import orjson
+
+from app.services import exercise_transfer_service
+from app.services.exercise_transfer_service import iter_lines
+
+CHOICES = ["a|b", 'say "hi", then leave', "[c]", "é"]
+ROWS = [
+    {
+        "exercise": "verbs",
+        "title": "Verbs",
+        "type": "fill-gap",
+        "sentence": "I ___ home.",
+        "correct_answer": "went",
+    },
+    {"exercise": "verbs", "sentence": "She ___ it.", "correct_answer": "saw"},
+    {
+        "exercise": "colours",
+        "title": "Colours",
+        "type": "multiple-choice",
+        "question": "Sky?",
+        "choices": ["red", "blue"],
+        "correct_index": 1,
+    },
+    {"exercise": "verbs", "sentence": "No answer ___."},
+]
+
+
+async def chunked(*chunks: bytes) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def read_lines(*chunks: bytes) -> List:
+    return [line async for line in iter_lines(chunked(*chunks))]
+
+
+def test_ndjson_import_reports_bad_rows_and_round_trips(run, api):
+    body = b"\n".join(orjson.dumps(row) for row in ROWS) + b"\n{not json\n"
+
+    result = run(
+        api.post(
+            "/exercises/import",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+    ).json()
+
+    assert result["rows"] == 5
+    assert result["imported"] == 3
+    assert result["exercises_created"] == 2
+    assert [error["row"] for error in result["errors"]] == [4, 5]
+
+    exported = run(api.get("/exercises/export")).content
+    rows = [orjson.loads(line) for line in exported.splitlines()]
+    assert {"I ___ home.", "She ___ it."} <= {row.get("sentence") for row in rows}
+    assert ["red", "blue"] in [row.get("choices") for row in rows]
+
+    again = run(
+        api.post("/exercises/import", params={"format": "ndjson"}, content=exported)
+    ).json()
+    assert again["error_count"] == 0
+    assert again["imported"] == len(rows)
+
+
+def test_csv_export_round_trips_choices(run, api):
+    created = run(
+        api.post(
+            "/exercises/",
+            json={
+                "title": "Choices",
+                "type": "multiple-choice",
+                "multiple_choice_questions": [
+                    {"question": "Which?", "choices": CHOICES, "correct_index": 1}
+                ],
+            },
+        )
+    ).json()
+    exported = run(api.get("/exercises/export", params={"format": "csv"})).content
+    assert b'"[""a|b"",' in exported
+
+    result = run(
+        api.post("/exercises/import", params={"format": "csv"}, content=exported)
+    ).json()
+    assert result["error_count"] == 0
+
+    imported = [
+        e
+        for e in run(api.get("/exercises/", params={"limit": 100})).json()
+        if e["title"] == "Choices" and e["id"] != created["id"]
+    ]
+    assert [q["choices"] for q in imported[0]["multiple_choice_questions"]] == [CHOICES]
+
+
+def test_csv_import_reads_legacy_choices_and_rejects_bad_json(run, api):
+    body = (
+        "exercise,title,type,question,choices,correct_index\n"
+        "legacy,Legacy,multiple-choice,Which?,yes|no,0\n"
+        'broken,Broken,multiple-choice,Which?,"[""yes"", ",0\n'
+    ).encode()
+    result = run(
+        api.post("/exercises/import", params={"format": "csv"}, content=body)
+    ).json()
+    assert result["imported"] == 1
+    assert [error["row"] for error in result["errors"]] == [2]
+
+
+def test_iter_lines_skips_lines_over_the_limit(run, monkeypatch):
+    monkeypatch.setattr(exercise_transfer_service, "IMPORT_MAX_LINE_BYTES", 8)
+    expected = [b"short", None, b"ok"]
+    assert run(read_lines(b"short\n0123456789\nok\n")) == expected
+    assert run(read_lines(b"short\n01234", b"56789\nok")) == expected
+    assert run(read_lines(b"short\n012345678", b"9\nok")) == expected
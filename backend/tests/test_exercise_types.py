@@ -0,0 +1,34 @@
+FILL_GAP = {
+    "title": "Verbs",
+    "type": "fill-gap",
+    "fill_gap_sentences": [
+        {"sentence": f"I ___ {i}.", "correct_answer": "saw"} for i in range(5)
+    ],
+}
+MULTIPLE_CHOICE = {
+    "title": "Vocabulary",
+    "type": "multiple-choice",
+    "multiple_choice_questions": [
+        {"question": f"Q{i}?", "choices": ["a", "b"], "correct_index": 0}
+        for i in range(5)
+    ],
+}
+
+
+def test_create_and_read_do_not_query_exercise_types(run, api, count_statements):
+    """Types come from the registry loaded at startup, not a query or a join."""
+    # Authenticates once, so the principal is cached for the counted requests.
+    run(api.get("/exercises/")).raise_for_status()
+
+    for data in (FILL_GAP, MULTIPLE_CHOICE):
+        with count_statements() as created:
+            exercise = run(api.post("/exercises/", json=data)).json()
+        with count_statements() as read:
+            fetched = run(api.get(f"/exercises/{exercise['id']}")).json()
+
+        assert fetched["type"] == data["type"]
+        # The exercise and its items; the ETag lookup, then the exercise and
+        # both item collections.
+        assert len(created) == 2
+        assert len(read) == 4
+        assert not [s for s in created + read if "exercisetype" in s]
@@ -0,0 +1,75 @@
+from uuid import UUID
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db import async_engine
+from app.schemas.exercise import ExerciseUpdate
+from app.services.exercise_service import update_exercise
+
+
+@pytest.fixture
+def update(run, count_statements):
+    """Runs update_exercise and returns its result and the statements it ran."""
+
+    def update(exercise_id, user, update_data, include_items=False):
+        return run(go(exercise_id, user, update_data, include_items))
+
+    async def go(exercise_id, user, update_data, include_items):
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            with count_statements() as statements:
+                exercise = await update_exercise(
+                    exercise_id, update_data, user, session, include_items
+                )
+        return exercise, statements
+
+    return update
+
+
+def test_update_is_one_statement(run, api, owner, update):
+    exercises = run(api.get("/exercises/")).json()
+
+    for listed in exercises:
+        exercise, statements = update(
+            UUID(listed["id"]), owner["user"], ExerciseUpdate(title="Renamed")
+        )
+        assert exercise.title == "Renamed"
+        assert exercise.fill_gap_sentences is None
+        assert exercise.multiple_choice_questions is None
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE exercise SET")
+        assert "RETURNING" in statements[0]
+
+
+def test_update_with_items_adds_one_statement(run, api, owner, update):
+    for listed in run(api.get("/exercises/")).json():
+        exercise, statements = update(
+            UUID(listed["id"]),
+            owner["user"],
+            ExerciseUpdate(description="Changed"),
+            include_items=True,
+        )
+        assert exercise.description == "Changed"
+        items = exercise.fill_gap_sentences + exercise.multiple_choice_questions
+        assert len(items) == 3
+        assert len(statements) == 2
+
+
+def test_empty_update_only_reads(run, api, owner, update):
+    listed = run(api.get("/exercises/")).json()[0]
+
+    exercise, statements = update(UUID(listed["id"]), owner["user"], ExerciseUpdate())
+
+    assert exercise.title == listed["title"]
+    assert len(statements) == 1
+    assert statements[0].startswith("SELECT")
+
+
+def test_update_of_another_users_exercise_is_not_found(run, api, owner, seed, update):
+    listed = run(api.get("/exercises/")).json()[0]
+    (other,) = seed(1, 0, 0)
+
+    with pytest.raises(HTTPException) as raised:
+        update(UUID(listed["id"]), other, ExerciseUpdate(title="Taken"))
+    assert raised.value.status_code == 404
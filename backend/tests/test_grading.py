@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from app.schemas.exercise import ExerciseType
+from app.schemas.grading import GradingOptions
+from app.services.grading_service import (
+    CompiledAnswerKey,
+    bounded_edit_distance,
+    grade_submissions,
+)
+
+
+def gap_key(*answers):
+    return CompiledAnswerKey(
+        "exercise",
+        ExerciseType.FILL_GAP,
+        [f"item-{i}" for i in range(len(answers))],
+        np.array(answers, dtype=str),
+    )
+
+
+@pytest.mark.parametrize(
+    "a, b, limit, expected",
+    [
+        ("colour", "color", 1, 1),
+        ("kitten", "sitting", 2, None),
+        ("kitten", "sitting", 3, 3),
+        ("word", "word", 0, 0),
+        ("a", "abcd", 2, None),
+    ],
+)
+def test_bounded_edit_distance(a, b, limit, expected):
+    assert bounded_edit_distance(a, b, limit) == expected
+
+
+def test_gap_answers_are_normalized_before_comparing():
+    key = gap_key("new york", "word")
+    submissions = [
+        {"item-0": "  New   York! ", "item-1": "WORD"},
+        {"item-0": "newyork", "item-1": ""},
+    ]
+
+    correct = grade_submissions(key, submissions, GradingOptions())
+
+    assert correct.tolist() == [[True, True], [False, False]]
+
+
+@pytest.mark.parametrize(
+    "answer, max_edit_distance, accepted",
+    [
+        ("wrd", 0, False),
+        ("wrd", 1, True),
+        ("wodr", 1, False),
+        ("wodr", 2, True),
+        ("x", 3, False),
+    ],
+)
+def test_gap_answers_within_the_edit_distance_are_accepted(
+    answer, max_edit_distance, accepted
+):
+    key = gap_key("word", "cat")
+    options = GradingOptions(max_edit_distance=max_edit_distance)
+
+    correct = grade_submissions(key, [{"item-0": answer}], options)
+
+    assert correct.tolist() == [[accepted, False]]
+
+
+def test_a_tolerance_as_long_as_the_answer_accepts_nothing_extra():
+    key = gap_key("cat")
+
+    correct = grade_submissions(
+        key, [{"item-0": "dog"}], GradingOptions(max_edit_distance=3)
+    )
+
+    assert correct.tolist() == [[False]]
+
+
+def test_grade_route_returns_columnar_results(run, api):
+    fill_gap, multiple_choice = run(api.get("/exercises/")).json()
+    sentence_ids = [s["id"] for s in fill_gap["fill_gap_sentences"]]
+    question_ids = [q["id"] for q in multiple_choice["multiple_choice_questions"]]
+
+    graded = run(
+        api.post(
+            f"/exercises/{fill_gap['id']}/grade",
+            json={
+                "submissions": [
+                    {"answers": dict(zip(sentence_ids, ["word", "Wird", "bird"]))},
+                    {"answers": {}},
+                ],
+                "options": {"max_edit_distance": 1},
+            },
+        )
+    ).json()
+    assert graded["item_ids"] == sentence_ids
+    assert graded["scores"] == [2, 0]
+    assert graded["correct"] == [[True, True, False], [False, False, False]]
+
+    graded = run(
+        api.post(
+            f"/exercises/{multiple_choice['id']}/grade",
+            json={"submissions": [{"answers": dict(zip(question_ids, [0, 2, "2"]))}]},
+        )
+    ).json()
+    assert graded["correct"] == [[True, False, False]]
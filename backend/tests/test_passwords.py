@@ -0,0 +1,91 @@
+import asyncio
+
+from passlib.hash import bcrypt
+from sqlmodel import Session
+
+from app.core import security
+from app.core.config import (
+    PASSWORD_BCRYPT_ROUNDS,
+    PASSWORD_HASH_QUEUE_DEPTH,
+    PASSWORD_HASH_WORKERS,
+)
+from app.core.db import async_engine, engine
+from app.models.user import User
+from app.services import user_service
+
+
+def login(run, api, owner):
+    return run(
+        api.post(
+            "/auth/login",
+            data={"username": owner["user"].email, "password": owner["password"]},
+        )
+    )
+
+
+def test_login_upgrades_an_outdated_hash(run, api, owner):
+    outdated = bcrypt.using(rounds=PASSWORD_BCRYPT_ROUNDS - 1).hash(owner["password"])
+    with Session(engine) as session:
+        session.get(User, owner["user"].id).password_hash = outdated
+        session.commit()
+
+    assert login(run, api, owner).status_code == 200
+
+    with Session(engine) as session:
+        stored = session.get(User, owner["user"].id).password_hash
+    assert stored != outdated
+    assert bcrypt.from_string(stored).rounds == PASSWORD_BCRYPT_ROUNDS
+    assert login(run, api, owner).status_code == 200
+
+
+def test_sign_ins_fail_fast_while_the_hash_pool_is_full(run, api, owner, monkeypatch):
+    monkeypatch.setattr(
+        security,
+        "_password_jobs_in_flight",
+        PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_DEPTH,
+    )
+
+    for response in (
+        login(run, api, owner),
+        run(
+            api.post(
+                "/auth/register",
+                json={
+                    "username": "newcomer",
+                    "email": "newcomer@example.com",
+                    "password": "newcomer-password",
+                },
+            )
+        ),
+    ):
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+
+def test_racing_registrations_hash_outside_a_transaction(run, api, monkeypatch):
+    hashing = []
+    both_hashing = asyncio.Event()
+
+    async def hash_password_async(password):
+        # Hold both registrations here, past their availability checks.
+        hashing.append(password)
+        if len(hashing) == 2:
+            # Neither registration holds a connection while it hashes.
+            assert async_engine.pool.checkedout() == 0
+            both_hashing.set()
+        await both_hashing.wait()
+        return bcrypt.using(rounds=PASSWORD_BCRYPT_ROUNDS).hash(password)
+
+    monkeypatch.setattr(user_service, "hash_password_async", hash_password_async)
+    account = {"email": "racer@example.com", "password": "racer-password"}
+
+    async def register_twice():
+        return await asyncio.gather(
+            api.post("/auth/register", json={**account, "username": "racer"}),
+            api.post("/auth/register", json={**account, "username": "RACER"}),
+        )
+
+    responses = run(register_twice())
+
+    # The unique index turns the loser away.
+    assert sorted(r.status_code for r in responses) == [200, 400]
@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db import async_engine
+from app.core.query_budget import QueryBudgetExceeded, query_budget
+
+
+async def run_statements(count: int) -> None:
+    async with AsyncSession(async_engine) as session:
+        for _ in range(count):
+            await session.exec(text("SELECT 1"))
+
+
+def test_overrunning_a_budget_raises(run):
+    run(query_budget(2)(run_statements)(2))
+    with pytest.raises(QueryBudgetExceeded, match="ran 3 statements"):
+        run(query_budget(2)(run_statements)(3))
+
+
+def test_nested_budgets_count_statements_of_inner_calls(run):
+    inner = query_budget(5)(run_statements)
+
+    @query_budget(2)
+    async def outer():
+        await inner(3)
+
+    with pytest.raises(QueryBudgetExceeded, match="outer"):
+        run(outer())
+
+
+def test_generator_budgets_apply_to_each_item(run):
+    @query_budget(1)
+    async def chunks(count_per_chunk):
+        for chunk in range(3):
+            await run_statements(count_per_chunk)
+            yield chunk
+
+    async def consume(count_per_chunk):
+        return [chunk async for chunk in chunks(count_per_chunk)]
+
+    assert run(consume(1)) == [0, 1, 2]
+    with pytest.raises(QueryBudgetExceeded):
+        run(consume(2))
@@ -0,0 +1,162 @@
+"""
+Checks that the queries behind the exercise and exercise-set routes are
+served by indexes: drives the routes while recording every statement, then
+EXPLAINs each distinct SELECT, UPDATE and DELETE with the parameters it ran
+with and fails on any full scan of a table.
+
+Postgres only prefers an index once a table outgrows a few pages, so seed
+more users there with QUERY_PLAN_USERS.
+"""
+
+import os
+import re
+from typing import Any, Dict, List, Tuple
+
+import httpx
+from sqlalchemy import event, text
+
+from app.core.db import async_engine, engine
+
+QUERY_PLAN_USERS = int(os.getenv("QUERY_PLAN_USERS", 30))
+
+# Tables small enough that a scan is the right plan.
+SCAN_ALLOWED = {"exercisetype", "schema_migration"}
+
+PLAN_PREFIXES = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN "}
+# A full scan in each dialect's plan output, capturing the table name.
+FULL_SCAN_PATTERNS = {
+    "sqlite": re.compile(r"^SCAN (\w+)(?! USING (?:COVERING )?INDEX)"),
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+}
+
+Plans = List[Tuple[str, List[str]]]
+
+
+async def drive_routes(client: httpx.AsyncClient) -> None:
+    """Calls every exercise and exercise-set route at least once."""
+
+    async def call(method: str, url: str, **kwargs) -> httpx.Response:
+        response = await client.request(method, url, **kwargs)
+        assert response.status_code < 400, f"{method} {url}: {response.status_code}"
+        return response
+
+    page = await call("GET", "/exercises/", params={"limit": 5})
+    exercises = page.json()
+    await call(
+        "GET",
+        "/exercises/",
+        params={"limit": 5, "cursor": page.headers["X-Next-Cursor"]},
+    )
+    await call("GET", "/exercises/", params={"stream": "true"})
+    fill_gap = next(e for e in exercises if e["type"] == "fill-gap")
+    multiple_choice = next(e for e in exercises if e["type"] == "multiple-choice")
+
+    for exercise in (fill_gap, multiple_choice):
+        await call("GET", f"/exercises/{exercise['id']}")
+        await call(
+            "PUT",
+            f"/exercises/{exercise['id']}",
+            params={"include_items": "true"},
+            json={"title": "Plan"},
+        )
+        await call("GET", f"/exercises/{exercise['id']}/stats")
+    await call(
+        "POST",
+        f"/exercises/{fill_gap['id']}/sentences",
+        json={"sentences": [{"sentence": "I ___ it.", "correct_answer": "saw"}]},
+    )
+    sentence_id = fill_gap["fill_gap_sentences"][0]["id"]
+    await call(
+        "POST",
+        f"/exercises/{fill_gap['id']}/grade",
+        json={"submissions": [{"answers": {sentence_id: "word"}}]},
+    )
+    await call("GET", "/exercises/search", params={"q": "sentence"})
+    await call("GET", "/exercises/export", params={"format": "ndjson"})
+
+    exercise_set = (
+        await call(
+            "POST",
+            "/exercise-sets/",
+            json={
+                "title": "Plan",
+                "set_type": "exam",
+                "exercise_ids": [fill_gap["id"], multiple_choice["id"]],
+            },
+        )
+    ).json()
+    set_id = exercise_set["id"]
+    await call("GET", "/exercise-sets/")
+    await call("GET", f"/exercise-sets/{set_id}")
+    await call("PUT", f"/exercise-sets/{set_id}", json={"title": "Plan 2"})
+    await call("POST", f"/exercise-sets/{set_id}/publish")
+    code = exercise_set["access_code"]
+    await call("GET", f"/exercise-sets/access/{code}")
+    await call(
+        "POST",
+        f"/exercise-sets/access/{code}/submit",
+        json={"participant": "plan", "answers": {sentence_id: "word"}},
+    )
+
+    await call("DELETE", f"/exercises/{exercises[-1]['id']}")
+    await call(
+        "POST",
+        "/exercises/bulk-delete",
+        json={"exercise_ids": [exercises[-2]["id"], exercises[-3]["id"]]},
+    )
+    await call("DELETE", f"/exercise-sets/{set_id}")
+
+
+async def explain(statements: Dict[str, Any]) -> Plans:
+    dialect = async_engine.dialect.name
+    prefix = PLAN_PREFIXES[dialect]
+    plans = []
+    async with async_engine.connect() as connection:
+        for statement, parameters in statements.items():
+            # EXPLAIN of a write does not run it.
+            result = await connection.exec_driver_sql(prefix + statement, parameters)
+            lines = [str(row[-1]) if dialect == "sqlite" else row[0] for row in result]
+            plans.append((statement, lines))
+        await connection.rollback()
+    return plans
+
+
+def full_scans(plans: Plans) -> Dict[str, List[str]]:
+    """The plans that scan a whole table, keyed by statement."""
+    pattern = FULL_SCAN_PATTERNS[async_engine.dialect.name]
+    return {
+        statement: lines
+        for statement, lines in plans
+        if any(
+            match and match.group(1) not in SCAN_ALLOWED
+            for match in (pattern.search(line.strip()) for line in lines)
+        )
+    }
+
+
+def test_route_queries_use_indexes(run, api, seed, headers_for, flush_submissions):
+    (user,) = seed(1, 20, 5)
+    seed(QUERY_PLAN_USERS - 1, 20, 5)
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE"))
+    api.headers.update(headers_for(user))
+
+    recorded: Dict[str, Any] = {}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        verb = statement.lstrip().split(None, 1)[0].upper()
+        if not many and verb in {"SELECT", "UPDATE", "DELETE"}:
+            recorded.setdefault(statement, parameters)
+
+    target = async_engine.sync_engine
+    event.listen(target, "before_cursor_execute", before_cursor_execute)
+    try:
+        run(drive_routes(api))
+        # Write-behind submissions flush later; include their statements.
+        flush_submissions()
+    finally:
+        event.remove(target, "before_cursor_execute", before_cursor_execute)
+
+    plans = run(explain(recorded))
+    assert len(plans) > 30
+    assert full_scans(plans) == {}
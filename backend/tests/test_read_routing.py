@@ -0,0 +1,86 @@
+import os
+import shutil
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api import deps
+from app.core.config import READ_YOUR_WRITES_COOKIE
+from app.core.db import engine
+
+
+@pytest.fixture
+def lagging_replica(run, owner, tmp_path, monkeypatch):
+    """A copy of the database taken now, which later writes do not reach."""
+    if engine.dialect.name != "sqlite":
+        pytest.skip("the stand-in replica is a copy of the SQLite file")
+    path = os.path.join(tmp_path, "replica.db")
+    shutil.copy(engine.url.database, path)
+    replica = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    monkeypatch.setattr(deps, "replica_async_engine", replica)
+    yield replica
+    run(replica.dispose())
+
+
+def test_reads_follow_the_last_write_cookie(run, api, lagging_replica):
+    exercise = run(api.get("/exercises/")).json()[0]
+    url = f"/exercises/{exercise['id']}"
+
+    updated = run(api.put(url, json={"title": "Renamed"}))
+    last_write = updated.cookies[READ_YOUR_WRITES_COOKIE]
+    cookie = {"Cookie": f"{READ_YOUR_WRITES_COOKIE}={last_write}"}
+
+    # The writer reads its own write from the primary...
+    assert run(api.get(url, headers=cookie)).json()["title"] == "Renamed"
+    # ...while a client without a recent write reads the lagging replica.
+    api.cookies.clear()
+    assert run(api.get(url)).json()["title"] == exercise["title"]
+
+
+def test_expired_or_malformed_cookies_read_from_the_replica(run, api, lagging_replica):
+    exercise = run(api.get("/exercises/")).json()[0]
+    url = f"/exercises/{exercise['id']}"
+    run(api.put(url, json={"title": "Renamed"})).raise_for_status()
+    api.cookies.clear()
+
+    for value in ("1.0", "yesterday"):
+        response = run(
+            api.get(url, headers={"Cookie": f"{READ_YOUR_WRITES_COOKIE}={value}"})
+        )
+        assert response.json()["title"] == exercise["title"]
+
+
+def test_failed_writes_do_not_start_a_window(run, api):
+    missing = run(api.put("/exercises/00000000-0000-0000-0000-000000000000", json={}))
+
+    assert missing.status_code == 404
+    assert READ_YOUR_WRITES_COOKIE not in missing.cookies
+
+
+def test_read_only_posts_do_not_start_a_window(run, api):
+    exercise = run(api.get("/exercises/")).json()[0]
+    validated = run(api.post("/validate/batch", json={"emails": ["a@example.com"]}))
+    graded = run(
+        api.post(
+            f"/exercises/{exercise['id']}/grade",
+            json={"submissions": [{"answers": {}}]},
+        )
+    )
+
+    for response in (validated, graded):
+        assert response.is_success
+        assert READ_YOUR_WRITES_COOKIE not in response.cookies
+
+
+def test_streams_read_from_the_replica_outside_the_window(run, api, lagging_replica):
+    exercise = run(api.get("/exercises/")).json()[0]
+    run(api.put(f"/exercises/{exercise['id']}", json={"title": "Renamed"}))
+    api.cookies.clear()
+
+    for url, params in (
+        ("/exercises/", {"stream": "true"}),
+        ("/exercises/export", {"format": "ndjson"}),
+    ):
+        body = run(api.get(url, params=params)).text
+        assert exercise["title"] in body
+        assert "Renamed" not in body
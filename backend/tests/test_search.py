@@ -0,0 +1,101 @@
+import pytest
+
+from app.services.search_service import USE_DATABASE_SEARCH
+
+pytestmark = pytest.mark.skipif(
+    USE_DATABASE_SEARCH, reason="covers the in-memory index used off Postgres"
+)
+
+IRREGULAR_VERBS = {
+    "title": "Irregular verbs",
+    "description": "Past tense practice.",
+    "type": "fill-gap",
+    "fill_gap_sentences": [
+        {"sentence": "Yesterday I ___ to the market.", "correct_answer": "went"},
+        {"sentence": "She ___ the whole cake.", "correct_answer": "ate"},
+    ],
+}
+TRAVEL = {
+    "title": "Travel",
+    "description": "Vocabulary with a few irregular verbs.",
+    "type": "multiple-choice",
+    "multiple_choice_questions": [
+        {
+            "question": "Where do you buy a ticket?",
+            "choices": ["market", "station"],
+            "correct_index": 1,
+        }
+    ],
+}
+
+
+def search(run, api, q, **params):
+    response = run(api.get("/exercises/search", params={"q": q, **params}))
+    response.raise_for_status()
+    return response
+
+
+def create(run, api, data):
+    response = run(api.post("/exercises/", json=data))
+    response.raise_for_status()
+    return response.json()
+
+
+def test_title_matches_rank_above_description_matches(run, api):
+    verbs = create(run, api, IRREGULAR_VERBS)
+    travel = create(run, api, TRAVEL)
+
+    results = search(run, api, "irregular verbs").json()
+
+    assert [(r["exercise_id"], r["kind"]) for r in results] == [
+        (verbs["id"], "exercise"),
+        (travel["id"], "exercise"),
+    ]
+    assert results[0]["score"] > results[1]["score"]
+
+
+def test_every_word_must_match_and_misspellings_are_forgiven(run, api):
+    verbs = create(run, api, IRREGULAR_VERBS)
+    create(run, api, TRAVEL)
+
+    assert search(run, api, "yesterday cake").json() == []
+    (sentence,) = search(run, api, "yesterdy marke").json()
+    assert sentence["kind"] == "sentence"
+    assert sentence["exercise_title"] == verbs["title"]
+    assert sentence["item_id"] == verbs["fill_gap_sentences"][0]["id"]
+
+    # "market" is a choice of the travel question as well as in the sentence.
+    assert {r["kind"] for r in search(run, api, "market").json()} == {
+        "sentence",
+        "question",
+    }
+
+
+def test_results_are_scoped_to_the_owner(run, api, seed, headers_for):
+    create(run, api, IRREGULAR_VERBS)
+    (other,) = seed(1, 0, 0)
+
+    response = run(
+        api.get(
+            "/exercises/search",
+            params={"q": "irregular"},
+            headers=headers_for(other),
+        )
+    )
+
+    assert response.json() == []
+
+
+def test_pages_and_deletes(run, api):
+    verbs = create(run, api, IRREGULAR_VERBS)
+    create(run, api, TRAVEL)
+
+    first = search(run, api, "irregular", limit=1)
+    assert first.headers["X-Next-Offset"] == "1"
+    last = search(run, api, "irregular", limit=1, offset=1)
+    assert "X-Next-Offset" not in last.headers
+    assert first.json()[0]["exercise_id"] != last.json()[0]["exercise_id"]
+
+    run(api.delete(f"/exercises/{verbs['id']}")).raise_for_status()
+    assert search(run, api, "yesterday").json() == []
+    assert len(search(run, api, "irregular").json()) == 1
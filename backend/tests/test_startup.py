@@ -0,0 +1,21 @@
+import subprocess
+import sys
+
+# Imported on first use, not by the server at startup.
+DEFERRED_MODULES = ("numpy", "passlib")
+
+
+def test_importing_the_app_defers_heavy_modules():
+    loaded = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, app.main; "
+            f"print(*[m for m in {DEFERRED_MODULES!r} if m in sys.modules])",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+
+    assert loaded == []
@@ -0,0 +1,89 @@
+import random
+from typing import Any, Dict, List, Set, Tuple
+from uuid import UUID
+
+from sqlmodel import Session, select
+
+from app.commands.rebuild_stats import rebuild_stats
+from app.core.db import engine
+from app.models.stats import ChoiceStat, QuestionStat, ScoreStat
+
+
+def read_stats(exercise_ids: Set[UUID]) -> Tuple[List[Tuple], ...]:
+    with Session(engine) as session:
+        return tuple(
+            sorted(
+                tuple(row.model_dump().values())
+                for row in session.exec(
+                    select(model).where(model.exercise_id.in_(exercise_ids))
+                )
+            )
+            for model in (QuestionStat, ChoiceStat, ScoreStat)
+        )
+
+
+def assert_matches_rebuild(exercise_ids: Set[UUID]) -> Tuple[List[Tuple], ...]:
+    incremental = read_stats(exercise_ids)
+    rebuild_stats(workers=2, chunk_size=7)
+    assert read_stats(exercise_ids) == incremental
+    return incremental
+
+
+def random_answers(rng: random.Random, exercises: List[Dict[str, Any]]) -> Dict:
+    answers: Dict[str, Any] = {}
+    for exercise in exercises:
+        for sentence in exercise["fill_gap_sentences"]:
+            if rng.random() < 0.8:
+                answers[sentence["id"]] = rng.choice(["word", "Word!", "other"])
+        for question in exercise["multiple_choice_questions"]:
+            if rng.random() < 0.8:
+                answers[question["id"]] = rng.randrange(4)
+    return answers
+
+
+def test_incremental_stats_match_rebuild_after_set_deletes(run, api, flush_submissions):
+    rng = random.Random(17)
+    exercises = run(api.get("/exercises/")).json()
+    exercise_ids = {UUID(exercise["id"]) for exercise in exercises}
+    fill_gap = next(e for e in exercises if e["type"] == "fill-gap")
+
+    sets = []
+    for members in (exercises, [fill_gap]):
+        exercise_set = run(
+            api.post(
+                "/exercise-sets/",
+                json={
+                    "title": "Stats",
+                    "set_type": "lesson",
+                    "exercise_ids": [e["id"] for e in members],
+                },
+            )
+        ).json()
+        assert run(api.post(f"/exercise-sets/{exercise_set['id']}/publish")).is_success
+        for i in range(20):
+            response = run(
+                api.post(
+                    f"/exercise-sets/access/{exercise_set['access_code']}/submit",
+                    json={
+                        "participant": f"p{i}",
+                        "answers": random_answers(rng, members),
+                    },
+                )
+            )
+            assert response.is_success
+        sets.append(exercise_set)
+    flush_submissions()
+
+    both = assert_matches_rebuild(exercise_ids)
+    assert all(both)
+    stats = run(api.get(f"/exercises/{fill_gap['id']}/stats")).json()
+    assert stats["submissions"] == 40
+
+    run(api.delete(f"/exercise-sets/{sets[0]['id']}")).raise_for_status()
+    fill_gap_only = assert_matches_rebuild(exercise_ids)
+    assert fill_gap_only[0] and fill_gap_only != both
+    stats = run(api.get(f"/exercises/{fill_gap['id']}/stats")).json()
+    assert stats["submissions"] == 20
+
+    run(api.delete(f"/exercise-sets/{sets[1]['id']}")).raise_for_status()
+    assert assert_matches_rebuild(exercise_ids) == ([], [], [])
@@ -0,0 +1,107 @@
+from uuid import UUID
+
+import pytest
+from sqlmodel import Session, select
+
+from app.core.db import async_engine, engine
+from app.core.write_behind import QueueFull, WriteBehindQueue
+from app.models.submission import Submission
+from app.services import submission_service
+
+
+def saved_submissions(published):
+    with Session(engine) as session:
+        return session.exec(
+            select(Submission).where(
+                Submission.exercise_set_id == UUID(published["id"])
+            )
+        ).all()
+
+
+def submit(run, api, published, participant):
+    return run(
+        api.post(
+            f"/exercise-sets/access/{published['access_code']}/submit",
+            json={"participant": participant, "answers": {"item": "answer"}},
+        )
+    )
+
+
+def test_submissions_are_queued_and_written_on_flush(
+    run, api, publish_set, flush_submissions, count_statements
+):
+    published = publish_set("exam")
+    submit(run, api, published, "warm-up")
+    flush_submissions()
+
+    with count_statements() as statements:
+        receipts = [submit(run, api, published, f"learner-{i}") for i in range(3)]
+
+    assert [r.status_code for r in receipts] == [202] * 3
+    assert statements == []
+
+    flush_submissions()
+    saved = {s.id: s.participant for s in saved_submissions(published)}
+    assert {UUID(r.json()["id"]) for r in receipts} <= set(saved)
+    assert len(saved) == 4
+
+
+def test_a_full_queue_answers_429(run, api, publish_set, monkeypatch):
+    published = publish_set("exam")
+    # Never started, so nothing drains it until stop().
+    queue = WriteBehindQueue(
+        "test-submissions",
+        Submission.__table__,
+        async_engine,
+        max_size=1,
+        batch_size=10,
+        flush_interval=60,
+    )
+    monkeypatch.setattr(submission_service, "submission_queue", queue)
+
+    accepted = submit(run, api, published, "first")
+    rejected = submit(run, api, published, "second")
+
+    assert accepted.status_code == 202
+    assert rejected.status_code == 429
+    assert rejected.headers["Retry-After"] == "1"
+    assert queue.stats()["rejected"] == 1
+
+    run(queue.stop())
+    assert [s.participant for s in saved_submissions(published)] == ["first"]
+    assert queue.stats()["depth"] == 0
+
+
+def test_rows_whose_set_is_gone_are_dropped(run):
+    queue = WriteBehindQueue(
+        "test-orphans",
+        Submission.__table__,
+        async_engine,
+        max_size=10,
+        batch_size=10,
+        flush_interval=60,
+    )
+    queue.put({"exercise_set_id": UUID(int=0), "participant": "x", "answers": {}})
+
+    run(queue.stop())
+
+    if queue.metrics.dropped == 0:
+        pytest.skip("this database does not enforce foreign keys")
+    assert queue.stats()["depth"] == 0
+
+
+def test_put_raises_once_the_queue_is_full():
+    queue = WriteBehindQueue(
+        "test-bounded",
+        Submission.__table__,
+        async_engine,
+        max_size=2,
+        batch_size=10,
+        flush_interval=60,
+    )
+    queue.put({})
+    queue.put({})
+
+    with pytest.raises(QueueFull):
+        queue.put({})
+    assert queue.metrics.accepted == 2